@@ -3,7 +3,8 @@ Base Agent class for all specialist agents
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Tuple
+from itertools import groupby
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 import logging
 import re
 import xml.etree.ElementTree as ET
@@ -16,12 +17,26 @@ from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# XML tool calls in Ollama responses (see OLLAMA_TOOL_INSTRUCTIONS)
+_TOOL_CALL_RE = re.compile(r'<tool_call\s+name="([^"]+)">(.*?)</tool_call>', re.DOTALL)
+
+# Read-only tools -> MCP bulk method; consecutive calls to one of these run
+# as a single batch (see execute_tools)
+_BATCHED_TOOLS = {
+    "read_file": "read_files",
+    "file_exists": "files_exist",
+    "list_directory": "list_directories"
+}
+
 
 class BaseAgent(ABC):
     """
     Base class for all AI agents in RezNet
     """
 
+    # Specialist guidelines appended to the persona prompt
+    SYSTEM_PROMPT_SUFFIX = ""
+
     def __init__(
         self,
         agent_id: UUID,
@@ -63,8 +78,16 @@ class BaseAgent(ABC):
         self.temperature = self.config.get("temperature", settings.DEFAULT_TEMPERATURE)
         self.max_tokens = self.config.get("max_tokens", settings.MAX_TOKENS_PER_RESPONSE)
 
-        # Tool configuration
+        # Tool configuration - native schemas are resolved once for this
+        # agent's provider (None when tools are off or sent as XML instructions)
         self.enable_tools = self.config.get("enable_tools", True)
+        self._native_tools: Optional[List[Dict[str, Any]]] = None
+        if self.enable_tools and self.llm.has_native_tool_calling():
+            self._native_tools = get_tool_schemas(self.llm.provider)
+            self.llm.register_tools(self._native_tools)
+
+        # Assembled system prompt (built on first use)
+        self._system_prompt: Optional[str] = None
 
         # Status tracking
         self.status = "online"
@@ -74,8 +97,18 @@ class BaseAgent(ABC):
 
     def get_system_prompt(self) -> str:
         """
-        Generate system prompt from persona, including tool instructions
+        Get the system prompt: persona, tool instructions, then the class's
+        SYSTEM_PROMPT_SUFFIX
+
+        Built once per instance - persona, provider and tool settings are all
+        fixed at construction.
         """
+        if self._system_prompt is None:
+            self._system_prompt = self._build_system_prompt()
+        return self._system_prompt
+
+    def _build_system_prompt(self) -> str:
+        """Generate system prompt from persona, including tool instructions"""
         role = self.persona.get("role", "AI Assistant")
         goal = self.persona.get("goal", "Help users with their tasks")
         backstory = self.persona.get("backstory", "You are a helpful AI assistant.")
@@ -114,7 +147,7 @@ When you mention another agent (like @backend), they will be automatically notif
             tool_instructions = get_tool_instructions(provider)
             system_prompt += "\n" + tool_instructions
 
-        return system_prompt
+        return system_prompt + self.SYSTEM_PROMPT_SUFFIX
 
     def get_full_system_prompt(self) -> str:
         """
@@ -172,6 +205,51 @@ When you mention another agent (like @backend), they will be automatically notif
                 "error": str(e)
             }
 
+    async def execute_tools(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute tool calls in order
+
+        A run of consecutive calls to the same read-only tool (e.g. several
+        read_file calls) goes to the MCP server as one batch. Everything else,
+        including all writes, runs one call at a time so ordering is kept.
+
+        Args:
+            tool_calls: Tool calls as returned by the LLM (name, input)
+
+        Returns:
+            One {"tool", "input", "result"} dict per call, in call order
+        """
+        tool_results = []
+        for tool_name, run in groupby(tool_calls, key=lambda call: call.get("name")):
+            inputs = [call.get("input", {}) for call in run]
+
+            if tool_name in _BATCHED_TOOLS and len(inputs) > 1:
+                results = await self._execute_tool_batch(tool_name, inputs)
+            else:
+                results = [await self.execute_tool(tool_name, tool_input) for tool_input in inputs]
+
+            tool_results.extend(
+                {"tool": tool_name, "input": tool_input, "result": result}
+                for tool_input, result in zip(inputs, results)
+            )
+        return tool_results
+
+    async def _execute_tool_batch(
+        self,
+        tool_name: str,
+        inputs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Run several calls to one read-only tool through its MCP bulk method"""
+        default_path = "" if tool_name == "list_directory" else None
+        paths = [tool_input.get("path", default_path) for tool_input in inputs]
+        logger.info(f"Executing {len(paths)} {tool_name} calls as one batch: {paths}")
+
+        try:
+            return await getattr(self.mcp_fs, _BATCHED_TOOLS[tool_name])(paths)
+        except Exception as e:
+            logger.error(f"Error executing tool batch {tool_name}: {e}")
+            return [{"success": False, "error": str(e)} for _ in paths]
+
     def _parse_xml_tool_calls(self, text: str) -> Tuple[str, List[Dict[str, Any]]]:
         """
         Parse XML-formatted tool calls from LLM response (for Ollama)
@@ -184,13 +262,19 @@ When you mention another agent (like @backend), they will be automatically notif
             - cleaned_text: Response with tool calls removed
             - tool_calls: List of extracted tool calls
         """
+        # Most responses have no tool calls - skip the regex entirely
+        if "<tool_call" not in text:
+            return text.strip(), None
+
         tool_calls = []
+        # Text between tool calls, collected in the same pass (no re.sub rescan)
+        text_parts = []
+        last_end = 0
 
-        # Find all <tool_call> tags
-        pattern = r'<tool_call\s+name="([^"]+)">(.*?)</tool_call>'
-        matches = re.finditer(pattern, text, re.DOTALL)
+        for match in _TOOL_CALL_RE.finditer(text):
+            text_parts.append(text[last_end:match.start()])
+            last_end = match.end()
 
-        for match in matches:
             tool_name = match.group(1)
             tool_body = match.group(2)
 
@@ -218,7 +302,8 @@ When you mention another agent (like @backend), they will be automatically notif
                 continue
 
         # Remove tool calls from text
-        cleaned_text = re.sub(pattern, '', text, flags=re.DOTALL)
+        text_parts.append(text[last_end:])
+        cleaned_text = "".join(text_parts)
 
         return cleaned_text.strip(), tool_calls if tool_calls else None
 
@@ -245,9 +330,7 @@ When you mention another agent (like @backend), they will be automatically notif
             prompt = self._build_prompt(message, context)
 
             # Get tool schemas if tools are enabled
-            tools = None
-            if self.enable_tools and self.llm.has_native_tool_calling():
-                tools = get_tool_schemas(self.llm.provider)
+            tools = self._native_tools
 
             # Generate response using LLM
             response, tool_calls = await self.llm.generate(
@@ -267,18 +350,7 @@ When you mention another agent (like @backend), they will be automatically notif
                 # Execute tool calls if any
                 if tool_calls:
                     logger.info(f"Agent {self.name} made {len(tool_calls)} tool call(s)")
-                    tool_results = []
-
-                    for tool_call in tool_calls:
-                        tool_name = tool_call.get("name")
-                        tool_input = tool_call.get("input", {})
-
-                        result = await self.execute_tool(tool_name, tool_input)
-                        tool_results.append({
-                            "tool": tool_name,
-                            "input": tool_input,
-                            "result": result
-                        })
+                    tool_results = await self.execute_tools(tool_calls)
 
                     # Format tool results for response
                     results_text = self._format_tool_results(tool_results)
@@ -331,9 +403,7 @@ When you mention another agent (like @backend), they will be automatically notif
             prompt = self._build_prompt(message, context)
 
             # Get tool schemas if tools are enabled
-            tools = None
-            if self.enable_tools and self.llm.has_native_tool_calling():
-                tools = get_tool_schemas(self.llm.provider)
+            tools = self._native_tools
 
             # Stream response from LLM
             accumulated_response = ""
@@ -372,18 +442,7 @@ When you mention another agent (like @backend), they will be automatically notif
                 # Execute tool calls if any
                 if final_tool_calls:
                     logger.info(f"Agent {self.name} made {len(final_tool_calls)} tool call(s)")
-                    tool_results = []
-
-                    for tool_call in final_tool_calls:
-                        tool_name = tool_call.get("name")
-                        tool_input = tool_call.get("input", {})
-
-                        result = await self.execute_tool(tool_name, tool_input)
-                        tool_results.append({
-                            "tool": tool_name,
-                            "input": tool_input,
-                            "result": result
-                        })
+                    tool_results = await self.execute_tools(final_tool_calls)
 
                     # Format tool results for response
                     results_text = self._format_tool_results(tool_results)
@@ -551,9 +610,9 @@ When you mention another agent (like @backend), they will be automatically notif
         }
 
     @abstractmethod
-    def get_tools(self) -> List[Dict[str, Any]]:
+    def get_tools(self) -> Sequence[Dict[str, Any]]:
         """
         Get list of tools/capabilities this agent can use
-        Must be implemented by subclasses
+        Must be implemented by subclasses (the result may be shared - don't mutate it)
         """
         pass
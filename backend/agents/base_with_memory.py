@@ -127,12 +127,18 @@ class BaseAgentWithMemory(BaseAgent):
 
         Args:
             message: Current message
-            context: Existing context
+            context: Existing context (skipped if it has "memory_preloaded")
 
         Returns:
             Enhanced context with semantic memories
         """
         context = context or {}
+
+        # Memory already loaded by the caller (e.g. once for every agent
+        # mentioned in a message) - don't query again
+        if context.get("memory_preloaded"):
+            return context
+
         memory_manager = self._get_memory_manager()
 
         if not memory_manager:
@@ -0,0 +1,453 @@
+"""
+LLM response caching
+- Exact cache: LRU + TTL for deterministic (temperature=0) prompts
+- Single-flight: identical in-flight requests share one provider call
+- Semantic cache: embedding similarity for near-identical prompts
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (generated_text, tool_calls) - same shape LLMClient.generate() returns
+CachedResponse = Tuple[str, Optional[List[Dict[str, Any]]]]
+
+
+class LLMResponseCache:
+    """
+    Exact-match LRU + TTL cache for deterministic LLM responses
+
+    Keyed by a hash of (provider, model, system, prompt, temperature, max_tokens).
+    Optionally backed by Redis so cached responses are shared across workers;
+    the in-memory LRU is always checked first.
+    """
+
+    REDIS_NAMESPACE = "llm_responses"
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl: Optional[int] = None,
+        use_redis: Optional[bool] = None
+    ):
+        """
+        Initialize response cache
+
+        Args:
+            maxsize: Maximum in-memory entries (default from settings)
+            ttl: Entry lifetime in seconds (default: CACHE_TTL)
+            use_redis: Also read/write the Redis cache (default from settings)
+        """
+        self.maxsize = maxsize or settings.LLM_RESPONSE_CACHE_SIZE
+        self.ttl = ttl or settings.CACHE_TTL
+        self.use_redis = settings.LLM_RESPONSE_CACHE_REDIS if use_redis is None else use_redis
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0
+        }
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        system: Optional[str],
+        prompt: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """Build a stable cache key from the request parameters"""
+        payload = json.dumps({
+            "provider": provider,
+            "model": model,
+            "system": system,
+            "prompt": prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }, sort_keys=True)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Get a cached response
+
+        Returns:
+            Cached (text, tool_calls) or None if missing/expired
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.metrics["hits"] += 1
+                return response
+            del self._entries[key]
+
+        if self.use_redis:
+            from core.cache import cache
+
+            value = cache.get(self.REDIS_NAMESPACE, key)
+            if value is not None:
+                response = (value[0], value[1])
+                self._remember(key, response)
+                self.metrics["hits"] += 1
+                return response
+
+        self.metrics["misses"] += 1
+        return None
+
+    def set(self, key: str, response: CachedResponse):
+        """Cache a response"""
+        self._remember(key, response)
+        self.metrics["sets"] += 1
+
+        if self.use_redis:
+            from core.cache import cache
+
+            cache.set(self.REDIS_NAMESPACE, key, list(response), self.ttl)
+
+    def _remember(self, key: str, response: CachedResponse):
+        """Insert into the in-memory LRU, evicting the least recently used entry"""
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        total_reads = self.metrics["hits"] + self.metrics["misses"]
+        hit_rate = (self.metrics["hits"] / total_reads * 100) if total_reads > 0 else 0
+
+        return {
+            **self.metrics,
+            "total_reads": total_reads,
+            "hit_rate_percent": round(hit_rate, 2),
+            "entries": len(self._entries)
+        }
+
+    def clear(self):
+        """Drop all in-memory cached responses"""
+        self._entries.clear()
+
+
+class SingleFlight:
+    """
+    Request coalescing for identical in-flight LLM calls
+
+    The first caller for a key runs the request; callers arriving while it is
+    in flight await the same result (or exception) instead of issuing a
+    duplicate provider call. Entries are removed as soon as the call settles.
+    If the leader is cancelled, its followers weren't: they retry, and one of
+    them becomes the new leader.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.metrics = {
+            "calls": 0,
+            "coalesced": 0
+        }
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run call() unless an identical call is already in flight
+
+        Args:
+            key: Request identity (e.g. LLMResponseCache.make_key)
+            call: Zero-argument coroutine factory performing the request
+
+        Returns:
+            Result of the (possibly shared) call
+        """
+        while (future := self._inflight.get(key)) is not None:
+            self.metrics["coalesced"] += 1
+            try:
+                # Shield so a cancelled follower doesn't cancel the shared result
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Only the leader was cancelled - try again rather than
+                # failing a caller nobody cancelled
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark exceptions as retrieved when nobody else is waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        self.metrics["calls"] += 1
+
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            # Release the key first so retrying followers can take over
+            self._inflight.pop(key, None)
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        return {
+            **self.metrics,
+            "in_flight": len(self._inflight)
+        }
+
+
+class _SemanticIndex:
+    """
+    Bounded vector index for one provider/model namespace
+
+    Stores L2-normalized embeddings in a contiguous float32 matrix, so cosine
+    similarity against every entry is one matrix-vector product (a BLAS sgemv)
+    with no per-lookup norms. The matrix doubles on overflow up to capacity;
+    once full, the oldest entry is overwritten.
+    """
+
+    def __init__(self, dimensions: int, capacity: int):
+        import numpy as np
+
+        self._np = np
+        self.capacity = capacity
+        self.vectors = np.zeros((min(capacity, 64), dimensions), dtype=np.float32)
+        self.responses: List[Optional[CachedResponse]] = []
+        self.size = 0
+        self._next = 0
+
+    def search(self, embedding) -> Tuple[float, Optional[CachedResponse]]:
+        """Return (similarity, response) of the closest cached prompt (embedding must be unit-length)"""
+        if self.size == 0:
+            return 0.0, None
+
+        scores = self.vectors[:self.size] @ embedding
+        best = int(scores.argmax())
+        return float(scores[best]), self.responses[best]
+
+    def add(self, embedding, response: CachedResponse) -> bool:
+        """Insert an embedding, growing the matrix or evicting the oldest entry (False for zero vectors)"""
+        # Normalize on insert so search() stays a plain dot product
+        embedding = self._np.asarray(embedding, dtype=self._np.float32)
+        norm = self._np.linalg.norm(embedding)
+        if not norm:
+            return False
+
+        if self._next >= len(self.vectors) and len(self.vectors) < self.capacity:
+            grown = self._np.zeros(
+                (min(len(self.vectors) * 2, self.capacity), self.vectors.shape[1]),
+                dtype=self._np.float32
+            )
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+
+        self._np.divide(embedding, norm, out=self.vectors[self._next])
+        if self._next < len(self.responses):
+            self.responses[self._next] = response
+        else:
+            self.responses.append(response)
+
+        self.size = min(self.size + 1, self.capacity)
+        self._next = (self._next + 1) % self.capacity
+        return True
+
+
+class SemanticLLMCache:
+    """
+    Embedding-similarity cache for LLM responses
+
+    Prompts are embedded locally (system + prompt) with a sentence-transformers
+    model. If a previously answered prompt for the same provider, model,
+    max_tokens and temperature (to one decimal) has a cosine similarity above
+    the threshold, its response is returned instead of calling the LLM again.
+
+    Only used for tool-free calls - tool calls have side effects and must
+    always reach the model.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        model_name: Optional[str] = None,
+        encoder: Optional[Callable[[str], Any]] = None
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit (default from settings)
+            max_entries: Maximum cached prompts per index (default from settings)
+            model_name: sentence-transformers model used for embeddings (default from settings)
+            encoder: Optional callable text -> vector, overrides the sentence-transformers model
+        """
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.max_entries = max_entries or settings.SEMANTIC_CACHE_MAX_ENTRIES
+        self.model_name = model_name or settings.SEMANTIC_CACHE_MODEL
+        self._encoder = encoder
+        self._unavailable = False
+        self._load_lock = asyncio.Lock()
+        self._indexes: Dict[Tuple[str, str, int, float], _SemanticIndex] = {}
+
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "errors": 0
+        }
+
+    async def load(self) -> Optional[Callable[[str], Any]]:
+        """
+        Load the embedding model if it isn't loaded yet
+
+        Called at startup when the cache is enabled, and on first use otherwise.
+        Loading reads model weights from disk, so it runs in a worker thread.
+        """
+        if self._encoder is None and not self._unavailable:
+            async with self._load_lock:
+                if self._encoder is None and not self._unavailable:
+                    self._encoder = await asyncio.to_thread(self._load_encoder)
+                    self._unavailable = self._encoder is None
+
+        return self._encoder
+
+    def _load_encoder(self) -> Optional[Callable[[str], Any]]:
+        """Build the sentence-transformers encoder (blocking)"""
+        try:
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(self.model_name)
+            logger.info(f"Loaded semantic cache embedding model: {self.model_name}")
+            return model.encode
+        except ImportError:
+            logger.warning(
+                "sentence-transformers not installed, semantic cache disabled. "
+                "Run: pip install sentence-transformers"
+            )
+        except Exception as e:
+            logger.error(f"Failed to load semantic cache model {self.model_name}: {e}")
+        return None
+
+    @staticmethod
+    def _index_key(provider: str, model: str, max_tokens: int, temperature: float) -> Tuple[str, str, int, float]:
+        """
+        Index a response belongs to
+
+        A response generated under a small max_tokens budget may be truncated,
+        so it is never served to a request allowing more (or fewer) tokens.
+        Temperatures are bucketed to one decimal.
+        """
+        return provider, model, max_tokens, round(temperature, 1)
+
+    async def embed(self, system: Optional[str], prompt: str):
+        """
+        Embed system message + prompt as a normalized float32 vector
+
+        Runs the (CPU-bound) encoder in a worker thread so the event loop
+        stays responsive.
+
+        Returns:
+            Normalized embedding, or None if the cache is unavailable
+        """
+        encoder = await self.load()
+        if encoder is None:
+            return None
+
+        try:
+            import numpy as np
+
+            text = f"{system or ''}\n{prompt}"
+            vector = np.asarray(await asyncio.to_thread(encoder, text), dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.error(f"Semantic cache embedding failed: {e}")
+            return None
+
+    def lookup(
+        self,
+        provider: str,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        embedding
+    ) -> Optional[CachedResponse]:
+        """
+        Find a cached response for a semantically equivalent prompt with the
+        same generation settings
+
+        Returns:
+            Cached (text, tool_calls) or None on miss
+        """
+        if embedding is None:
+            return None
+
+        index = self._indexes.get(self._index_key(provider, model, max_tokens, temperature))
+        similarity, response = index.search(embedding) if index else (0.0, None)
+
+        if response is not None and similarity >= self.threshold:
+            self.metrics["hits"] += 1
+            logger.debug(f"Semantic cache HIT: {provider}/{model} (similarity: {similarity:.3f})")
+            return response
+
+        self.metrics["misses"] += 1
+        return None
+
+    def store(
+        self,
+        provider: str,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        embedding,
+        response: CachedResponse
+    ):
+        """Cache a generated response under the prompt embedding"""
+        if embedding is None:
+            return
+
+        key = self._index_key(provider, model, max_tokens, temperature)
+        index = self._indexes.get(key)
+        if index is None:
+            index = _SemanticIndex(len(embedding), self.max_entries)
+            self._indexes[key] = index
+
+        if index.add(embedding, response):
+            self.metrics["sets"] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        total_reads = self.metrics["hits"] + self.metrics["misses"]
+        hit_rate = (self.metrics["hits"] / total_reads * 100) if total_reads > 0 else 0
+
+        return {
+            **self.metrics,
+            "total_reads": total_reads,
+            "hit_rate_percent": round(hit_rate, 2),
+            "entries": sum(index.size for index in self._indexes.values())
+        }
+
+    def clear(self):
+        """Drop all cached responses"""
+        self._indexes.clear()
+
+
+# Global cache instances
+llm_response_cache = LLMResponseCache()
+llm_singleflight = SingleFlight()
+semantic_llm_cache = SemanticLLMCache()
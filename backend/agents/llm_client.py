@@ -5,7 +5,10 @@ Supports Anthropic Claude, OpenAI, and Ollama
 
 from typing import Optional, Dict, Any, List, Tuple
 import logging
+from core import json_codec
 from core.config import settings
+from core.http_client import get_shared_client
+from agents.llm_cache import llm_response_cache, llm_singleflight, semantic_llm_cache
 from core.error_handling import (
     LLMError,
     LLMAPIError,
@@ -20,6 +23,50 @@ from core.error_handling import (
 
 logger = logging.getLogger(__name__)
 
+# Anthropic requires a system prompt; used when the caller doesn't supply one
+_DEFAULT_SYSTEM = "You are a helpful AI assistant."
+
+_PROVIDERS = ("anthropic", "openai", "ollama")
+_NATIVE_TOOL_PROVIDERS = ("anthropic", "openai")
+
+# Provider tool request params, keyed by (provider, id(tools)). The tools list
+# is kept in the entry so its id can't be reused while cached.
+_TOOL_PARAMS: Dict[Tuple[str, int], Tuple[List[Dict[str, Any]], Dict[str, Any]]] = {}
+_TOOL_PARAMS_MAX = 64
+
+# One SDK client (and so one connection pool) per provider for the whole
+# process. SDK clients hold no per-model state, so every LLMClient can share
+# them and reuse the same warm connections.
+_SDK_CLIENTS: Dict[str, Any] = {}
+
+# Provider SDK client classes, imported on first use and reused afterwards
+_async_anthropic_cls = None
+_async_openai_cls = None
+
+
+def _get_async_anthropic_cls():
+    """Import and cache anthropic.AsyncAnthropic"""
+    global _async_anthropic_cls
+    if _async_anthropic_cls is None:
+        try:
+            from anthropic import AsyncAnthropic
+        except ImportError:
+            raise ImportError("anthropic package not installed. Run: pip install anthropic")
+        _async_anthropic_cls = AsyncAnthropic
+    return _async_anthropic_cls
+
+
+def _get_async_openai_cls():
+    """Import and cache openai.AsyncOpenAI"""
+    global _async_openai_cls
+    if _async_openai_cls is None:
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
+            raise ImportError("openai package not installed. Run: pip install openai")
+        _async_openai_cls = AsyncOpenAI
+    return _async_openai_cls
+
 
 class LLMClient:
     """
@@ -28,18 +75,32 @@ class LLMClient:
 
     def __init__(self, provider: Optional[str] = None, model: Optional[str] = None):
         self.provider = provider or settings.DEFAULT_LLM_PROVIDER
-        self.model = model or self._get_default_model()
 
         # Initialize the appropriate client
-        if self.provider == "anthropic":
-            self._init_anthropic()
-        elif self.provider == "openai":
-            self._init_openai()
-        elif self.provider == "ollama":
-            self._init_ollama()
-        else:
+        if self.provider not in _PROVIDERS:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
+        self.model = model or self._get_default_model()
+        getattr(self, f"_init_{self.provider}")()
+        self._bind_provider()
+
+        # Fallback chain, built on the first fallback-worthy failure
+        self._fallback: Optional["FallbackLLMClient"] = None
+
+        # Last OpenAI system message, reused while the system prompt is unchanged
+        self._system_msg: Optional[Dict[str, str]] = None
+
+        # Last Anthropic system blocks, reused the same way
+        self._system_blocks: Optional[List[Dict[str, Any]]] = None
+
+    def _bind_provider(self):
+        """
+        Resolve provider-specific methods once instead of branching per call.
+        """
+        self._generate_impl = getattr(self, f"_generate_{self.provider}")
+        self._stream_impl = getattr(self, f"_stream_{self.provider}")
+        self._has_native_tools = self.provider in _NATIVE_TOOL_PROVIDERS
+
     def _get_default_model(self) -> str:
         """Get default model for the provider"""
         if self.provider == "anthropic":
@@ -52,41 +113,40 @@ class LLMClient:
 
     def _init_anthropic(self):
         """Initialize Anthropic Claude client"""
-        try:
-            from anthropic import Anthropic
+        if not settings.ANTHROPIC_API_KEY:
+            raise ValueError("ANTHROPIC_API_KEY not set in environment")
 
-            if not settings.ANTHROPIC_API_KEY:
-                raise ValueError("ANTHROPIC_API_KEY not set in environment")
-
-            self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-            logger.info(f"Initialized Anthropic client with model: {self.model}")
-        except ImportError:
-            raise ImportError("anthropic package not installed. Run: pip install anthropic")
+        if "anthropic" not in _SDK_CLIENTS:
+            _SDK_CLIENTS["anthropic"] = _get_async_anthropic_cls()(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = _SDK_CLIENTS["anthropic"]
+        self._base_params = {"model": self.model, "system": _DEFAULT_SYSTEM}
+        logger.info(f"Initialized Anthropic client with model: {self.model}")
 
     def _init_openai(self):
         """Initialize OpenAI client"""
-        try:
-            from openai import OpenAI
-
-            if not settings.OPENAI_API_KEY:
-                raise ValueError("OPENAI_API_KEY not set in environment")
+        if not settings.OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not set in environment")
 
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            logger.info(f"Initialized OpenAI client with model: {self.model}")
-        except ImportError:
-            raise ImportError("openai package not installed. Run: pip install openai")
+        self.client = get_openai_client()
+        self._base_params = {"model": self.model}
+        logger.info(f"Initialized OpenAI client with model: {self.model}")
 
     def _init_ollama(self):
-        """Initialize Ollama client"""
-        try:
-            import httpx
-            self.client = httpx.AsyncClient(
-                base_url=settings.OLLAMA_HOST,
-                timeout=httpx.Timeout(180.0)  # 3 minute timeout for local models (can be slow with concurrent requests)
-            )
-            logger.info(f"Initialized Ollama client with model: {self.model}")
-        except ImportError:
-            raise ImportError("httpx package not installed. Run: pip install httpx")
+        """Initialize Ollama client (shared connection pool per host)"""
+        # 3 minute timeout for local models (can be slow with concurrent requests)
+        self.client = get_shared_client(settings.OLLAMA_HOST, timeout=180.0, http2=settings.LLM_HTTP2)
+        self._base_params = {"model": self.model}
+        logger.info(f"Initialized Ollama client with model: {self.model}")
+
+    def _ensure_ollama_client(self):
+        """
+        Reopen the Ollama client if it was closed (e.g. shared pool shut down
+        on hot-reload) instead of failing over to another provider.
+        Cheap: the shared registry hands back the live pool for the host.
+        """
+        if getattr(self, "client", None) is None or self.client.is_closed:
+            logger.info("Ollama client closed, reopening shared connection pool")
+            self._init_ollama()
 
     def has_native_tool_calling(self) -> bool:
         """
@@ -96,7 +156,59 @@ class LLMClient:
             True if provider has native tool calling support (Anthropic, OpenAI)
             False for providers that need text-based tool invocation (Ollama)
         """
-        return self.provider in ["anthropic", "openai"]
+        return self._has_native_tools
+
+    def _openai_messages(self, system: Optional[str], prompt: str) -> List[Dict[str, str]]:
+        """Build chat messages, reusing the system message dict across calls"""
+        if not system:
+            return [{"role": "user", "content": prompt}]
+
+        if self._system_msg is None or self._system_msg["content"] != system:
+            self._system_msg = {"role": "system", "content": system}
+        return [self._system_msg, {"role": "user", "content": prompt}]
+
+    def _anthropic_system(self, system: str) -> Any:
+        """
+        Anthropic system param, marked as a cacheable prompt prefix
+
+        Agent system prompts (and the tools sent ahead of them) are the same
+        on every call, so with prompt caching the provider reuses the
+        processed prefix instead of reading it again. Prompts shorter than
+        the model's minimum cacheable length are simply not cached.
+        """
+        if not settings.ANTHROPIC_PROMPT_CACHING:
+            return system
+
+        if self._system_blocks is None or self._system_blocks[0]["text"] != system:
+            self._system_blocks = [
+                {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+            ]
+        return self._system_blocks
+
+    def register_tools(self, tools: List[Dict[str, Any]]):
+        """
+        Pre-build the request params for a tool list reused across calls
+        (e.g. an agent's filesystem tools), so later calls only merge them.
+
+        Args:
+            tools: Tool schemas in this provider's format
+        """
+        self._tool_params(tools)
+
+    def _tool_params(self, tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Get the memoized tool request params for the current provider"""
+        key = (self.provider, id(tools))
+        entry = _TOOL_PARAMS.get(key)
+        if entry is None or entry[0] is not tools:
+            params = {"tools": tools}
+            if self.provider == "openai":
+                params["tool_choice"] = "auto"
+
+            if len(_TOOL_PARAMS) >= _TOOL_PARAMS_MAX:
+                _TOOL_PARAMS.clear()
+            entry = (tools, params)
+            _TOOL_PARAMS[key] = entry
+        return entry[1]
 
     async def generate(
         self,
@@ -123,79 +235,109 @@ class LLMClient:
             - generated_text: The text response from the LLM
             - tool_calls: List of tool calls if LLM requested any, None otherwise
         """
-        try:
-            if self.provider == "anthropic":
-                return await self._generate_anthropic(prompt, system, temperature, max_tokens, tools, **kwargs)
-            elif self.provider == "openai":
-                return await self._generate_openai(prompt, system, temperature, max_tokens, tools, **kwargs)
-            elif self.provider == "ollama":
-                return await self._generate_ollama(prompt, system, temperature, max_tokens, tools, **kwargs)
-        except LLMError as e:
-            # Check if we should try fallback providers
-            if ErrorRecoveryStrategy.should_fallback_to_different_provider(e):
-                logger.warning(f"Primary provider {self.provider} failed, attempting fallback...")
-                return await self._try_fallback_providers(prompt, system, temperature, max_tokens, tools, **kwargs)
-            raise
+        # Tool calls are side-effectful, so only tool-free prompts are cached or coalesced
+        if tools:
+            return await self._generate_with_fallback(prompt, system, temperature, max_tokens, tools, **kwargs)
 
-    async def _try_fallback_providers(
+        if temperature != 0:
+            return await self._generate_cached(prompt, system, temperature, max_tokens, None, **kwargs)
+
+        # Deterministic prompt: exact cache first, then share identical in-flight requests
+        response_key = llm_response_cache.make_key(
+            self.provider, self.model, system, prompt, temperature, max_tokens
+        )
+        if settings.ENABLE_CACHE:
+            cached = llm_response_cache.get(response_key)
+            if cached is not None:
+                return cached
+
+        return await llm_singleflight.run(
+            response_key,
+            lambda: self._generate_cached(prompt, system, temperature, max_tokens, response_key, **kwargs)
+        )
+
+    async def _generate_cached(
         self,
         prompt: str,
         system: Optional[str],
         temperature: float,
         max_tokens: int,
-        tools: Optional[List[Dict[str, Any]]],
+        response_key: Optional[str],
         **kwargs
     ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
         """
-        Try alternative providers when primary provider fails
+        Generate a tool-free response through the semantic cache
 
         Args:
-            Same as generate()
+            Same as generate(), without tools
+            response_key: Exact-cache key to store the result under (deterministic prompts only)
+        """
+        # Semantic cache for near-identical prompts
+        embedding = None
+        if settings.SEMANTIC_CACHE_ENABLED:
+            embedding = await semantic_llm_cache.embed(system, prompt)
+            cached = semantic_llm_cache.lookup(
+                self.provider, self.model, max_tokens, temperature, embedding
+            )
+            if cached is not None:
+                return cached
 
-        Returns:
-            Response from successful fallback provider
+        result = await self._generate_with_fallback(prompt, system, temperature, max_tokens, None, **kwargs)
 
-        Raises:
-            LLMError if all fallback providers fail
+        if response_key is not None and settings.ENABLE_CACHE:
+            llm_response_cache.set(response_key, result)
+        if embedding is not None:
+            semantic_llm_cache.store(
+                self.provider, self.model, max_tokens, temperature, embedding, result
+            )
+        return result
+
+    async def _generate_with_fallback(
+        self,
+        prompt: str,
+        system: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        tools: Optional[List[Dict[str, Any]]],
+        **kwargs
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
         """
-        fallback_providers = ErrorRecoveryStrategy.get_fallback_order(self.provider)
-        original_provider = self.provider
-        original_model = self.model
+        Generate with the configured provider, falling back to others on failure
 
-        for fallback_provider in fallback_providers:
-            try:
-                logger.info(f"Trying fallback provider: {fallback_provider}")
-
-                # Temporarily switch to fallback provider
-                self.provider = fallback_provider
-                self.model = self._get_default_model()
-
-                # Re-initialize client for fallback provider
-                if fallback_provider == "anthropic":
-                    self._init_anthropic()
-                    result = await self._generate_anthropic(prompt, system, temperature, max_tokens, tools, **kwargs)
-                elif fallback_provider == "openai":
-                    self._init_openai()
-                    result = await self._generate_openai(prompt, system, temperature, max_tokens, tools, **kwargs)
-                elif fallback_provider == "ollama":
-                    self._init_ollama()
-                    result = await self._generate_ollama(prompt, system, temperature, max_tokens, tools, **kwargs)
-
-                logger.info(f"Successfully used fallback provider: {fallback_provider}")
-                return result
+        Args:
+            Same as generate()
+        """
+        try:
+            return await self._generate_impl(prompt, system, temperature, max_tokens, tools, **kwargs)
+        except LLMError as e:
+            # Logged once here, after retries, rather than on every attempt
+            context = {
+                "provider": self.provider,
+                "model": self.model,
+                "prompt_length": len(prompt),
+                "has_tools": tools is not None
+            }
+            if self.provider == "ollama":
+                context["ollama_host"] = settings.OLLAMA_HOST
+            structured_log_error(e, context)
 
-            except Exception as e:
-                logger.warning(f"Fallback provider {fallback_provider} also failed: {e}")
-                continue
-
-        # All fallback providers failed - restore original and raise
-        self.provider = original_provider
-        self.model = original_model
-        raise LLMAPIError(
-            f"All LLM providers failed. Original: {original_provider}, Tried: {', '.join(fallback_providers)}",
-            provider=original_provider,
-            model=original_model
-        )
+            # Check if we should try fallback providers
+            if ErrorRecoveryStrategy.should_fallback_to_different_provider(e):
+                logger.warning(f"Primary provider {self.provider} failed, attempting fallback...")
+                if self._fallback is None:
+                    self._fallback = FallbackLLMClient(
+                        ErrorRecoveryStrategy.get_fallback_order(self.provider)
+                    )
+                try:
+                    return await self._fallback.generate(prompt, system, temperature, max_tokens, tools, **kwargs)
+                except LLMError:
+                    raise LLMAPIError(
+                        f"All LLM providers failed. Original: {self.provider}, "
+                        f"Tried: {', '.join(self._fallback.providers)}",
+                        provider=self.provider,
+                        model=self.model
+                    )
+            raise
 
     @retry_with_exponential_backoff(max_attempts=3, initial_delay=1.0)
     async def _generate_anthropic(
@@ -209,30 +351,27 @@ class LLMClient:
     ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
         """Generate using Anthropic Claude with retry logic"""
         try:
-            messages = [{"role": "user", "content": prompt}]
-
-            # Build request parameters
-            params = {
-                "model": self.model,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "system": system if system else "You are a helpful AI assistant.",
-                "messages": messages
-            }
+            # Build request parameters from the per-client template
+            params = self._base_params.copy()
+            params["max_tokens"] = max_tokens
+            params["temperature"] = temperature
+            if system:
+                params["system"] = self._anthropic_system(system)
+            params["messages"] = [{"role": "user", "content": prompt}]
 
             # Add tools if provided
             if tools:
-                params["tools"] = tools
+                params.update(self._tool_params(tools))
 
-            response = self.client.messages.create(**params)
+            response = await self.client.messages.create(**params)
 
-            # Extract text content
-            text_content = ""
+            # Extract text content (joined once to avoid repeated string copies)
+            text_parts = []
             tool_calls = []
 
             for block in response.content:
                 if block.type == "text":
-                    text_content += block.text
+                    text_parts.append(block.text)
                 elif block.type == "tool_use":
                     # Convert Anthropic tool use to standard format
                     tool_calls.append({
@@ -241,21 +380,13 @@ class LLMClient:
                         "input": block.input
                     })
 
-            return text_content, tool_calls if tool_calls else None
+            return "".join(text_parts), tool_calls if tool_calls else None
 
         except Exception as e:
             # Classify and convert to LLMError
             llm_error = classify_error(e, "anthropic")
             llm_error.model = self.model
 
-            # Log with structured context
-            structured_log_error(e, {
-                "provider": "anthropic",
-                "model": self.model,
-                "prompt_length": len(prompt),
-                "has_tools": tools is not None
-            })
-
             raise llm_error
 
     @retry_with_exponential_backoff(max_attempts=3, initial_delay=1.0)
@@ -270,25 +401,19 @@ class LLMClient:
     ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
         """Generate using OpenAI with retry logic"""
         try:
-            messages = []
-            if system:
-                messages.append({"role": "system", "content": system})
-            messages.append({"role": "user", "content": prompt})
+            messages = self._openai_messages(system, prompt)
 
-            # Build request parameters
-            params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens
-            }
+            # Build request parameters from the per-client template
+            params = self._base_params.copy()
+            params["messages"] = messages
+            params["temperature"] = temperature
+            params["max_tokens"] = max_tokens
 
             # Add tools if provided
             if tools:
-                params["tools"] = tools
-                params["tool_choice"] = "auto"
+                params.update(self._tool_params(tools))
 
-            response = self.client.chat.completions.create(**params)
+            response = await self.client.chat.completions.create(**params)
 
             message = response.choices[0].message
             text_content = message.content or ""
@@ -298,11 +423,10 @@ class LLMClient:
             if hasattr(message, 'tool_calls') and message.tool_calls:
                 tool_calls = []
                 for tc in message.tool_calls:
-                    import json
                     tool_calls.append({
                         "id": tc.id,
                         "name": tc.function.name,
-                        "input": json.loads(tc.function.arguments)
+                        "input": json_codec.loads(tc.function.arguments)
                     })
 
             return text_content, tool_calls
@@ -312,14 +436,6 @@ class LLMClient:
             llm_error = classify_error(e, "openai")
             llm_error.model = self.model
 
-            # Log with structured context
-            structured_log_error(e, {
-                "provider": "openai",
-                "model": self.model,
-                "prompt_length": len(prompt),
-                "has_tools": tools is not None
-            })
-
             raise llm_error
 
     @retry_with_exponential_backoff(max_attempts=3, initial_delay=1.0)
@@ -338,48 +454,33 @@ class LLMClient:
         Note: Ollama doesn't support native tool calling.
         Tools are ignored here; tool extraction happens via XML parsing in BaseAgent.
         """
-        import json
-
         logger.info("OLLAMA _generate_ollama called")
         logger.info(f"Prompt length: {len(prompt)}, Model: {self.model}")
 
         try:
-            # Check if client exists and is properly initialized
-            if not hasattr(self, 'client'):
-                raise LLMAPIError(
-                    "Ollama client not initialized",
-                    provider="ollama",
-                    model=self.model
-                )
-
-            if self.client.is_closed:
-                raise LLMAPIError(
-                    "Ollama client connection is closed",
-                    provider="ollama",
-                    model=self.model
-                )
-
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
+            self._ensure_ollama_client()
+
+            payload = self._base_params.copy()
+            payload["prompt"] = prompt
+            payload["stream"] = False
+            payload["options"] = {
+                "temperature": temperature,
+                "num_predict": max_tokens
             }
 
             if system:
                 payload["system"] = system
 
-            # Build and send request
-            request = self.client.build_request("POST", "/api/generate", json=payload)
-            response = await self.client.send(request)
+            response = await self.client.post(
+                "/api/generate",
+                content=json_codec.dumps(payload),
+                headers=json_codec.JSON_HEADERS
+            )
 
             response.raise_for_status()
 
             # Parse response
-            data = response.json()
+            data = json_codec.loads(response.content)
             result = data.get("response", "")
             logger.info(f"Ollama response received, length: {len(result)}")
 
@@ -391,15 +492,6 @@ class LLMClient:
             llm_error = classify_error(e, "ollama")
             llm_error.model = self.model
 
-            # Log with structured context
-            structured_log_error(e, {
-                "provider": "ollama",
-                "model": self.model,
-                "prompt_length": len(prompt),
-                "has_tools": tools is not None,
-                "ollama_host": settings.OLLAMA_HOST
-            })
-
             raise llm_error
 
     async def stream(
@@ -429,15 +521,8 @@ class LLMClient:
             - is_final: True if this is the final chunk
             - tool_calls: List of tool calls (only present in final chunk if applicable)
         """
-        if self.provider == "anthropic":
-            async for chunk in self._stream_anthropic(prompt, system, temperature, max_tokens, tools, **kwargs):
-                yield chunk
-        elif self.provider == "openai":
-            async for chunk in self._stream_openai(prompt, system, temperature, max_tokens, tools, **kwargs):
-                yield chunk
-        elif self.provider == "ollama":
-            async for chunk in self._stream_ollama(prompt, system, temperature, max_tokens, tools, **kwargs):
-                yield chunk
+        async for chunk in self._stream_impl(prompt, system, temperature, max_tokens, tools, **kwargs):
+            yield chunk
 
     async def _stream_anthropic(
         self,
@@ -450,20 +535,17 @@ class LLMClient:
     ):
         """Stream using Anthropic Claude with messages.stream()"""
         try:
-            messages = [{"role": "user", "content": prompt}]
-
-            # Build request parameters
-            params = {
-                "model": self.model,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "system": system if system else "You are a helpful AI assistant.",
-                "messages": messages
-            }
+            # Build request parameters from the per-client template
+            params = self._base_params.copy()
+            params["max_tokens"] = max_tokens
+            params["temperature"] = temperature
+            if system:
+                params["system"] = self._anthropic_system(system)
+            params["messages"] = [{"role": "user", "content": prompt}]
 
             # Add tools if provided
             if tools:
-                params["tools"] = tools
+                params.update(self._tool_params(tools))
 
             # Use streaming API
             accumulated_text = ""
@@ -496,8 +578,8 @@ class LLMClient:
                             # Message complete
                             break
 
-            # Get final message to extract tool calls
-            final_message = await stream.get_final_message()
+                # Get final message to extract tool calls
+                final_message = await stream.get_final_message()
 
             # Extract tool calls from final message
             for block in final_message.content:
@@ -526,32 +608,26 @@ class LLMClient:
     ):
         """Stream using OpenAI with stream=True"""
         try:
-            messages = []
-            if system:
-                messages.append({"role": "system", "content": system})
-            messages.append({"role": "user", "content": prompt})
+            messages = self._openai_messages(system, prompt)
 
-            # Build request parameters
-            params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-                "stream": True
-            }
+            # Build request parameters from the per-client template
+            params = self._base_params.copy()
+            params["messages"] = messages
+            params["temperature"] = temperature
+            params["max_tokens"] = max_tokens
+            params["stream"] = True
 
             # Add tools if provided
             if tools:
-                params["tools"] = tools
-                params["tool_choice"] = "auto"
+                params.update(self._tool_params(tools))
 
             # Stream response
             accumulated_text = ""
             tool_calls_accumulator = {}
 
-            stream = self.client.chat.completions.create(**params)
+            stream = await self.client.chat.completions.create(**params)
 
-            for chunk in stream:
+            async for chunk in stream:
                 if not chunk.choices:
                     continue
 
@@ -589,13 +665,12 @@ class LLMClient:
             # Convert accumulated tool calls to standard format
             tool_calls = None
             if tool_calls_accumulator:
-                import json
                 tool_calls = []
                 for tc in tool_calls_accumulator.values():
                     tool_calls.append({
                         "id": tc["id"],
                         "name": tc["name"],
-                        "input": json.loads(tc["arguments"]) if tc["arguments"] else {}
+                        "input": json_codec.loads(tc["arguments"]) if tc["arguments"] else {}
                     })
 
             # Yield final chunk
@@ -615,28 +690,28 @@ class LLMClient:
         **kwargs
     ):
         """Stream using Ollama with stream=True"""
-        import json
-
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": True,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
+            self._ensure_ollama_client()
+
+            payload = self._base_params.copy()
+            payload["prompt"] = prompt
+            payload["stream"] = True
+            payload["options"] = {
+                "temperature": temperature,
+                "num_predict": max_tokens
             }
 
             if system:
                 payload["system"] = system
 
-            # Send streaming request
-            request = self.client.build_request("POST", "/api/generate", json=payload)
-
             accumulated_text = ""
 
-            async with self.client.stream("POST", "/api/generate", json=payload) as response:
+            async with self.client.stream(
+                "POST",
+                "/api/generate",
+                content=json_codec.dumps(payload),
+                headers=json_codec.JSON_HEADERS
+            ) as response:
                 response.raise_for_status()
 
                 async for line in response.aiter_lines():
@@ -644,7 +719,7 @@ class LLMClient:
                         continue
 
                     try:
-                        data = json.loads(line)
+                        data = json_codec.loads(line)
 
                         # Extract response chunk
                         if "response" in data:
@@ -660,7 +735,7 @@ class LLMClient:
                             if is_done:
                                 break
 
-                    except json.JSONDecodeError as e:
+                    except json_codec.JSONDecodeError as e:
                         logger.warning(f"Failed to parse Ollama stream line: {line}")
                         continue
 
@@ -683,22 +758,41 @@ class LLMClient:
         """
         DEPRECATED: Use stream() instead.
         Generate text with streaming (for backward compatibility).
+
+        Yields (text_chunk, tool_calls) as chunks arrive from the provider;
+        tool_calls is only set on the final chunk.
         """
         logger.warning("generate_streaming() is deprecated, use stream() instead")
-        response, tool_calls = await self.generate(prompt, system, temperature, max_tokens, tools)
-        yield response, tool_calls
+        async for text_chunk, is_final, tool_calls in self.stream(prompt, system, temperature, max_tokens, tools):
+            if text_chunk or is_final:
+                yield text_chunk, tool_calls if is_final else None
+
+    async def warmup(self):
+        """
+        Open a keep-alive connection to the provider ahead of the first real
+        request, so it doesn't pay the TCP + TLS handshake.
+        Uses a cheap metadata call; failures are logged and ignored.
+        """
+        try:
+            if self.provider == "ollama":
+                await self.client.get("/api/tags")
+            else:
+                await self.client.models.list()
+            logger.info(f"Warmed up {self.provider} connection")
+        except Exception as e:
+            # Any response (even an error) leaves a warm connection in the pool
+            logger.debug(f"{self.provider} warm-up request failed: {e}")
 
     async def aclose(self):
         """
-        Close the LLM client and cleanup resources.
-        This is important for the Ollama provider which uses httpx.AsyncClient.
+        Release the LLM client and its fallback chain.
+        Provider clients are shared process-wide and closed once at app
+        shutdown (shutdown_provider_clients / core.http_client.shutdown_clients),
+        so no connections are closed here.
         """
-        if self.provider == "ollama" and hasattr(self, 'client'):
-            try:
-                await self.client.aclose()
-                logger.debug(f"Closed {self.provider} client")
-            except Exception as e:
-                logger.warning(f"Error closing {self.provider} client: {e}")
+        if self._fallback is not None:
+            await self._fallback.aclose()
+            self._fallback = None
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -707,3 +801,90 @@ class LLMClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         await self.aclose()
+
+
+class FallbackLLMClient:
+    """
+    Ordered chain of pre-built LLM clients, tried until one succeeds
+
+    Each provider keeps its own LLMClient (and shared connection pool), built
+    once, so failing over never mutates or re-initializes the primary client.
+    Providers that can't be initialized (e.g. missing API key) are skipped.
+    """
+
+    def __init__(self, providers: List[str]):
+        """
+        Build the fallback chain
+
+        Args:
+            providers: Provider names in the order they should be tried
+        """
+        self.providers = providers
+        self._chain: List[LLMClient] = []
+
+        for provider in providers:
+            try:
+                self._chain.append(LLMClient(provider=provider))
+            except Exception as e:
+                logger.warning(f"Fallback provider {provider} unavailable: {e}")
+
+    async def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        """
+        Generate with the first provider in the chain that succeeds
+
+        Each provider gets its own retries but no further fallback.
+
+        Raises:
+            LLMAPIError if every provider in the chain fails
+        """
+        for client in self._chain:
+            try:
+                logger.info(f"Trying fallback provider: {client.provider}")
+                result = await client._generate_impl(prompt, system, temperature, max_tokens, tools, **kwargs)
+                logger.info(f"Successfully used fallback provider: {client.provider}")
+                return result
+            except Exception as e:
+                logger.warning(f"Fallback provider {client.provider} also failed: {e}")
+
+        raise LLMAPIError(f"All fallback providers failed: {', '.join(self.providers)}")
+
+    async def aclose(self):
+        """Release every client in the chain"""
+        for client in self._chain:
+            await client.aclose()
+        self._chain.clear()
+
+
+def get_openai_client():
+    """
+    Get the process-wide AsyncOpenAI client
+
+    Shared by LLMClient and the memory manager's embedding calls, so both
+    reuse one connection pool. Closed by shutdown_provider_clients().
+    """
+    if "openai" not in _SDK_CLIENTS:
+        _SDK_CLIENTS["openai"] = _get_async_openai_cls()(api_key=settings.OPENAI_API_KEY)
+    return _SDK_CLIENTS["openai"]
+
+
+async def shutdown_provider_clients():
+    """
+    Close the shared Anthropic/OpenAI SDK clients
+    Called from the FastAPI lifespan on shutdown.
+    """
+    for provider, client in list(_SDK_CLIENTS.items()):
+        try:
+            await client.close()
+            logger.debug(f"Closed shared {provider} client")
+        except Exception as e:
+            logger.warning(f"Error closing shared {provider} client: {e}")
+
+    _SDK_CLIENTS.clear()
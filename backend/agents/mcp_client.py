@@ -3,10 +3,13 @@ MCP Filesystem Client
 Async HTTP client for communicating with MCP filesystem server
 """
 
+import asyncio
 import httpx
 import logging
 from typing import Dict, Any, Optional, List
+from core import json_codec
 from core.config import settings
+from core.http_client import get_shared_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,9 @@ class MCPFilesystemClient:
     - create_directory: Create directory
     - delete_file: Delete file
     - file_exists: Check if file/directory exists
+
+    Bulk variants (read_files, files_exist, list_directories) run many
+    operations concurrently over the shared connection pool.
     """
 
     def __init__(
@@ -42,24 +48,24 @@ class MCPFilesystemClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self._client: Optional[httpx.AsyncClient] = None
+        self._batch_read_supported = True
 
         logger.info(f"Initialized MCPFilesystemClient: {self.base_url}")
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client"""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                timeout=self.timeout
-            )
+        """Get the shared HTTP client for this server"""
+        if self._client is None or self._client.is_closed:
+            self._client = get_shared_client(self.base_url, self.timeout, http2=settings.MCP_HTTP2)
         return self._client
 
     async def close(self):
-        """Close HTTP client connection"""
+        """
+        Release HTTP client connection
+        The pool itself is shared and closed by shutdown_clients() at app shutdown.
+        """
         if self._client:
-            await self._client.aclose()
             self._client = None
-            logger.debug("Closed MCP filesystem client connection")
+            logger.debug("Released MCP filesystem client connection")
 
     async def health_check(self) -> Dict[str, Any]:
         """
@@ -75,7 +81,7 @@ class MCPFilesystemClient:
             client = await self._get_client()
             response = await client.get("/health")
             response.raise_for_status()
-            return response.json()
+            return json_codec.loads(response.content)
         except Exception as e:
             logger.error(f"MCP filesystem server health check failed: {e}")
             raise Exception(f"MCP filesystem server not available: {e}")
@@ -91,7 +97,7 @@ class MCPFilesystemClient:
             client = await self._get_client()
             response = await client.get("/tools")
             response.raise_for_status()
-            return response.json().get("tools", [])
+            return json_codec.loads(response.content).get("tools", [])
         except Exception as e:
             logger.error(f"Failed to get MCP tools: {e}")
             return []
@@ -114,10 +120,11 @@ class MCPFilesystemClient:
             client = await self._get_client()
             response = await client.post(
                 "/tools/read_file",
-                json={"path": path}
+                content=json_codec.dumps({"path": path}),
+                headers=json_codec.JSON_HEADERS
             )
             response.raise_for_status()
-            result = response.json()
+            result = json_codec.loads(response.content)
             logger.info(f"Read file: {path} ({result.get('size', 0)} bytes)")
             return result
         except httpx.HTTPStatusError as e:
@@ -156,10 +163,11 @@ class MCPFilesystemClient:
             client = await self._get_client()
             response = await client.post(
                 "/tools/write_file",
-                json={"path": path, "content": content}
+                content=json_codec.dumps({"path": path, "content": content}),
+                headers=json_codec.JSON_HEADERS
             )
             response.raise_for_status()
-            result = response.json()
+            result = json_codec.loads(response.content)
             logger.info(f"Wrote file: {path} ({result.get('size', 0)} bytes)")
             return result
         except httpx.HTTPStatusError as e:
@@ -195,10 +203,11 @@ class MCPFilesystemClient:
             client = await self._get_client()
             response = await client.post(
                 "/tools/list_directory",
-                json={"path": path}
+                content=json_codec.dumps({"path": path}),
+                headers=json_codec.JSON_HEADERS
             )
             response.raise_for_status()
-            result = response.json()
+            result = json_codec.loads(response.content)
             logger.info(f"Listed directory: {path or '/'} ({len(result.get('files', []))} items)")
             return result
         except httpx.HTTPStatusError as e:
@@ -233,10 +242,11 @@ class MCPFilesystemClient:
             client = await self._get_client()
             response = await client.post(
                 "/tools/create_directory",
-                json={"path": path}
+                content=json_codec.dumps({"path": path}),
+                headers=json_codec.JSON_HEADERS
             )
             response.raise_for_status()
-            result = response.json()
+            result = json_codec.loads(response.content)
             logger.info(f"Created directory: {path}")
             return result
         except httpx.HTTPStatusError as e:
@@ -269,10 +279,11 @@ class MCPFilesystemClient:
             client = await self._get_client()
             response = await client.post(
                 "/tools/delete_file",
-                json={"path": path}
+                content=json_codec.dumps({"path": path}),
+                headers=json_codec.JSON_HEADERS
             )
             response.raise_for_status()
-            result = response.json()
+            result = json_codec.loads(response.content)
             logger.info(f"Deleted file: {path}")
             return result
         except httpx.HTTPStatusError as e:
@@ -307,10 +318,11 @@ class MCPFilesystemClient:
             client = await self._get_client()
             response = await client.post(
                 "/tools/file_exists",
-                json={"path": path}
+                content=json_codec.dumps({"path": path}),
+                headers=json_codec.JSON_HEADERS
             )
             response.raise_for_status()
-            result = response.json()
+            result = json_codec.loads(response.content)
             logger.debug(f"Checked existence: {path} - {result.get('exists', False)}")
             return result
         except httpx.HTTPStatusError as e:
@@ -326,9 +338,72 @@ class MCPFilesystemClient:
                 "error": str(e)
             }
 
-    def __del__(self):
-        """Cleanup on deletion"""
-        # Note: Can't call async close() from __del__
-        # Clients should explicitly call close() or use as context manager
-        if self._client:
-            logger.warning("MCPFilesystemClient deleted without calling close()")
+    async def _gather(self, operation, paths: List[str]) -> List[Dict[str, Any]]:
+        """Run a single-path operation for every path concurrently"""
+        results = await asyncio.gather(
+            *(operation(path) for path in paths),
+            return_exceptions=True
+        )
+        return [
+            {"success": False, "path": path, "error": str(result)}
+            if isinstance(result, Exception) else result
+            for path, result in zip(paths, results)
+        ]
+
+    async def read_files(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Read multiple files in one round-trip
+
+        Uses the server's batch endpoint, falling back to concurrent
+        read_file calls if the server doesn't provide it.
+
+        Args:
+            paths: File paths relative to workspace root
+
+        Returns:
+            List of read_file-style result dicts, in the same order as paths
+
+        Example:
+            results = await client.read_files(["README.md", "backend/main.py"])
+        """
+        if not paths:
+            return []
+
+        if self._batch_read_supported:
+            try:
+                client = await self._get_client()
+                response = await client.post(
+                    "/tools/read_files",
+                    content=json_codec.dumps({"paths": paths}),
+                    headers=json_codec.JSON_HEADERS
+                )
+                if response.status_code == 404:
+                    logger.info("MCP server has no batch read endpoint, using concurrent reads")
+                    self._batch_read_supported = False
+                else:
+                    response.raise_for_status()
+                    files = json_codec.loads(response.content).get("files", [])
+                    logger.info(f"Read {len(files)} files in one batch")
+                    return files
+            except Exception as e:
+                logger.warning(f"Batch read failed, using concurrent reads: {e}")
+
+        return await self._gather(self.read_file, paths)
+
+    async def files_exist(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Check existence of multiple files/directories concurrently
+
+        Returns:
+            List of file_exists-style result dicts, in the same order as paths
+        """
+        return await self._gather(self.file_exists, paths)
+
+    async def list_directories(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        List multiple directories concurrently
+
+        Returns:
+            List of list_directory-style result dicts, in the same order as paths
+        """
+        return await self._gather(self.list_directory, paths)
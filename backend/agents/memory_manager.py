@@ -5,19 +5,113 @@ Provides semantic retrieval, context summarization, and intelligent
 memory storage for agents without framework lock-in.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set
 from uuid import UUID
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, delete, desc, literal, select, text, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+import httpx
+import numpy as np
 
 from models.database import AgentMemory
+from core import json_codec
 from core.config import settings
+from core.http_client import get_shared_client
 
 logger = logging.getLogger(__name__)
 
 
+class EmbeddingCache:
+    """
+    In-process LRU cache of generated embeddings
+
+    Keyed by sha256(provider|model|text), so repeated stores and queries of
+    the same text skip the embedding round-trip to Ollama/OpenAI. Shared by
+    all SemanticMemoryManager instances. Entries are packed float32 arrays
+    (~3 KB per 768-dim vector instead of ~24 KB of Python floats).
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize or settings.EMBEDDING_CACHE_SIZE
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+        self.metrics = {
+            "hits": 0,
+            "misses": 0
+        }
+
+    @staticmethod
+    def make_key(provider: str, model: str, text: str) -> bytes:
+        """Build the cache key for an embedding request"""
+        return hashlib.sha256(f"{provider}|{model}|{text}".encode()).digest()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """Get a cached embedding, marking it most recently used"""
+        embedding = self._entries.get(key)
+        if embedding is None:
+            self.metrics["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.metrics["hits"] += 1
+        return embedding
+
+    def set(self, key: bytes, embedding: np.ndarray):
+        """Cache an embedding, evicting the least recently used entry"""
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        total_reads = self.metrics["hits"] + self.metrics["misses"]
+        hit_rate = (self.metrics["hits"] / total_reads * 100) if total_reads > 0 else 0
+
+        return {
+            **self.metrics,
+            "total_reads": total_reads,
+            "hit_rate_percent": round(hit_rate, 2),
+            "entries": len(self._entries),
+            "bytes": sum(embedding.nbytes for embedding in self._entries.values())
+        }
+
+    def clear(self):
+        """Drop all cached embeddings"""
+        self._entries.clear()
+
+
+# Global embedding cache instance
+embedding_cache = EmbeddingCache()
+
+
+# Strong references to fire-and-forget tasks until they finish
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _bump_access_counts(bind, memory_ids: List[UUID]):
+    """Increment access_count for memories in one UPDATE on a short-lived session"""
+    try:
+        with Session(bind=bind) as session:
+            session.execute(
+                update(AgentMemory)
+                .where(AgentMemory.id.in_(memory_ids))
+                .values(
+                    access_count=AgentMemory.access_count + 1,
+                    accessed_at=func.now()
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+    except Exception as e:
+        logger.warning(f"Error updating memory access counts: {e}")
+
+
 class SemanticMemoryManager:
     """
     Manages agent long-term memory with semantic search capabilities
@@ -30,6 +124,11 @@ class SemanticMemoryManager:
     - Access tracking for adaptive retrieval
     """
 
+    # Content below these thresholds is stored without an embedding and
+    # embedded lazily the next time the agent's memory is searched
+    EMBED_MIN_WORDS = 3
+    EMBED_MIN_ENTITY_IMPORTANCE = 5
+
     def __init__(
         self,
         agent_id: UUID,
@@ -68,7 +167,8 @@ class SemanticMemoryManager:
         memory_type: str = "conversation",
         importance: int = 5,
         channel_id: Optional[UUID] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        embed_on_store: Optional[bool] = None
     ) -> AgentMemory:
         """
         Store a new memory with semantic embedding
@@ -79,29 +179,52 @@ class SemanticMemoryManager:
             importance: Importance score 1-10 (affects retrieval priority)
             channel_id: Associated channel (for context-aware retrieval)
             metadata: Additional metadata (message_id, author, entities, etc.)
+            embed_on_store: Embed now (True), defer (False), or decide from
+                content length and importance (None, default)
 
         Returns:
             Created AgentMemory object
         """
         try:
-            # Generate embedding
-            embedding = await self._generate_embedding(content)
-
-            # Create memory record
-            memory = AgentMemory(
-                agent_id=self.agent_id,
-                channel_id=channel_id,
-                content=content,
-                embedding=embedding,
-                memory_type=memory_type,
-                importance=importance,
-                mem_metadata=metadata or {},
-                access_count=0
-            )
-
-            self.db.add(memory)
+            content_hash = self._content_hash(content, memory_type, channel_id)
+
+            # Already memorized: count the repeat and skip the embedding call
+            memory = self.db.scalars(
+                update(AgentMemory)
+                .where(
+                    AgentMemory.agent_id == self.agent_id,
+                    AgentMemory.content_hash == content_hash
+                )
+                .values(**self._repeat_values(importance))
+                .returning(AgentMemory),
+                execution_options={"populate_existing": True}
+            ).first()
+            if memory is not None:
+                self.db.commit()
+                logger.debug(f"Memory already stored for agent {self.agent_id}: {content[:50]}...")
+                return memory
+
+            # Generate embedding (deferred ones are filled in by embed_pending)
+            if embed_on_store is None:
+                embed_on_store = self._worth_embedding(content, memory_type, importance)
+            embedding = await self._generate_embedding(content) if embed_on_store else None
+
+            # Create memory record (a concurrent duplicate becomes a repeat)
+            memory = self.db.scalars(
+                self._upsert([{
+                    'agent_id': self.agent_id,
+                    'channel_id': channel_id,
+                    'content': content,
+                    'content_hash': content_hash,
+                    'embedding': embedding,
+                    'memory_type': memory_type,
+                    'importance': importance,
+                    'mem_metadata': metadata or {},
+                    'access_count': 0
+                }]).returning(AgentMemory),
+                execution_options={"populate_existing": True}
+            ).one()
             self.db.commit()
-            self.db.refresh(memory)
 
             logger.debug(
                 f"Stored {memory_type} memory for agent {self.agent_id}: "
@@ -139,8 +262,19 @@ class SemanticMemoryManager:
             List of memory dicts with content, metadata, and relevance scores
         """
         try:
-            # Generate query embedding
-            query_embedding = await self._generate_embedding(query)
+            # Embed memories that were stored without one
+            await self.embed_pending()
+
+            # Fetch the recent-id exclusion set while the query embedding is
+            # in flight (latency is max of the two instead of their sum)
+            recent_ids: List[UUID] = []
+            if exclude_recent_count:
+                query_embedding, recent_ids = await asyncio.gather(
+                    self._generate_embedding(query),
+                    asyncio.to_thread(self._recent_memory_ids, exclude_recent_count, channel_id)
+                )
+            else:
+                query_embedding = await self._generate_embedding(query)
 
             # Build query
             query_obj = self.db.query(
@@ -148,7 +282,8 @@ class SemanticMemoryManager:
                 AgentMemory.embedding.cosine_distance(query_embedding).label('distance')
             ).filter(
                 AgentMemory.agent_id == self.agent_id,
-                AgentMemory.importance >= min_importance
+                AgentMemory.importance >= min_importance,
+                AgentMemory.embedding.is_not(None)
             )
 
             # Apply filters
@@ -158,31 +293,20 @@ class SemanticMemoryManager:
             if channel_id:
                 query_obj = query_obj.filter(AgentMemory.channel_id == channel_id)
 
-            # Get results ordered by similarity
-            results = query_obj.order_by('distance').limit(limit + exclude_recent_count).all()
-
-            # Skip most recent N (they're already in recent context)
-            results = results[exclude_recent_count:]
-
-            # Format results
-            memories = []
-            for memory, distance in results[:limit]:
-                # Update access tracking
-                memory.access_count += 1
-                memory.accessed_at = datetime.now(timezone.utc)
-
-                memories.append({
-                    'id': str(memory.id),
-                    'content': memory.content,
-                    'memory_type': memory.memory_type,
-                    'importance': memory.importance,
-                    'relevance_score': 1.0 - distance,  # Convert distance to similarity
-                    'metadata': memory.mem_metadata,
-                    'created_at': memory.created_at.isoformat(),
-                    'access_count': memory.access_count
-                })
+            # Skip the most recent N in SQL (they're already in recent context),
+            # so ORDER BY distance LIMIT can be served by the HNSW index
+            if recent_ids:
+                query_obj = query_obj.filter(AgentMemory.id.not_in(recent_ids))
 
-            self.db.commit()
+            # Candidate list size for the HNSW scan (transaction-scoped, so it
+            # doesn't leak to other users of the pooled connection)
+            self.db.execute(text(f"SET LOCAL hnsw.ef_search = {int(settings.MEMORY_HNSW_EF_SEARCH)}"))
+
+            # Get results ordered by similarity (access_count reflects the bump below)
+            results = query_obj.order_by('distance').limit(limit).all()
+            memories = [self._format_relevant(memory, distance) for memory, distance in results]
+
+            self._mark_accessed([memory.id for memory, _ in results])
 
             logger.debug(
                 f"Retrieved {len(memories)} relevant memories for agent {self.agent_id} "
@@ -193,8 +317,244 @@ class SemanticMemoryManager:
 
         except Exception as e:
             logger.error(f"Error retrieving memories: {e}")
+            # Don't leave the caller's session in an aborted transaction
+            self.db.rollback()
             return []
 
+    def _recent_memory_ids(self, count: int, channel_id: Optional[UUID] = None) -> List[UUID]:
+        """
+        IDs of this agent's N most recent memories
+
+        Runs in a worker thread (see retrieve_relevant), so it uses its own
+        short-lived session on the same engine instead of self.db.
+        """
+        stmt = select(AgentMemory.id).where(AgentMemory.agent_id == self.agent_id)
+        if channel_id:
+            stmt = stmt.where(AgentMemory.channel_id == channel_id)
+
+        with Session(bind=self.db.get_bind()) as session:
+            return list(session.scalars(
+                stmt.order_by(desc(AgentMemory.created_at)).limit(count)
+            ))
+
+    async def retrieve_relevant_for_agents(
+        self,
+        agent_ids: List[UUID],
+        query: str,
+        limit: int = 5,
+        channel_id: Optional[UUID] = None,
+        min_importance: int = 3,
+        exclude_recent_count: int = 10
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Retrieve relevant memories and latest summaries for several agents at once
+
+        Embeds the query once and ranks every agent's memories in a single
+        windowed query, so K agents answering the same message cost one
+        embedding and two queries instead of K of each. The agents must share
+        this manager's embedding provider (their vectors live in the same space).
+
+        Args:
+            agent_ids: Agents to load memory for
+            query: Query text to find relevant memories
+            limit: Maximum number of memories per agent
+            channel_id: Filter by channel
+            min_importance: Minimum importance score
+            exclude_recent_count: Skip each agent's N most recent memories (already in context)
+
+        Returns:
+            Dict of agent_id -> {"relevant_memories": [...], "context_summary": str or None}
+        """
+        preloaded = {
+            agent_id: {"relevant_memories": [], "context_summary": None}
+            for agent_id in agent_ids
+        }
+        if not agent_ids:
+            return preloaded
+
+        await self.embed_pending(agent_ids)
+        query_embedding = await self._generate_embedding(query)
+
+        # Rank each agent's memories by distance, then keep the same slice
+        # retrieve_relevant() takes per agent
+        distance = AgentMemory.embedding.cosine_distance(query_embedding)
+        ranked = self.db.query(
+            AgentMemory.id.label('id'),
+            distance.label('distance'),
+            func.row_number().over(
+                partition_by=AgentMemory.agent_id,
+                order_by=distance
+            ).label('rank')
+        ).filter(
+            AgentMemory.agent_id.in_(agent_ids),
+            AgentMemory.importance >= min_importance,
+            AgentMemory.embedding.is_not(None)
+        )
+        if channel_id:
+            ranked = ranked.filter(AgentMemory.channel_id == channel_id)
+
+        # Skip each agent's most recent N (they're already in recent context)
+        if exclude_recent_count:
+            recency = select(
+                AgentMemory.id.label('id'),
+                func.row_number().over(
+                    partition_by=AgentMemory.agent_id,
+                    order_by=desc(AgentMemory.created_at)
+                ).label('recency')
+            ).where(AgentMemory.agent_id.in_(agent_ids))
+            if channel_id:
+                recency = recency.where(AgentMemory.channel_id == channel_id)
+            recency = recency.subquery()
+
+            ranked = ranked.filter(AgentMemory.id.not_in(
+                select(recency.c.id).where(recency.c.recency <= exclude_recent_count)
+            ))
+        ranked = ranked.subquery()
+
+        results = self.db.query(AgentMemory, ranked.c.distance).join(
+            ranked, AgentMemory.id == ranked.c.id
+        ).filter(
+            ranked.c.rank <= limit
+        ).order_by(AgentMemory.agent_id, ranked.c.rank).all()
+
+        for memory, memory_distance in results:
+            preloaded[memory.agent_id]["relevant_memories"].append(
+                self._format_relevant(memory, memory_distance)
+            )
+
+        # Latest summary per agent (DISTINCT ON keeps the first row per agent)
+        from datetime import timedelta
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
+
+        summary_query = self.db.query(AgentMemory.agent_id, AgentMemory.content).filter(
+            AgentMemory.agent_id.in_(agent_ids),
+            AgentMemory.memory_type == 'summary',
+            AgentMemory.created_at >= cutoff_time
+        )
+        if channel_id:
+            summary_query = summary_query.filter(AgentMemory.channel_id == channel_id)
+
+        for agent_id, content in summary_query.order_by(
+            AgentMemory.agent_id, desc(AgentMemory.created_at)
+        ).distinct(AgentMemory.agent_id):
+            preloaded[agent_id]["context_summary"] = content
+
+        self._mark_accessed([memory.id for memory, _ in results])
+
+        logger.debug(
+            f"Preloaded {len(results)} relevant memories for {len(agent_ids)} agents "
+            f"(query: {query[:30]}...)"
+        )
+
+        return preloaded
+
+    async def embed_pending(self, agent_ids: Optional[List[UUID]] = None, limit: int = 100) -> int:
+        """
+        Embed memories that were stored without an embedding
+
+        Called before semantic search, so deferred rows are embedded in one
+        batch only once something actually needs to search them.
+
+        Args:
+            agent_ids: Agents whose memories to embed (default: this agent)
+            limit: Maximum rows to embed per call
+
+        Returns:
+            Number of memories embedded
+        """
+        rows = self.db.execute(
+            select(AgentMemory.id, AgentMemory.content).where(
+                AgentMemory.agent_id.in_(agent_ids or [self.agent_id]),
+                AgentMemory.embedding.is_(None)
+            ).limit(limit)
+        ).all()
+        if not rows:
+            return 0
+
+        embeddings = await self._generate_embeddings_batch([content for _, content in rows])
+
+        # ORM bulk UPDATE by primary key: one executemany for the whole batch
+        self.db.execute(
+            update(AgentMemory),
+            [
+                {"id": memory_id, "embedding": embedding}
+                for (memory_id, _), embedding in zip(rows, embeddings)
+            ]
+        )
+        self.db.commit()
+
+        logger.debug(f"Embedded {len(rows)} deferred memories")
+        return len(rows)
+
+    @staticmethod
+    def _repeat_values(importance) -> Dict[str, Any]:
+        """
+        Applied when content the agent already has is stored again
+
+        The memory counts as re-created (fresh created_at, so windows like
+        get_summary's see it) and keeps the higher importance.
+        """
+        return {
+            "access_count": AgentMemory.access_count + 1,
+            "importance": func.greatest(AgentMemory.importance, importance),
+            "created_at": func.now(),
+            "accessed_at": func.now()
+        }
+
+    @staticmethod
+    def _content_hash(content: str, memory_type: str, channel_id: Optional[UUID]) -> bytes:
+        """
+        Dedupe key for a memory: the same text in another channel, or as
+        another memory type, is a separate memory (matches migration 007)
+        """
+        return hashlib.sha256(f"{channel_id or ''}\n{memory_type}\n{content}".encode()).digest()
+
+    def _upsert(self, rows: List[Dict[str, Any]]):
+        """INSERT memories, turning (agent_id, content_hash) conflicts into repeats"""
+        stmt = insert(AgentMemory).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[AgentMemory.agent_id, AgentMemory.content_hash],
+            set_=self._repeat_values(stmt.excluded.importance)
+        )
+
+    def _worth_embedding(self, content: str, memory_type: str, importance: int) -> bool:
+        """Whether content is long/important enough to embed at store time"""
+        if len(content.split()) < self.EMBED_MIN_WORDS:
+            return False
+        return not (memory_type == 'entity' and importance < self.EMBED_MIN_ENTITY_IMPORTANCE)
+
+    @staticmethod
+    def _format_relevant(memory: AgentMemory, distance: float) -> Dict[str, Any]:
+        """Format a retrieved memory (access_count reflects the pending bump)"""
+        return {
+            'id': str(memory.id),
+            'content': memory.content,
+            'memory_type': memory.memory_type,
+            'importance': memory.importance,
+            'relevance_score': 1.0 - distance,  # Convert distance to similarity
+            'metadata': memory.mem_metadata,
+            'created_at': memory.created_at.isoformat(),
+            'access_count': memory.access_count + 1
+        }
+
+    def _mark_accessed(self, memory_ids: List[UUID]):
+        """
+        Bump access tracking for retrieved memories in the background
+
+        The UPDATE runs in a worker thread with its own session, so retrieval
+        never waits on a write commit or holds row locks. self.db is the
+        caller's session (it may hold their pending writes), so it is left for
+        the caller to commit or roll back.
+        """
+        if not memory_ids:
+            return
+
+        task = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(_bump_access_counts, self.db.get_bind(), memory_ids)
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
     async def get_recent_memories(
         self,
         limit: int = 10,
@@ -210,27 +570,35 @@ class SemanticMemoryManager:
         Returns:
             List of recent memory dicts
         """
-        query_obj = self.db.query(AgentMemory).filter(
-            AgentMemory.agent_id == self.agent_id
-        )
+        # Select only the columns we return - plain rows skip ORM hydration
+        # and never load the embedding vector
+        stmt = select(
+            AgentMemory.id,
+            AgentMemory.content,
+            AgentMemory.memory_type,
+            AgentMemory.importance,
+            AgentMemory.mem_metadata,
+            AgentMemory.created_at
+        ).where(AgentMemory.agent_id == self.agent_id)
 
         if channel_id:
-            query_obj = query_obj.filter(AgentMemory.channel_id == channel_id)
+            stmt = stmt.where(AgentMemory.channel_id == channel_id)
 
-        memories = query_obj.order_by(
-            desc(AgentMemory.created_at)
-        ).limit(limit).all()
+        rows = self.db.execute(
+            stmt.order_by(desc(AgentMemory.created_at)).limit(limit)
+        ).all()
 
         return [
             {
-                'id': str(m.id),
-                'content': m.content,
-                'memory_type': m.memory_type,
-                'importance': m.importance,
-                'metadata': m.mem_metadata,
-                'created_at': m.created_at.isoformat()
+                'id': str(memory_id),
+                'content': content,
+                'memory_type': memory_type,
+                'importance': importance,
+                'metadata': metadata,
+                'created_at': created_at.isoformat()
             }
-            for m in reversed(memories)  # Return in chronological order
+            for memory_id, content, memory_type, importance, metadata, created_at
+            in reversed(rows)  # Return in chronological order
         ]
 
     async def get_summary(
@@ -281,20 +649,31 @@ class SemanticMemoryManager:
         Returns:
             Summary text
         """
-        # Get recent memories
-        recent_memories = await self.get_recent_memories(
-            limit=memory_count,
-            channel_id=channel_id
-        )
+        # Build the "[type] content" lines server-side: the most recent N
+        # memories, joined in chronological order, plus how many there were
+        recent = select(
+            AgentMemory.memory_type,
+            AgentMemory.content,
+            AgentMemory.created_at
+        ).where(AgentMemory.agent_id == self.agent_id)
 
-        if not recent_memories:
-            return "No recent activity to summarize."
+        if channel_id:
+            recent = recent.where(AgentMemory.channel_id == channel_id)
+
+        recent = recent.order_by(desc(AgentMemory.created_at)).limit(memory_count).subquery()
 
-        # Build prompt for summarization
-        memory_text = "\n".join([
-            f"[{m['memory_type']}] {m['content']}"
-            for m in recent_memories
-        ])
+        memory_text, summarized_count = self.db.execute(
+            select(
+                func.string_agg(
+                    func.concat('[', recent.c.memory_type, '] ', recent.c.content),
+                    aggregate_order_by(literal('\n'), recent.c.created_at)
+                ),
+                func.count()
+            ).select_from(recent)
+        ).one()
+
+        if not summarized_count:
+            return "No recent activity to summarize."
 
         prompt = f"""Summarize the following conversation and decisions into a concise overview:
 
@@ -322,10 +701,10 @@ Summary:"""
             memory_type='summary',
             importance=8,
             channel_id=channel_id,
-            metadata={'summarized_count': len(recent_memories)}
+            metadata={'summarized_count': summarized_count}
         )
 
-        logger.info(f"Created summary for agent {self.agent_id} ({len(recent_memories)} memories)")
+        logger.info(f"Created summary for agent {self.agent_id} ({summarized_count} memories)")
 
         return summary_text
 
@@ -371,21 +750,59 @@ List entities (one per line):"""
             if line.strip() and len(line.strip()) > 2
         ]
 
-        # Store each entity as memory
-        for entity in entities[:10]:  # Limit to 10 entities
-            await self.store(
-                content=entity,
-                memory_type='entity',
-                importance=6,
-                channel_id=channel_id,
-                metadata={'source_text': text[:100]}
-            )
+        # Store entities as memories: one embedding batch, one commit.
+        # Short entity names are deferred to embed_pending(), and entities
+        # the agent already knows are only counted again.
+        to_store = list(dict.fromkeys(entities))[:10]  # Limit to 10 distinct entities
+        if to_store:
+            try:
+                hashes = {
+                    entity: self._content_hash(entity, 'entity', channel_id)
+                    for entity in to_store
+                }
+                known = set(self.db.scalars(
+                    select(AgentMemory.content_hash).where(
+                        AgentMemory.agent_id == self.agent_id,
+                        AgentMemory.content_hash.in_(hashes.values())
+                    )
+                ))
+
+                to_embed = [
+                    entity for entity in to_store
+                    if hashes[entity] not in known and self._worth_embedding(entity, 'entity', 6)
+                ]
+                embedded = {}
+                if to_embed:
+                    embedded = dict(zip(to_embed, await self._generate_embeddings_batch(to_embed)))
+
+                # One multi-row INSERT ... RETURNING (no per-row flush/refresh)
+                stored_ids = self.db.scalars(
+                    self._upsert([
+                        {
+                            'agent_id': self.agent_id,
+                            'channel_id': channel_id,
+                            'content': entity,
+                            'content_hash': hashes[entity],
+                            'embedding': embedded.get(entity),
+                            'memory_type': 'entity',
+                            'importance': 6,
+                            'mem_metadata': {'source_text': text[:100]},
+                            'access_count': 0
+                        }
+                        for entity in to_store
+                    ]).returning(AgentMemory.id)
+                ).all()
+                self.db.commit()
+            except Exception as e:
+                logger.error(f"Error storing entities: {e}")
+                self.db.rollback()
+                raise
 
-        logger.debug(f"Extracted and stored {len(entities)} entities")
+            logger.debug(f"Extracted and stored {len(stored_ids)} entities")
 
         return entities
 
-    async def _generate_embedding(self, text: str) -> List[float]:
+    async def _generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding vector for text
 
@@ -393,8 +810,64 @@ List entities (one per line):"""
             text: Text to embed
 
         Returns:
-            Embedding vector (768 dimensions for nomic-embed-text, 1536 for OpenAI)
+            float32 embedding vector (768 dimensions for nomic-embed-text, 1536 for OpenAI)
         """
+        if settings.USE_EMBEDDINGS_CACHE:
+            key = self._embedding_cache_key(text)
+            embedding = embedding_cache.get(key)
+            if embedding is None:
+                embedding = await self._route_embedding(text)
+                embedding_cache.set(key, embedding)
+            return embedding
+
+        return await self._route_embedding(text)
+
+    async def _generate_embeddings_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Generate embeddings for many texts at once
+
+        Cached texts are served from the embedding cache; the rest go to the
+        provider in one batch (a single OpenAI request, concurrent Ollama requests).
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors, in the same order as texts
+        """
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        keys = None
+        missing = list(range(len(texts)))
+
+        if settings.USE_EMBEDDINGS_CACHE:
+            keys = [self._embedding_cache_key(text) for text in texts]
+            missing = []
+            for i, key in enumerate(keys):
+                embeddings[i] = embedding_cache.get(key)
+                if embeddings[i] is None:
+                    missing.append(i)
+
+        if missing:
+            # Embed each distinct text once
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            generated = dict(zip(unique, await self._route_embeddings_batch(unique)))
+            for i in missing:
+                embeddings[i] = generated[texts[i]]
+                if keys is not None:
+                    embedding_cache.set(keys[i], embeddings[i])
+
+        return embeddings
+
+    def _embedding_cache_key(self, text: str) -> bytes:
+        """Embedding cache key for text under the configured provider/model"""
+        model = (
+            settings.OLLAMA_EMBEDDING_MODEL if self.embedding_provider == "ollama"
+            else self.embedding_model
+        )
+        return embedding_cache.make_key(self.embedding_provider, model, text)
+
+    async def _route_embedding(self, text: str) -> np.ndarray:
+        """Generate an embedding with the configured provider"""
         # Route to appropriate embedding provider
         if self.embedding_provider == "ollama":
             return await self._generate_ollama_embedding(text)
@@ -411,7 +884,30 @@ List entities (one per line):"""
         else:
             raise ValueError(f"Unknown embedding provider: {self.embedding_provider}")
 
-    async def _generate_ollama_embedding(self, text: str) -> List[float]:
+    async def _route_embeddings_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """Generate a batch of embeddings with the configured provider"""
+        if self.embedding_provider == "ollama":
+            return await self._generate_ollama_embeddings(texts)
+        elif self.embedding_provider == "openai":
+            return await self._generate_openai_embeddings(texts)
+        elif self.embedding_provider == "anthropic":
+            # Anthropic doesn't have embeddings, fallback to Ollama or OpenAI
+            logger.warning("Anthropic doesn't provide embeddings, trying Ollama first")
+            try:
+                return await self._generate_ollama_embeddings(texts)
+            except Exception as e:
+                logger.warning(f"Ollama fallback failed: {e}, trying OpenAI")
+                return await self._generate_openai_embeddings(texts)
+        else:
+            raise ValueError(f"Unknown embedding provider: {self.embedding_provider}")
+
+    async def _generate_ollama_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """Generate Ollama embeddings concurrently (the API embeds one prompt per request)"""
+        return list(await asyncio.gather(
+            *(self._generate_ollama_embedding(text) for text in texts)
+        ))
+
+    async def _generate_ollama_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding using Ollama local models
 
@@ -419,35 +915,39 @@ List entities (one per line):"""
             text: Text to embed
 
         Returns:
-            Embedding vector (768 dimensions for nomic-embed-text)
+            float32 embedding vector (768 dimensions for nomic-embed-text)
         """
-        import httpx
-
         embedding_model = settings.OLLAMA_EMBEDDING_MODEL
 
+        # Same pooled keep-alive client LLMClient uses for OLLAMA_HOST
+        # (closed by the FastAPI lifespan via shutdown_clients)
+        client = get_shared_client(settings.OLLAMA_HOST, timeout=180.0, http2=settings.LLM_HTTP2)
+
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{settings.OLLAMA_HOST}/api/embeddings",
-                    json={
-                        "model": embedding_model,
-                        "prompt": text
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await client.post(
+                "/api/embeddings",
+                content=json_codec.dumps({
+                    "model": embedding_model,
+                    "prompt": text
+                }),
+                headers=json_codec.JSON_HEADERS,
+                timeout=30.0
+            )
+            response.raise_for_status()
+            # orjson parses the ~12 KB float array straight from the body bytes
+            data = json_codec.loads(response.content)
 
-                if "embedding" not in data:
-                    raise ValueError(f"Ollama response missing 'embedding' field: {data}")
+            if "embedding" not in data:
+                raise ValueError(f"Ollama response missing 'embedding' field: {data}")
 
-                embedding = data["embedding"]
+            embedding = np.asarray(data["embedding"], dtype=np.float32)
 
-                logger.debug(
-                    f"Generated Ollama embedding with {embedding_model} "
-                    f"({len(embedding)} dimensions)"
-                )
+            logger.debug(
+                f"Generated Ollama embedding with {embedding_model} "
+                f"({len(embedding)} dimensions)"
+            )
 
-                return embedding
+            return embedding
 
         except httpx.HTTPError as e:
             logger.error(f"Ollama HTTP error: {e}")
@@ -460,21 +960,29 @@ List entities (one per line):"""
             logger.error(f"Ollama embedding generation failed: {e}")
             raise
 
-    async def _generate_openai_embedding(self, text: str) -> List[float]:
+    async def _generate_openai_embedding(self, text: str) -> np.ndarray:
         """Generate embedding using OpenAI API"""
-        import openai
+        return (await self._generate_openai_embeddings([text]))[0]
+
+    async def _generate_openai_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """Generate embeddings for several texts in one OpenAI API request"""
+        from agents.llm_client import get_openai_client
 
         if not settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY required for embeddings")
 
-        client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
 
         response = await client.embeddings.create(
             model=self.embedding_model,
-            input=text
+            input=texts
         )
 
-        return response.data[0].embedding
+        # Results carry their input index; order by it to match texts
+        return [
+            np.asarray(item.embedding, dtype=np.float32)
+            for item in sorted(response.data, key=lambda item: item.index)
+        ]
 
     def get_memory_stats(self, channel_id: Optional[UUID] = None) -> Dict[str, Any]:
         """
@@ -486,27 +994,33 @@ List entities (one per line):"""
         Returns:
             Dict with memory statistics
         """
-        query_obj = self.db.query(AgentMemory).filter(
+        # One GROUP BY round-trip for totals, per-type counts and importance
+        query_obj = self.db.query(
+            AgentMemory.memory_type,
+            func.count(AgentMemory.id),
+            func.sum(AgentMemory.importance)
+        ).filter(
             AgentMemory.agent_id == self.agent_id
         )
 
         if channel_id:
             query_obj = query_obj.filter(AgentMemory.channel_id == channel_id)
 
-        total_count = query_obj.count()
+        rows = query_obj.group_by(AgentMemory.memory_type).all()
 
-        # Count by type
-        type_counts = {}
-        for memory_type in ['conversation', 'decision', 'entity', 'summary', 'tool_use']:
-            count = query_obj.filter(AgentMemory.memory_type == memory_type).count()
-            type_counts[memory_type] = count
+        type_counts = {
+            memory_type: 0
+            for memory_type in ['conversation', 'decision', 'entity', 'summary', 'tool_use']
+        }
+        total_count = 0
+        importance_sum = 0
+        for memory_type, count, type_importance in rows:
+            if memory_type in type_counts:
+                type_counts[memory_type] = count
+            total_count += count
+            importance_sum += type_importance or 0
 
-        # Average importance
-        avg_importance = self.db.query(
-            func.avg(AgentMemory.importance)
-        ).filter(
-            AgentMemory.agent_id == self.agent_id
-        ).scalar() or 0
+        avg_importance = importance_sum / total_count if total_count else 0
 
         return {
             'total_memories': total_count,
@@ -534,18 +1048,18 @@ List entities (one per line):"""
         from datetime import timedelta
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
 
-        query_obj = self.db.query(AgentMemory).filter(
+        stmt = delete(AgentMemory).where(
             AgentMemory.agent_id == self.agent_id,
             AgentMemory.created_at < cutoff_date
         )
 
         if keep_important:
-            query_obj = query_obj.filter(
+            stmt = stmt.where(
                 AgentMemory.importance < min_importance_to_keep
             )
 
-        count = query_obj.count()
-        query_obj.delete()
+        # Single pass: the DELETE's rowcount is the number removed
+        count = self.db.execute(stmt.execution_options(synchronize_session=False)).rowcount
         self.db.commit()
 
         logger.info(f"Cleaned up {count} old memories for agent {self.agent_id}")
@@ -2,11 +2,18 @@
 Agent message processing and orchestration
 """
 
-from typing import Dict, Any, List, Optional
-from uuid import UUID
+from collections import OrderedDict
+from typing import Dict, Any, FrozenSet, List, Optional, Set
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
+import re
+from sqlalchemy import and_, func, insert, literal_column, or_, select, update
 from sqlalchemy.orm import Session
 
+from core.cache import cache, CacheTTL
+from core.config import settings
 from core.database import SessionLocal
 from models.database import Agent, Message
 from agents.specialists import (
@@ -35,8 +42,48 @@ AGENT_CLASSES = {
     "orchestrator": OrchestratorAgent
 }
 
-# Cache for instantiated agents
-_agent_cache: Dict[UUID, Any] = {}
+# Maximum recursion depth for agent-to-agent mentions
+MAX_DEPTH = 3
+
+# Redis namespace for per-message agent task status
+AGENT_TASK_NAMESPACE = "agent_tasks"
+
+# Keywords that send an orchestrator request through the workflow system
+# (substring match, same as the specialist OrchestratorAgent)
+_WORKFLOW_KEYWORDS_RE = re.compile(
+    r"build|create|implement|develop|feature|application|system|project|"
+    r"integrate|design|refactor|deploy|setup|configure",
+    re.IGNORECASE
+)
+
+# Redis namespace for agent identity records, keyed by "@name"
+AGENT_RECORD_NAMESPACE = "agent_records"
+
+# Cached Agent columns - is_busy/current_task_id change per task and are
+# always read and written in the database (see mark_agent_busy)
+_AGENT_RECORD_FIELDS = ("id", "name", "agent_type", "persona", "config", "is_active")
+
+# Strong references to in-flight background work (asyncio keeps only weak ones)
+_background_tasks: Set[asyncio.Task] = set()
+
+# Bounded queue of pending agent work, drained by a fixed worker pool
+_agent_queue: Optional[asyncio.Queue] = None
+_agent_workers: List[asyncio.Task] = []
+
+# Agents claimed by a task in this process. Checked before the database
+# compare-and-set in mark_agent_busy, so a second mention of a working agent
+# is turned away without a round trip; the check and the claim have no await
+# between them, so no asyncio.Lock is needed.
+_claimed_agents: Set[UUID] = set()
+
+# Bounded LRU cache for instantiated agents. Accessed only from sync code
+# on the event loop (no await points), so it needs no lock.
+_agent_cache: "OrderedDict[UUID, Any]" = OrderedDict()
+_agent_cache_metrics = {
+    "hits": 0,
+    "misses": 0,
+    "evictions": 0
+}
 
 
 def clear_agent_cache():
@@ -45,26 +92,65 @@ def clear_agent_cache():
     This is called on application startup to ensure fresh agent instances
     with valid HTTP client connections after hot-reload.
     """
-    global _agent_cache
     logger.info(f"Clearing agent cache ({len(_agent_cache)} agents)")
     _agent_cache.clear()
 
 
+def get_agent_cache_metrics() -> Dict[str, Any]:
+    """Get agent instance cache hit/miss statistics"""
+    total_reads = _agent_cache_metrics["hits"] + _agent_cache_metrics["misses"]
+    hit_rate = (_agent_cache_metrics["hits"] / total_reads * 100) if total_reads > 0 else 0
+
+    return {
+        **_agent_cache_metrics,
+        "total_reads": total_reads,
+        "hit_rate_percent": round(hit_rate, 2),
+        "entries": len(_agent_cache),
+        "maxsize": settings.AGENT_CACHE_SIZE
+    }
+
+
+def prewarm_agent_cache(db: Session) -> int:
+    """
+    Instantiate active agents ahead of the first message
+    Called from the FastAPI lifespan on startup, after clear_agent_cache().
+
+    Returns:
+        Number of agents instantiated
+    """
+    agents = (
+        db.query(Agent)
+        .filter(Agent.is_active == True)
+        .order_by(Agent.created_at)
+        .limit(settings.AGENT_CACHE_SIZE)
+        .all()
+    )
+
+    warmed = 0
+    for agent_record in agents:
+        try:
+            get_agent_instance(agent_record, db)
+            warmed += 1
+        except Exception as e:
+            logger.warning(f"Could not prewarm agent {agent_record.name}: {e}")
+
+    logger.info(f"Prewarmed agent cache with {warmed} agents")
+    return warmed
+
+
 async def cleanup_agent_cache():
     """
     Cleanup all cached agents, closing their HTTP clients properly.
     This is called on application shutdown.
     """
-    global _agent_cache
     logger.info(f"Cleaning up agent cache ({len(_agent_cache)} agents)")
 
     for agent_id, agent in _agent_cache.items():
         try:
-            # Close httpx client if it exists (for Ollama)
-            if hasattr(agent, 'llm') and hasattr(agent.llm, 'client'):
-                if hasattr(agent.llm.client, 'aclose'):
-                    await agent.llm.client.aclose()
-                    logger.debug(f"Closed HTTP client for agent {agent.name}")
+            # Close the LLM client's connection pool (all providers are async)
+            if hasattr(agent, 'llm'):
+                await agent.llm.aclose()
+                logger.debug(f"Closed HTTP client for agent {agent.name}")
         except Exception as e:
             logger.warning(f"Error closing client for agent {agent_id}: {e}")
 
@@ -86,45 +172,120 @@ def can_accept_task(agent_id: UUID, db: Session) -> bool:
     Returns:
         True if agent is available, False if busy
     """
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
-    if not agent:
-        return False
+    is_busy = db.query(Agent.is_busy).filter(Agent.id == agent_id).scalar()
+    return is_busy is False
 
-    return not agent.is_busy
 
+def _stale_claim():
+    """
+    Condition matching busy claims older than TASK_TIMEOUT
 
-def mark_agent_busy(agent_id: UUID, task_id: UUID, db: Session):
+    Claiming an agent bumps its updated_at, so that is the claim's age. A
+    claim nobody has released within TASK_TIMEOUT belongs to a worker that
+    died mid-task, whichever process or host it was.
     """
-    Mark an agent as busy with a specific task
+    return and_(
+        Agent.is_busy == True,
+        Agent.updated_at < func.now() - timedelta(seconds=settings.TASK_TIMEOUT)
+    )
+
+
+def mark_agent_busy(agent_id: UUID, task_id: UUID, db: Session) -> bool:
+    """
+    Mark an agent as busy with a specific task, if it is not busy already
+
+    A single conditional UPDATE (compare-and-set), so of two concurrent
+    mentions of the same agent exactly one claims it. A stale claim (see
+    _stale_claim) is taken over.
 
     Args:
         agent_id: Agent UUID
         task_id: Task/Message UUID the agent is working on
         db: Database session
-    """
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
-    if agent:
-        agent.is_busy = True
-        agent.current_task_id = task_id
-        db.commit()
-        logger.info(f"Agent {agent.name} marked as busy with task {task_id}")
-
 
-def mark_agent_available(agent_id: UUID, db: Session):
+    Returns:
+        True if the agent was claimed, False if it was busy (or not found)
+    """
+    name = db.execute(
+        update(Agent)
+        .where(Agent.id == agent_id, or_(Agent.is_busy == False, _stale_claim()))
+        .values(is_busy=True, current_task_id=task_id)
+        .returning(Agent.name)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+    if name:
+        logger.info(f"Agent {name} marked as busy with task {task_id}")
+    return name is not None
+
+
+def mark_agent_available(agent_id: UUID, db: Session, commit: bool = True):
     """
     Mark an agent as available (finished current task)
 
     Args:
         agent_id: Agent UUID
         db: Database session
+        commit: Commit now, or leave it to the caller's next commit (e.g. the
+            one storing the agent's reply - one transaction instead of two)
     """
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
-    if agent:
-        task_id = agent.current_task_id
-        agent.is_busy = False
-        agent.current_task_id = None
+    name = db.execute(
+        update(Agent)
+        .where(Agent.id == agent_id)
+        .values(is_busy=False, current_task_id=None)
+        .returning(Agent.name)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if commit:
         db.commit()
-        logger.info(f"Agent {agent.name} marked as available (completed task {task_id})")
+    if name:
+        logger.info(f"Agent {name} marked as available")
+
+
+def get_agent_records(names: List[str], db: Session) -> Dict[str, Agent]:
+    """
+    Look up agents by name, Redis first
+
+    Misses are loaded in one query and cached for CacheTTL.AGENT_CONFIG.
+    Either way the records are transient Agent objects carrying only the
+    identity columns: they outlive db, but don't read is_busy from them.
+
+    Args:
+        names: Agent names with @ prefix
+        db: Database session for cache misses
+
+    Returns:
+        Dict of "@name" -> Agent for the agents that exist (active or not)
+    """
+    records = {
+        name: Agent(**{**data, "id": UUID(data["id"])})
+        for name, data in cache.mget(AGENT_RECORD_NAMESPACE, names).items()
+    }
+
+    missing = [name for name in names if name not in records]
+    if missing:
+        loaded = db.query(Agent).filter(Agent.name.in_(missing)).all()
+        cache.mset(
+            AGENT_RECORD_NAMESPACE,
+            {
+                agent.name: {field: getattr(agent, field) for field in _AGENT_RECORD_FIELDS}
+                for agent in loaded
+            },
+            CacheTTL.AGENT_CONFIG
+        )
+        records.update((agent.name, _agent_snapshot(agent)) for agent in loaded)
+
+    return records
+
+
+def _agent_snapshot(agent: Agent) -> Agent:
+    """Transient copy of an agent's identity columns, usable without a session"""
+    return Agent(**{field: getattr(agent, field) for field in _AGENT_RECORD_FIELDS})
+
+
+def invalidate_agent_record(name: str):
+    """Drop an agent's cached record (call after editing the Agent row)"""
+    cache.delete(AGENT_RECORD_NAMESPACE, name)
 
 
 def get_agent_instance(agent_record: Agent, db: Session) -> Any:
@@ -139,12 +300,16 @@ def get_agent_instance(agent_record: Agent, db: Session) -> Any:
         db: Database session for memory operations
     """
     if agent_record.id in _agent_cache:
+        _agent_cache_metrics["hits"] += 1
+        _agent_cache.move_to_end(agent_record.id)
         cached_agent = _agent_cache[agent_record.id]
         # Update DB session if agent has memory support
         if hasattr(cached_agent, 'set_db_session'):
             cached_agent.set_db_session(db)
         return cached_agent
 
+    _agent_cache_metrics["misses"] += 1
+
     # Try to get specialist agent class
     agent_class = AGENT_CLASSES.get(agent_record.agent_type)
 
@@ -167,9 +332,192 @@ def get_agent_instance(agent_record: Agent, db: Session) -> Any:
     )
 
     _agent_cache[agent_record.id] = agent
+    while len(_agent_cache) > settings.AGENT_CACHE_SIZE:
+        _, evicted = _agent_cache.popitem(last=False)
+        _agent_cache_metrics["evictions"] += 1
+        _release_agent(evicted)
     return agent
 
 
+def _release_agent(agent: Any):
+    """Release an evicted agent's LLM client without blocking the caller"""
+    if not hasattr(agent, 'llm'):
+        return
+
+    try:
+        asyncio.get_running_loop().create_task(agent.llm.aclose())
+        logger.debug(f"Evicted agent {agent.name} from cache")
+    except RuntimeError:
+        # No running loop (sync caller) - nothing to close asynchronously
+        pass
+
+
+# ============================================
+# Background Dispatch
+# ============================================
+
+def _spawn(coro) -> asyncio.Task:
+    """Run a coroutine in the background, keeping it referenced until done"""
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def _set_task_status(message_id: UUID, status: str, **fields):
+    """Record agent task status as reznet:agent_tasks:{message_id}"""
+    cache.set(
+        AGENT_TASK_NAMESPACE,
+        str(message_id),
+        {"message_id": str(message_id), "status": status, **fields},
+        CacheTTL.AGENT_TASK_STATUS
+    )
+
+
+def get_agent_task_status(message_id: UUID) -> Optional[Dict[str, Any]]:
+    """
+    Get the status of the agent work triggered by a message
+
+    Returns:
+        Dict with status (queued, rejected, running, completed, failed,
+        cancelled), or None if unknown/expired
+    """
+    return cache.get(AGENT_TASK_NAMESPACE, str(message_id))
+
+
+def start_agent_workers() -> asyncio.Queue:
+    """
+    Start the agent worker pool (idempotent)
+
+    MAX_CONCURRENT_AGENTS workers drain a queue of at most AGENT_QUEUE_SIZE
+    messages. Called from the FastAPI lifespan on startup, and lazily by
+    dispatch_agent_message().
+
+    Returns:
+        The work queue
+    """
+    global _agent_queue
+    if _agent_queue is None or all(worker.done() for worker in _agent_workers):
+        _agent_queue = asyncio.Queue(maxsize=settings.AGENT_QUEUE_SIZE)
+        _agent_workers[:] = [
+            _spawn(_agent_worker(_agent_queue))
+            for _ in range(settings.MAX_CONCURRENT_AGENTS)
+        ]
+        logger.info(
+            f"Started {len(_agent_workers)} agent workers "
+            f"(queue size {settings.AGENT_QUEUE_SIZE})"
+        )
+    return _agent_queue
+
+
+async def _agent_worker(queue: asyncio.Queue):
+    """Process queued agent messages one at a time, until cancelled"""
+    while True:
+        job = await queue.get()
+        try:
+            await _run_agent_task(**job)
+        finally:
+            queue.task_done()
+
+
+def dispatch_agent_message(
+    message_id: UUID,
+    content: str,
+    channel_id: UUID,
+    mentioned_agents: List[str],
+    manager: Any,
+    depth: int = 0,
+    call_chain: Optional[FrozenSet[str]] = None
+) -> bool:
+    """
+    Queue agent processing for a message and return immediately
+
+    The work is picked up by the agent worker pool: its status is recorded
+    in Redis (see get_agent_task_status) and it is cancelled cleanly on
+    shutdown by shutdown_agent_tasks(). When the queue is full the message
+    is rejected rather than piling up unbounded work.
+
+    Args:
+        Same as process_agent_message
+
+    Returns:
+        True if queued, False if rejected (queue full)
+    """
+    queue = start_agent_workers()
+    try:
+        queue.put_nowait({
+            "message_id": message_id,
+            "content": content,
+            "channel_id": channel_id,
+            "mentioned_agents": mentioned_agents,
+            "manager": manager,
+            "depth": depth,
+            "call_chain": call_chain
+        })
+    except asyncio.QueueFull:
+        logger.warning(f"Agent queue full ({queue.maxsize}), rejecting message {message_id}")
+        _set_task_status(message_id, "rejected", agents=mentioned_agents, depth=depth)
+        return False
+
+    _set_task_status(message_id, "queued", agents=mentioned_agents, depth=depth)
+    return True
+
+
+async def _run_agent_task(message_id: UUID, mentioned_agents: List[str], **kwargs):
+    """Run process_agent_message, recording its status transitions"""
+    _set_task_status(message_id, "running", agents=mentioned_agents)
+    try:
+        await process_agent_message(message_id=message_id, mentioned_agents=mentioned_agents, **kwargs)
+    except asyncio.CancelledError:
+        _set_task_status(message_id, "cancelled", agents=mentioned_agents)
+        raise
+    except Exception as e:
+        logger.error(f"Agent task for message {message_id} failed: {e}")
+        _set_task_status(message_id, "failed", agents=mentioned_agents, error=str(e))
+    else:
+        _set_task_status(message_id, "completed", agents=mentioned_agents)
+
+
+async def shutdown_agent_tasks():
+    """
+    Cancel in-flight agent work and wait for it to unwind
+    Called from the FastAPI lifespan on shutdown.
+    """
+    tasks = list(_background_tasks)
+    if tasks:
+        logger.info(f"Cancelling {len(tasks)} background agent tasks")
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Messages still waiting for a worker will never run
+    while _agent_queue is not None and not _agent_queue.empty():
+        job = _agent_queue.get_nowait()
+        _set_task_status(job["message_id"], "cancelled", agents=job["mentioned_agents"])
+
+
+def reset_busy_agents(db: Session) -> int:
+    """
+    Clear busy flags left behind by dead workers
+
+    Only stale claims are cleared: with several workers, a recent claim may
+    belong to another live process, so a starting (or restarting) worker
+    must not wipe it. Recent claims from a process that died are taken over
+    by mark_agent_busy once they go stale.
+
+    Returns:
+        Number of agents reset
+    """
+    count = db.query(Agent).filter(_stale_claim()).update(
+        {Agent.is_busy: False, Agent.current_task_id: None},
+        synchronize_session=False
+    )
+    db.commit()
+    if count:
+        logger.info(f"Reset {count} agents left busy by a dead worker")
+    return count
+
+
 async def process_agent_message(
     message_id: UUID,
     content: str,
@@ -177,7 +525,7 @@ async def process_agent_message(
     mentioned_agents: List[str],
     manager: Any,  # WebSocket manager
     depth: int = 0,  # Recursion depth (max 3)
-    call_chain: Optional[List[str]] = None  # Track agent call chain to prevent loops
+    call_chain: Optional[FrozenSet[str]] = None  # Agents already called in this chain (loop prevention)
 ):
     """
     Process a message that mentions one or more agents
@@ -189,477 +537,617 @@ async def process_agent_message(
         mentioned_agents: List of agent names (without @)
         manager: WebSocket manager for broadcasting
         depth: Current recursion depth (0 = user message, 1 = agent response, etc.)
-        call_chain: List of agent names already called in this chain (loop prevention)
+        call_chain: Names of agents already called in this chain (loop prevention)
     """
-    from models.database import Channel
-
     # Initialize call chain if not provided
     if call_chain is None:
-        call_chain = []
+        call_chain = frozenset()
 
     # Check recursion depth limit
-    MAX_DEPTH = 3
     if depth >= MAX_DEPTH:
         logger.warning(f"Max recursion depth ({MAX_DEPTH}) reached, stopping agent chain")
         return
 
     db = SessionLocal()
     try:
-        # Get channel to check context_cleared_at
-        channel = db.query(Channel).filter(Channel.id == channel_id).first()
-
-        # Build message query
-        message_query = db.query(Message).filter(Message.channel_id == channel_id)
-
-        # If context was cleared, only get messages after that timestamp
-        if channel and channel.context_cleared_at:
-            message_query = message_query.filter(Message.created_at > channel.context_cleared_at)
-
-        # Get conversation context
-        recent_messages = (
-            message_query
-            .order_by(Message.created_at.desc())
-            .limit(10)
-            .all()
+        # Sync queries - run them off the event loop
+        agent_names = list(dict.fromkeys(mentioned_agents))
+        context, agent_records = await asyncio.to_thread(
+            _load_message_context, db, channel_id, content, agent_names, depth, call_chain
         )
 
-        context = {
-            "conversation_history": [
-                {
-                    "author": msg.author_name,
-                    "content": msg.content,
-                    "type": msg.author_type
-                }
-                for msg in reversed(recent_messages)
+        # Load long-term memory for all of them before the fan-out, so agents
+        # sharing an embedding provider cost one embedding and one query.
+        # Skip agents that won't read it: already in the chain, handing the
+        # message to the workflow system, or busy here (they'll be turned away)
+        needs_workflow = _needs_workflow(content)
+        memory_contexts = await _preload_memory_context(
+            [
+                record for name, record in agent_records.items()
+                if name[1:] not in call_chain
+                and not (record.agent_type == "orchestrator" and needs_workflow)
+                and record.id not in _claimed_agents
             ],
-            "depth": depth,
-            "call_chain": call_chain
+            content,
+            context,
+            db
+        )
+    finally:
+        db.close()
+
+    # Mentioned agents are independent, so run them concurrently (latency is
+    # the slowest agent rather than the sum). Duplicate mentions run once.
+    results = await asyncio.gather(
+        *(
+            _process_single_agent(
+                agent_name=agent_name,
+                agent_record=agent_records.get(f"@{agent_name}"),
+                message_id=message_id,
+                content=content,
+                channel_id=channel_id,
+                context={**context, **memory_contexts.get(f"@{agent_name}", {})},
+                manager=manager,
+                depth=depth,
+                call_chain=call_chain
+            )
+            for agent_name in agent_names
+        ),
+        return_exceptions=True
+    )
+
+    for agent_name, result in zip(agent_names, results):
+        if isinstance(result, Exception):
+            logger.error(f"Unhandled error processing @{agent_name}: {result}")
+
+
+def _needs_workflow(content: str) -> bool:
+    """Whether an orchestrator mention is a complex task for the workflow system"""
+    # More than five words - maxsplit stops splitting once that is known
+    return _WORKFLOW_KEYWORDS_RE.search(content) is not None and len(content.split(maxsplit=5)) > 5
+
+
+def _load_message_context(
+    db: Session,
+    channel_id: UUID,
+    content: str,
+    agent_names: List[str],
+    depth: int,
+    call_chain: FrozenSet[str]
+) -> tuple[Dict[str, Any], Dict[str, Agent]]:
+    """
+    Load conversation history and the mentioned agents' records
+
+    History is skipped when every agent that will run hands the message to
+    the workflow system, which never reads it.
+
+    Returns:
+        (context, agent records keyed by "@name")
+    """
+    from models.database import Channel
+
+    # Resolve every mentioned agent at once - Redis, then one query for misses.
+    # The records are transient snapshots, so they survive the memory
+    # preload committing (or rolling back) this session and its close
+    agent_records = {
+        name: agent
+        for name, agent in get_agent_records([f"@{name}" for name in agent_names], db).items()
+        if agent.is_active
+    }
+
+    context = {"depth": depth, "call_chain": call_chain}
+
+    # Nobody would read the history (no agent runs, or only orchestrators
+    # taking the workflow path) - skip the query
+    runnable = [
+        record for name, record in agent_records.items()
+        if name[1:] not in call_chain
+    ]
+    if not runnable or (
+        all(record.agent_type == "orchestrator" for record in runnable) and
+        _needs_workflow(content)
+    ):
+        return context, agent_records
+
+    # Only messages after the channel's context_cleared_at (-infinity if
+    # never cleared). The channel lookup is a scalar subquery, so history is
+    # one round trip and the bound stays an index condition.
+    cleared_at = func.coalesce(
+        select(Channel.context_cleared_at)
+        .where(Channel.id == channel_id)
+        .scalar_subquery(),
+        literal_column("'-infinity'::timestamptz")
+    )
+
+    # Only the columns the history needs, as plain rows (no ORM objects,
+    # identity map or Query wrapper). Served by a backward scan of
+    # idx_messages_channel_created, so there is no sort.
+    recent_messages = db.execute(
+        select(Message.author_name, Message.content, Message.author_type)
+        .where(
+            Message.channel_id == channel_id,
+            Message.created_at > cleared_at
+        )
+        .order_by(Message.created_at.desc())
+        .limit(10)
+    ).all()
+
+    context["conversation_history"] = [
+        {
+            "author": author_name,
+            "content": message_content,
+            "type": author_type
         }
+        for author_name, message_content, author_type in reversed(recent_messages)
+    ]
+
+    return context, agent_records
 
-        # Process each mentioned agent
-        for agent_name in mentioned_agents:
-            # Check if agent is already in call chain (prevent loops)
-            if agent_name in call_chain:
-                logger.warning(f"Agent @{agent_name} already in call chain {call_chain}, skipping to prevent loop")
-                continue
-            # Get agent from database
-            agent_record = db.query(Agent).filter(
-                Agent.name == f"@{agent_name}"
-            ).first()
-
-            if not agent_record or not agent_record.is_active:
-                logger.warning(f"Agent not found or inactive: @{agent_name}")
-                continue
-
-            # Check if agent is busy
-            if agent_record.is_busy:
-                logger.warning(f"Agent @{agent_name} is busy with task {agent_record.current_task_id}, queueing not implemented yet")
-                # TODO: Implement task queueing
-                # For now, send a status message
-                busy_message = Message(
-                    channel_id=channel_id,
-                    author_id=None,
-                    author_type='system',
-                    author_name='System',
-                    content=f"⏳ @{agent_name} is currently busy. Please try again in a moment.",
-                    msg_metadata={'busy': True, 'agent': agent_name}
-                )
-                db.add(busy_message)
-                db.commit()
-                db.refresh(busy_message)
-                await manager.broadcast('message_new', {
-                    'id': str(busy_message.id),
-                    'channel_id': str(busy_message.channel_id),
-                    'author_type': busy_message.author_type,
-                    'author_name': busy_message.author_name,
-                    'content': busy_message.content,
-                    'created_at': busy_message.created_at.isoformat(),
-                    'metadata': busy_message.msg_metadata
-                })
-                continue
 
-            # Mark agent as busy
-            mark_agent_busy(agent_record.id, message_id, db)
+def _new_message(**fields) -> Message:
+    """
+    Build a Message with id and created_at assigned client-side, so it can
+    be broadcast before it is persisted
+    """
+    return Message(id=uuid4(), created_at=datetime.now(timezone.utc), **fields)
 
+
+async def _broadcast_then_store(
+    manager: Any,
+    db: Session,
+    message: Message,
+    *also: tuple
+) -> Dict[str, Any]:
+    """
+    Broadcast a new message, then persist it
+
+    Users see the message without waiting on the INSERT commit. Nothing is
+    read back after the commit (no refresh), since every field is already set.
+
+    Args:
+        also: Extra (event, data) pairs sent in the same frame as message_new
+
+    Returns:
+        The broadcast payload (UUIDs and datetimes are left for the
+        WebSocket JSON encoder)
+    """
+    payload = {
+        'id': message.id,
+        'channel_id': message.channel_id,
+        'author_type': message.author_type,
+        'author_name': message.author_name,
+        'content': message.content,
+        'created_at': message.created_at,
+        'metadata': message.msg_metadata
+    }
+    if also:
+        # Batched with global events (e.g. agent_status) - goes to everyone
+        await manager.broadcast_batch([('message_new', payload), *also])
+    else:
+        await manager.broadcast('message_new', payload, channel_id=message.channel_id)
+
+    db.add(message)
+    db.commit()
+    return payload
+
+
+async def _preload_memory_context(
+    agent_records: List[Agent],
+    content: str,
+    context: Dict[str, Any],
+    db: Session
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Retrieve relevant memories for several agents with one lookup per provider
+
+    Args:
+        agent_records: Agents about to process content
+        content: Message the memories should be relevant to
+        context: Shared context (conversation_history is excluded from results)
+        db: Database session
+
+    Returns:
+        Dict of agent name -> context entries to merge into that agent's context.
+        Agents without memory (or whose lookup failed) are absent and fall back
+        to loading memory themselves.
+    """
+    by_provider: Dict[str, List[Any]] = {}
+    for record in agent_records:
+        agent = get_agent_instance(record, db)
+        if getattr(agent, 'enable_memory', False):
+            by_provider.setdefault(agent.llm.provider, []).append(agent)
+
+    memory_contexts = {}
+    for agents in by_provider.values():
+        memory_manager = agents[0]._get_memory_manager()
+        if not memory_manager:
+            continue
+
+        try:
+            preloaded = await memory_manager.retrieve_relevant_for_agents(
+                agent_ids=[agent.id for agent in agents],
+                query=content,
+                limit=5,
+                channel_id=context.get("channel_id"),
+                min_importance=4,
+                exclude_recent_count=len(context.get("conversation_history", []))
+            )
+        except Exception as e:
+            logger.error(f"Error preloading agent memory: {e}")
+            db.rollback()
+            continue
+
+        for agent in agents:
+            memory_contexts[agent.name] = {**preloaded[agent.id], "memory_preloaded": True}
+
+    return memory_contexts
+
+
+async def _process_single_agent(
+    agent_name: str,
+    agent_record: Optional[Agent],
+    message_id: UUID,
+    content: str,
+    channel_id: UUID,
+    context: Dict[str, Any],
+    manager: Any,
+    depth: int,
+    call_chain: FrozenSet[str]
+):
+    """
+    Run one mentioned agent and broadcast its response
+
+    Uses its own DB session so concurrent agents never share one.
+
+    Args:
+        agent_record: Active agent record for agent_name, or None if not found
+        Others: same as process_agent_message, for a single agent name
+    """
+    # Check if agent is already in call chain (prevent loops)
+    if agent_name in call_chain:
+        logger.warning(f"Agent @{agent_name} already in call chain {call_chain}, skipping to prevent loop")
+        return
+
+    if not agent_record:
+        logger.warning(f"Agent not found or inactive: @{agent_name}")
+        return
+
+    db = SessionLocal()
+    try:
+
+        # Claim the agent - in this process first, then atomically in the
+        # database (other workers); either fails if it is already busy
+        if agent_record.id in _claimed_agents or not mark_agent_busy(agent_record.id, message_id, db):
+            logger.warning(f"Agent @{agent_name} is busy, queueing not implemented yet")
+            # TODO: Implement task queueing
+            # For now, send a status message
+            busy_message = _new_message(
+                channel_id=channel_id,
+                author_id=None,
+                author_type='system',
+                author_name='System',
+                content=f"⏳ @{agent_name} is currently busy. Please try again in a moment.",
+                msg_metadata={'busy': True, 'agent': agent_name}
+            )
+            await _broadcast_then_store(manager, db, busy_message)
+            return
+        _claimed_agents.add(agent_record.id)
+
+        try:
             # Send "thinking" status
             await manager.broadcast('agent_status', {
                 'agent_name': f"@{agent_name}",
                 'status': 'thinking'
             })
 
-            try:
-                # Special handling for orchestrator: Use workflow system for complex tasks
-                if agent_record.agent_type == "orchestrator":
-                    # Check if this is a complex task that needs workflow orchestration
-                    message_lower = content.lower()
-                    orchestration_keywords = [
-                        'build', 'create', 'implement', 'develop', 'feature',
-                        'application', 'system', 'project', 'integrate', 'design',
-                        'refactor', 'deploy', 'setup', 'configure'
-                    ]
-
-                    needs_workflow = (
-                        any(keyword in message_lower for keyword in orchestration_keywords) and
-                        len(message_lower.split()) > 5
-                    )
-
-                    if not needs_workflow:
-                        # Simple question/greeting - respond normally without workflow
-                        logger.info(f"Orchestrator responding directly (no workflow needed): {content[:100]}")
-                        # Process as regular agent
-                        agent = get_agent_instance(agent_record, db)
-
-                        if agent is None:
-                            logger.error(f"Could not load agent {agent_record.name}")
-                            response = "I encountered an error loading my configuration. Please try again."
-                        else:
-                            # Send typing indicator
-                            await manager.broadcast('agent_typing', {
-                                'agent': agent_record.name,
-                                'channel_id': str(channel_id)
-                            })
-
-                            # Process message
-                            response = await agent.process_message(content, context)
-
-                        # Create response message
-                        response_msg = Message(
-                            channel_id=channel_id,
-                            author_id=agent_record.id,
-                            author_type='agent',
-                            author_name=agent_record.name,
-                            content=response,
-                            metadata={'in_reply_to': str(message_id)}
-                        )
-                        db.add(response_msg)
-                        db.commit()
-                        db.refresh(response_msg)
-
-                        await manager.broadcast('message_new', {
-                            'id': str(response_msg.id),
-                            'channel_id': str(response_msg.channel_id),
-                            'author_type': response_msg.author_type,
-                            'author_name': response_msg.author_name,
-                            'content': response_msg.content,
-                            'created_at': response_msg.created_at.isoformat(),
-                            'metadata': response_msg.msg_metadata
-                        })
-
-                        mark_agent_available(agent_record.id, db)
-
-                        # Clear typing indicator
-                        await manager.broadcast('agent_status', {
-                            'agent_name': f"@{agent_name}",
-                            'status': 'online'
-                        })
-
-                        return
-
-                    # Complex task - create workflow
-                    # Import here to avoid circular dependency
-                    from agents.workflow_orchestrator import WorkflowOrchestrator
-
-                    logger.info(f"Orchestrator creating workflow for complex task: {content[:100]}")
-
-                    # Create workflow orchestrator
-                    workflow_orchestrator = WorkflowOrchestrator(manager)
-
-                    # Create workflow from user request
-                    workflow = await workflow_orchestrator.create_workflow_from_request(
-                        user_request=content,
-                        orchestrator_id=agent_record.id,
-                        channel_id=channel_id,
-                        db=db
-                    )
-
-                    # Post workflow created message to channel
-                    workflow_msg = Message(
+            # Special handling for orchestrator: Use workflow system for complex tasks
+            if agent_record.agent_type == "orchestrator":
+                # Check if this is a complex task that needs workflow orchestration
+                if not _needs_workflow(content):
+                    # Simple question/greeting - respond normally without workflow
+                    logger.info(f"Orchestrator responding directly (no workflow needed): {content[:100]}")
+                    # Process as regular agent
+                    agent = get_agent_instance(agent_record, db)
+
+                    if agent is None:
+                        logger.error(f"Could not load agent {agent_record.name}")
+                        response = "I encountered an error loading my configuration. Please try again."
+                    else:
+                        # Send typing indicator
+                        await manager.broadcast('agent_typing', {
+                            'agent': agent_record.name,
+                            'channel_id': channel_id
+                        }, channel_id=channel_id)
+
+                        # Process message
+                        response = await agent.process_message(content, context)
+
+                    # Create response message
+                    response_msg = _new_message(
                         channel_id=channel_id,
                         author_id=agent_record.id,
                         author_type='agent',
                         author_name=agent_record.name,
-                        content=f"I've created a workflow to handle your request. Executing {len(workflow.workflow_tasks)} tasks...",
-                        metadata={
-                            'workflow_id': str(workflow.id),
-                            'in_reply_to': str(message_id)
-                        }
+                        content=response,
+                        msg_metadata={'in_reply_to': str(message_id)}
+                    )
+                    # Release the agent in the same transaction as the reply;
+                    # reply and cleared typing indicator go out in one frame
+                    mark_agent_available(agent_record.id, db, commit=False)
+                    await _broadcast_then_store(
+                        manager, db, response_msg,
+                        ('agent_status', {'agent_name': f"@{agent_name}", 'status': 'online'})
                     )
-                    db.add(workflow_msg)
-                    db.commit()
-                    db.refresh(workflow_msg)
-
-                    await manager.broadcast('message_new', {
-                        'id': str(workflow_msg.id),
-                        'channel_id': str(workflow_msg.channel_id),
-                        'author_type': workflow_msg.author_type,
-                        'author_name': workflow_msg.author_name,
-                        'content': workflow_msg.content,
-                        'created_at': workflow_msg.created_at.isoformat(),
-                        'metadata': workflow_msg.msg_metadata
-                    })
-
-                    # Execute workflow (async in background with new DB session)
-                    import asyncio
-
-                    async def run_workflow():
-                        """Execute workflow with its own database session"""
-                        workflow_db = SessionLocal()
-                        try:
-                            await workflow_orchestrator.execute_workflow(workflow.id, workflow_db)
-                        finally:
-                            workflow_db.close()
-
-                    asyncio.create_task(run_workflow())
-
-                    # Mark orchestrator as available (workflow runs in background)
-                    mark_agent_available(agent_record.id, db)
-
-                    await manager.broadcast('agent_status', {
-                        'agent_name': f"@{agent_name}",
-                        'status': 'online'
-                    })
-
-                    # Skip regular message processing for orchestrator
-                    continue
-
-                # Regular agent processing for non-orchestrator agents
-                # Get agent instance
-                agent = get_agent_instance(agent_record, db)
-                if not agent:
-                    mark_agent_available(agent_record.id, db)
-                    continue
-
-                # Create a placeholder message for streaming updates
-                agent_message = Message(
+                    return
+
+                # Complex task - create workflow
+                # Import here to avoid circular dependency
+                from agents.workflow_orchestrator import get_workflow_orchestrator
+
+                logger.info(f"Orchestrator creating workflow for complex task: {content[:100]}")
+
+                # Shared workflow orchestrator for this manager
+                workflow_orchestrator = get_workflow_orchestrator(manager)
+
+                # Create workflow from user request
+                workflow = await workflow_orchestrator.create_workflow_from_request(
+                    user_request=content,
+                    orchestrator_id=agent_record.id,
+                    channel_id=channel_id,
+                    db=db
+                )
+
+                # Post workflow created message to channel
+                workflow_msg = _new_message(
                     channel_id=channel_id,
                     author_id=agent_record.id,
                     author_type='agent',
                     author_name=agent_record.name,
-                    content="",  # Will be accumulated during streaming
-                    metadata={
-                        'model': agent.llm.model,
-                        'provider': agent.llm.provider,
-                        'in_reply_to': str(message_id),
-                        'streaming': True
+                    content=f"I've created a workflow to handle your request. Executing {len(workflow.workflow_tasks)} tasks...",
+                    msg_metadata={
+                        'workflow_id': str(workflow.id),
+                        'in_reply_to': str(message_id)
                     }
                 )
-                db.add(agent_message)
-                db.commit()
-                db.refresh(agent_message)
-
-                # Broadcast initial message (empty) to create placeholder in UI
-                await manager.broadcast('message_new', {
-                    'id': str(agent_message.id),
-                    'channel_id': str(agent_message.channel_id),
-                    'author_type': agent_message.author_type,
-                    'author_name': agent_message.author_name,
-                    'content': agent_message.content,
-                    'created_at': agent_message.created_at.isoformat(),
-                    'metadata': agent_message.msg_metadata
-                })
+                # Orchestrator is free once the workflow exists (it runs in the
+                # background) - release it with the same commit as the message
+                mark_agent_available(agent_record.id, db, commit=False)
+                await _broadcast_then_store(
+                    manager, db, workflow_msg,
+                    ('agent_status', {'agent_name': f"@{agent_name}", 'status': 'online'})
+                )
 
-                # Stream response chunks
-                accumulated_response = ""
-
-                async for text_chunk, is_final, metadata in agent.process_message_streaming(content, context):
-                    accumulated_response += text_chunk
-
-                    # Broadcast streaming chunk via WebSocket
-                    await manager.broadcast('message_stream', {
-                        'message_id': str(agent_message.id),
-                        'chunk': text_chunk,
-                        'is_final': is_final,
-                        'metadata': metadata
-                    })
-
-                # Update database with final complete response
-                agent_message.content = accumulated_response
-                agent_message.msg_metadata['streaming'] = False
-                db.commit()
-
-                # Broadcast final complete message
-                await manager.broadcast('message_update', {
-                    'id': str(agent_message.id),
-                    'channel_id': str(agent_message.channel_id),
-                    'author_type': agent_message.author_type,
-                    'author_name': agent_message.author_name,
-                    'content': agent_message.content,
-                    'created_at': agent_message.created_at.isoformat(),
-                    'metadata': agent_message.msg_metadata
-                })
+                # Execute workflow (async in background with new DB session)
+                _spawn(workflow_orchestrator.run_workflow(workflow.id))
+
+                # Skip regular message processing for orchestrator
+                return
 
-                # Mark agent as available
+            # Regular agent processing for non-orchestrator agents
+            # Get agent instance
+            agent = get_agent_instance(agent_record, db)
+            if not agent:
                 mark_agent_available(agent_record.id, db)
+                return
 
-                # Update agent status back to online
-                await manager.broadcast('agent_status', {
-                    'agent_name': f"@{agent_name}",
-                    'status': 'online'
-                })
+            # Create a placeholder message for streaming updates; the UI gets
+            # it before the insert commits
+            agent_message = _new_message(
+                channel_id=channel_id,
+                author_id=agent_record.id,
+                author_type='agent',
+                author_name=agent_record.name,
+                content="",  # Will be accumulated during streaming
+                msg_metadata={
+                    'model': agent.llm.model,
+                    'provider': agent.llm.provider,
+                    'in_reply_to': str(message_id),
+                    'streaming': True
+                }
+            )
+            agent_message_id = agent_message.id
+            message_payload = await _broadcast_then_store(manager, db, agent_message)
+
+            # Stream response chunks
+            accumulated_response = ""
+
+            async for text_chunk, is_final, metadata in agent.process_message_streaming(content, context):
+                accumulated_response += text_chunk
+
+                # Broadcast streaming chunk to the channel's viewers
+                await manager.broadcast('message_stream', {
+                    'message_id': message_payload['id'],
+                    'chunk': text_chunk,
+                    'is_final': is_final,
+                    'metadata': metadata
+                }, channel_id=channel_id)
+
+            # Broadcast final complete message, then persist it (reassign the
+            # JSONB dict - in-place mutation isn't change-tracked)
+            message_payload['content'] = accumulated_response
+            message_payload['metadata'] = {**message_payload['metadata'], 'streaming': False}
+            await manager.broadcast_batch([
+                ('message_update', message_payload),
+                ('agent_status', {'agent_name': f"@{agent_name}", 'status': 'online'})
+            ])
+
+            # Final content and releasing the agent commit together
+            agent_message.content = accumulated_response
+            agent_message.msg_metadata = message_payload['metadata']
+            mark_agent_available(agent_record.id, db, commit=False)
+            db.commit()
 
-                # Check agent response for @mentions (recursive triggering)
-                # Extract mentions from response
-                response_mentions = extract_mentions(response, strip_md=True)
-
-                if response_mentions and depth < MAX_DEPTH - 1:
-                    # Found mentions in agent response - trigger those agents recursively
-                    sub_agent_names = [mention[1] for mention in response_mentions]  # Extract names without @
-
-                    # Filter out mentions already in call chain
-                    new_agents = [name for name in sub_agent_names if name not in call_chain and name != agent_name]
-
-                    if new_agents:
-                        logger.info(f"Agent @{agent_name} mentioned {new_agents}, triggering recursively (depth {depth + 1})")
-
-                        # Update call chain for sub-agents
-                        updated_chain = call_chain + [agent_name]
-
-                        # Recursively process sub-agent mentions
-                        import asyncio
-                        asyncio.create_task(
-                            process_agent_message(
-                                message_id=agent_message.id,  # Use agent's message as trigger
-                                content=response,
-                                channel_id=channel_id,
-                                mentioned_agents=new_agents,
-                                manager=manager,
-                                depth=depth + 1,
-                                call_chain=updated_chain
-                            )
-                        )
-
-            except Exception as e:
-                # Mark agent as available (release from busy state)
-                mark_agent_available(agent_record.id, db)
+            # Check agent response for @mentions (recursive triggering)
+            # Extract mentions from response
+            response_mentions = extract_mentions(accumulated_response, strip_md=True)
 
-                # Log structured error with full context
-                structured_log_error(e, {
-                    "agent_name": agent_name,
-                    "agent_id": str(agent_record.id),
-                    "channel_id": str(channel_id),
-                    "message_id": str(message_id),
-                    "content_length": len(content),
-                    "depth": depth
-                })
+            if response_mentions and depth < MAX_DEPTH - 1:
+                # Found mentions in agent response - trigger those agents recursively
+                sub_agent_names = [mention[1] for mention in response_mentions]  # Extract names without @
 
-                # Format user-friendly error message (never show stack traces)
-                user_message = format_user_friendly_error(e, agent_record.name)
+                # Filter out mentions already in call chain
+                new_agents = [name for name in sub_agent_names if name not in call_chain and name != agent_name]
 
-                # Prepare error metadata with retryability flag
-                error_metadata = {
-                    'error': True,
-                    'in_reply_to': str(message_id),
-                    'retryable': isinstance(e, LLMError) and e.retryable
-                }
+                if new_agents:
+                    logger.info(f"Agent @{agent_name} mentioned {new_agents}, triggering recursively (depth {depth + 1})")
 
-                # Add detailed error info for retryable errors
-                if isinstance(e, LLMError):
-                    error_metadata.update({
-                        'error_type': e.error_type.value,
-                        'provider': e.provider,
-                        'model': e.model
-                    })
+                    # Update call chain for sub-agents
+                    updated_chain = call_chain | {agent_name}
 
-                # Send error message to chat
-                error_message = Message(
-                    channel_id=channel_id,
-                    author_id=agent_record.id,
-                    author_type='agent',
-                    author_name=agent_record.name,
-                    content=user_message,
-                    msg_metadata=error_metadata
-                )
-                db.add(error_message)
-                db.commit()
-                db.refresh(error_message)
-
-                await manager.broadcast('message_new', {
-                    'id': str(error_message.id),
-                    'channel_id': str(error_message.channel_id),
-                    'author_type': error_message.author_type,
-                    'author_name': error_message.author_name,
-                    'content': error_message.content,
-                    'created_at': error_message.created_at.isoformat(),
-                    'metadata': error_message.msg_metadata
-                })
+                    # Recursively process sub-agent mentions
+                    dispatch_agent_message(
+                        message_id=agent_message_id,  # Use agent's message as trigger
+                        content=accumulated_response,
+                        channel_id=channel_id,
+                        mentioned_agents=new_agents,
+                        manager=manager,
+                        depth=depth + 1,
+                        call_chain=updated_chain
+                    )
+
+        except Exception as e:
+            # Drop whatever the failed step left pending, then release the
+            # agent right away so a failing error-message insert can't leave
+            # it stuck busy
+            db.rollback()
+            mark_agent_available(agent_record.id, db)
+
+            # Log structured error with full context
+            structured_log_error(e, {
+                "agent_name": agent_name,
+                "agent_id": str(agent_record.id),
+                "channel_id": str(channel_id),
+                "message_id": str(message_id),
+                "content_length": len(content),
+                "depth": depth
+            })
+
+            # Format user-friendly error message (never show stack traces)
+            user_message = format_user_friendly_error(e, agent_record.name)
+
+            # Prepare error metadata with retryability flag
+            error_metadata = {
+                'error': True,
+                'in_reply_to': str(message_id),
+                'retryable': isinstance(e, LLMError) and e.retryable
+            }
 
-                # Update status to online
-                await manager.broadcast('agent_status', {
-                    'agent_name': f"@{agent_name}",
-                    'status': 'online'
+            # Add detailed error info for retryable errors
+            if isinstance(e, LLMError):
+                error_metadata.update({
+                    'error_type': e.error_type.value,
+                    'provider': e.provider,
+                    'model': e.model
                 })
 
+            # Send error message to chat
+            error_message = _new_message(
+                channel_id=channel_id,
+                author_id=agent_record.id,
+                author_type='agent',
+                author_name=agent_record.name,
+                content=user_message,
+                msg_metadata=error_metadata
+            )
+            await _broadcast_then_store(
+                manager, db, error_message,
+                ('agent_status', {'agent_name': f"@{agent_name}", 'status': 'online'})
+            )
+
+        finally:
+            _claimed_agents.discard(agent_record.id)
+
     finally:
         db.close()
 
 
-async def invoke_agent(
-    agent_name: str,
+async def _invoke(
+    agent_record: Agent,
     message: str,
-    context: Dict[str, Any] = None,
-    channel_id: Optional[UUID] = None
+    context: Optional[Dict[str, Any]],
+    channel_id: Optional[UUID],
+    db: Session
 ) -> Dict[str, Any]:
     """
-    Directly invoke an agent by name
-    """
-    db = SessionLocal()
-    try:
-        # Add @ prefix if not present
-        if not agent_name.startswith('@'):
-            agent_name = f'@{agent_name}'
-
-        # Get agent from database
-        agent_record = db.query(Agent).filter(Agent.name == agent_name).first()
-        if not agent_record:
-            raise ValueError(f"Agent not found: {agent_name}")
+    Shared body of invoke_agent / invoke_agent_by_id
 
-        if not agent_record.is_active:
-            raise ValueError(f"Agent is not active: {agent_name}")
+    Args:
+        agent_record: Resolved agent (ORM row or cached transient record)
+        message: Message to process
+        context: Optional agent context
+        channel_id: Save the response to this channel if provided
+        db: Database session owned by the caller
+    """
+    if not agent_record.is_active:
+        raise ValueError(f"Agent is not active: {agent_record.name}")
 
-        # Get agent instance
-        agent = get_agent_instance(agent_record, db)
-        if not agent:
-            raise ValueError(f"Could not instantiate agent: {agent_name}")
+    # Get agent instance
+    agent = get_agent_instance(agent_record, db)
+    if not agent:
+        raise ValueError(f"Could not instantiate agent: {agent_record.name}")
 
-        # Process message
-        response = await agent.process_message(message, context or {})
+    # Process message
+    response = await agent.process_message(message, context or {})
 
-        # Save to database if channel provided
-        if channel_id:
-            agent_message = Message(
+    # Save to database if channel provided (RETURNING brings back the
+    # server defaults - no refresh SELECT)
+    if channel_id:
+        agent_message = db.execute(
+            insert(Message).values(
                 channel_id=channel_id,
                 author_id=agent_record.id,
                 author_type='agent',
                 author_name=agent_record.name,
                 content=response,
-                metadata={
+                msg_metadata={
                     'model': agent.llm.model,
                     'provider': agent.llm.provider
                 }
-            )
-            db.add(agent_message)
-            db.commit()
-            db.refresh(agent_message)
-
-            return {
-                'id': str(agent_message.id),
-                'channel_id': str(agent_message.channel_id),
-                'author_type': agent_message.author_type,
-                'author_name': agent_message.author_name,
-                'content': agent_message.content,
-                'created_at': agent_message.created_at.isoformat(),
-                'metadata': agent_message.msg_metadata
-            }
+            ).returning(Message)
+        ).scalar_one()
+        db.commit()
 
         return {
-            'agent_name': agent_name,
-            'response': response,
-            'metadata': {
-                'model': agent.llm.model,
-                'provider': agent.llm.provider
-            }
+            'id': str(agent_message.id),
+            'channel_id': str(agent_message.channel_id),
+            'author_type': agent_message.author_type,
+            'author_name': agent_message.author_name,
+            'content': agent_message.content,
+            'created_at': agent_message.created_at.isoformat(),
+            'metadata': agent_message.msg_metadata
         }
 
+    return {
+        'agent_name': agent_record.name,
+        'response': response,
+        'metadata': {
+            'model': agent.llm.model,
+            'provider': agent.llm.provider
+        }
+    }
+
+
+async def invoke_agent(
+    agent_name: str,
+    message: str,
+    context: Dict[str, Any] = None,
+    channel_id: Optional[UUID] = None
+) -> Dict[str, Any]:
+    """
+    Directly invoke an agent by name
+    """
+    db = SessionLocal()
+    try:
+        # Add @ prefix if not present
+        if not agent_name.startswith('@'):
+            agent_name = f'@{agent_name}'
+
+        # Get agent (Redis-cached identity record)
+        agent_record = get_agent_records([agent_name], db).get(agent_name)
+        if not agent_record:
+            raise ValueError(f"Agent not found: {agent_name}")
+
+        return await _invoke(agent_record, message, context, channel_id, db)
+
     finally:
         db.close()
 
@@ -675,12 +1163,11 @@ async def invoke_agent_by_id(
     """
     db = SessionLocal()
     try:
-        # Get agent from database
-        agent_record = db.query(Agent).filter(Agent.id == agent_id).first()
+        agent_record = db.get(Agent, agent_id)
         if not agent_record:
             raise ValueError(f"Agent not found with ID: {agent_id}")
 
-        return await invoke_agent(agent_record.name, message, context, channel_id)
+        return await _invoke(agent_record, message, context, channel_id, db)
 
     finally:
         db.close()
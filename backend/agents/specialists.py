@@ -2,23 +2,74 @@
 Specialist Agent Implementations
 """
 
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, Sequence
 from agents.base_with_memory import BaseAgentWithMemory
 
+# Keywords that indicate complex tasks requiring orchestration (substring
+# match, so "created" or "systems" count too)
+_ORCHESTRATION_RE = re.compile(
+    r"build|create|implement|develop|feature|application|system|project|integrate",
+    re.IGNORECASE
+)
+
+# Wrapper the orchestrator puts around complex requests (static parts only,
+# joined around the message)
+_BREAKDOWN_PROMPT_PREFIX = "Analyze this request and create a task breakdown:\n\n"
+_BREAKDOWN_PROMPT_SUFFIX = """
+
+Provide:
+1. Brief analysis of what's needed
+2. Task breakdown with assignments to specific agents (@backend, @frontend, @qa, @devops)
+3. Any architecture decisions or considerations
+4. Suggested order of implementation
+
+Format your response to be clear and actionable."""
+
+# Task-plan format and rules. Only sent when the orchestrator is asked to
+# plan (with the breakdown wrapper), not in every system prompt - the
+# workflow planner parses plans in this format.
+_PLANNING_GUIDELINES = """
+
+When creating task plans, use this EXACT format:
+
+Task 1: @agent_name - Clear, specific description
+Task 2: @agent_name - Clear, specific description (depends on Task 1)
+Task 3: @agent_name - Clear, specific description
+Task 4: @agent_name - Clear, specific description (depends on Task 2, Task 3)
+
+Rules for task planning:
+1. Always number tasks sequentially (Task 1, Task 2, etc.)
+2. Always include @agent_name (@backend, @frontend, @qa, or @devops)
+3. Keep descriptions specific and actionable (what needs to be done, not how)
+4. Only add dependencies if the task truly requires output from previous tasks
+5. Group independent tasks together (they'll run in parallel)
+6. Put dependent tasks after their dependencies
+7. Consider the logical flow: design → implement → test → deploy
+
+Example of a good plan:
+Task 1: @backend - Create User database model with email, password_hash, and created_at fields in backend/models/user.py
+Task 2: @backend - Implement POST /api/auth/register endpoint with password hashing in backend/api/auth.py (depends on Task 1)
+Task 3: @backend - Implement POST /api/auth/login endpoint with JWT token generation in backend/api/auth.py (depends on Task 1)
+Task 4: @frontend - Create LoginForm component with email/password inputs and error handling in frontend/components/LoginForm.tsx
+Task 5: @frontend - Create RegistrationForm component with validation in frontend/components/RegistrationForm.tsx
+Task 6: @qa - Write unit tests for authentication endpoints in tests/test_auth.py (depends on Task 2, Task 3)
+Task 7: @qa - Write E2E tests for login and registration flows in tests/e2e/test_auth_flow.py (depends on Task 4, Task 5)
+
+CRITICAL: Always specify the file path in task descriptions! This tells agents exactly what files to create.
+"""
+
 
 class BackendAgent(BaseAgentWithMemory):
     """Backend development specialist"""
 
-    def get_tools(self) -> List[Dict[str, Any]]:
-        return [
-            {"name": "filesystem", "description": "Read/write code files"},
-            {"name": "database", "description": "Database operations"},
-            {"name": "api_testing", "description": "Test API endpoints"}
-        ]
+    TOOLS = (
+        {"name": "filesystem", "description": "Read/write code files"},
+        {"name": "database", "description": "Database operations"},
+        {"name": "api_testing", "description": "Test API endpoints"}
+    )
 
-    def get_system_prompt(self) -> str:
-        base_prompt = super().get_system_prompt()
-        return base_prompt + """
+    SYSTEM_PROMPT_SUFFIX = """
 
 Additional Backend-Specific Guidelines:
 - Write production-ready, well-tested code
@@ -44,19 +95,19 @@ When asked to create an API endpoint, use:
 </tool_call>
 """
 
+    def get_tools(self) -> Sequence[Dict[str, Any]]:
+        return self.TOOLS
+
 
 class FrontendAgent(BaseAgentWithMemory):
     """Frontend development specialist"""
 
-    def get_tools(self) -> List[Dict[str, Any]]:
-        return [
-            {"name": "filesystem", "description": "Read/write code files"},
-            {"name": "component_preview", "description": "Preview React components"}
-        ]
+    TOOLS = (
+        {"name": "filesystem", "description": "Read/write code files"},
+        {"name": "component_preview", "description": "Preview React components"}
+    )
 
-    def get_system_prompt(self) -> str:
-        base_prompt = super().get_system_prompt()
-        return base_prompt + """
+    SYSTEM_PROMPT_SUFFIX = """
 
 Additional Frontend-Specific Guidelines:
 - Build responsive, accessible interfaces
@@ -83,20 +134,20 @@ When asked to create a component, use:
 </tool_call>
 """
 
+    def get_tools(self) -> Sequence[Dict[str, Any]]:
+        return self.TOOLS
+
 
 class QAAgent(BaseAgentWithMemory):
     """QA and testing specialist"""
 
-    def get_tools(self) -> List[Dict[str, Any]]:
-        return [
-            {"name": "filesystem", "description": "Read/write test files"},
-            {"name": "test_runner", "description": "Run tests"},
-            {"name": "coverage", "description": "Check code coverage"}
-        ]
+    TOOLS = (
+        {"name": "filesystem", "description": "Read/write test files"},
+        {"name": "test_runner", "description": "Run tests"},
+        {"name": "coverage", "description": "Check code coverage"}
+    )
 
-    def get_system_prompt(self) -> str:
-        base_prompt = super().get_system_prompt()
-        return base_prompt + """
+    SYSTEM_PROMPT_SUFFIX = """
 
 Additional QA-Specific Guidelines:
 - Write comprehensive test cases (unit, integration, e2e)
@@ -123,20 +174,20 @@ When asked to write tests, use:
 </tool_call>
 """
 
+    def get_tools(self) -> Sequence[Dict[str, Any]]:
+        return self.TOOLS
+
 
 class DevOpsAgent(BaseAgentWithMemory):
     """DevOps and infrastructure specialist"""
 
-    def get_tools(self) -> List[Dict[str, Any]]:
-        return [
-            {"name": "filesystem", "description": "Read/write config files"},
-            {"name": "docker", "description": "Docker operations"},
-            {"name": "deployment", "description": "Deploy applications"}
-        ]
+    TOOLS = (
+        {"name": "filesystem", "description": "Read/write config files"},
+        {"name": "docker", "description": "Docker operations"},
+        {"name": "deployment", "description": "Deploy applications"}
+    )
 
-    def get_system_prompt(self) -> str:
-        base_prompt = super().get_system_prompt()
-        return base_prompt + """
+    SYSTEM_PROMPT_SUFFIX = """
 
 Additional DevOps-Specific Guidelines:
 - Design scalable, reliable infrastructure
@@ -162,20 +213,20 @@ When asked to create deployment config, use:
 </tool_call>
 """
 
+    def get_tools(self) -> Sequence[Dict[str, Any]]:
+        return self.TOOLS
+
 
 class OrchestratorAgent(BaseAgentWithMemory):
     """Orchestrator that coordinates other agents"""
 
-    def get_tools(self) -> List[Dict[str, Any]]:
-        return [
-            {"name": "task_delegation", "description": "Delegate tasks to specialist agents"},
-            {"name": "coordination", "description": "Coordinate between agents"},
-            {"name": "planning", "description": "Create project plans"}
-        ]
+    TOOLS = (
+        {"name": "task_delegation", "description": "Delegate tasks to specialist agents"},
+        {"name": "coordination", "description": "Coordinate between agents"},
+        {"name": "planning", "description": "Create project plans"}
+    )
 
-    def get_system_prompt(self) -> str:
-        base_prompt = super().get_system_prompt()
-        return base_prompt + """
+    SYSTEM_PROMPT_SUFFIX = """
 
 Additional Orchestrator-Specific Guidelines:
 - Break down complex tasks into smaller, manageable pieces
@@ -189,35 +240,11 @@ Additional Orchestrator-Specific Guidelines:
 - Provide high-level architecture guidance
 - Resolve conflicts and blockers
 - Summarize completed work
-
-When creating task plans, use this EXACT format:
-
-Task 1: @agent_name - Clear, specific description
-Task 2: @agent_name - Clear, specific description (depends on Task 1)
-Task 3: @agent_name - Clear, specific description
-Task 4: @agent_name - Clear, specific description (depends on Task 2, Task 3)
-
-Rules for task planning:
-1. Always number tasks sequentially (Task 1, Task 2, etc.)
-2. Always include @agent_name (@backend, @frontend, @qa, or @devops)
-3. Keep descriptions specific and actionable (what needs to be done, not how)
-4. Only add dependencies if the task truly requires output from previous tasks
-5. Group independent tasks together (they'll run in parallel)
-6. Put dependent tasks after their dependencies
-7. Consider the logical flow: design → implement → test → deploy
-
-Example of a good plan:
-Task 1: @backend - Create User database model with email, password_hash, and created_at fields in backend/models/user.py
-Task 2: @backend - Implement POST /api/auth/register endpoint with password hashing in backend/api/auth.py (depends on Task 1)
-Task 3: @backend - Implement POST /api/auth/login endpoint with JWT token generation in backend/api/auth.py (depends on Task 1)
-Task 4: @frontend - Create LoginForm component with email/password inputs and error handling in frontend/components/LoginForm.tsx
-Task 5: @frontend - Create RegistrationForm component with validation in frontend/components/RegistrationForm.tsx
-Task 6: @qa - Write unit tests for authentication endpoints in tests/test_auth.py (depends on Task 2, Task 3)
-Task 7: @qa - Write E2E tests for login and registration flows in tests/e2e/test_auth_flow.py (depends on Task 4, Task 5)
-
-CRITICAL: Always specify the file path in task descriptions! This tells agents exactly what files to create.
 """
 
+    def get_tools(self) -> Sequence[Dict[str, Any]]:
+        return self.TOOLS
+
     async def process_message(
         self,
         message: str,
@@ -226,32 +253,14 @@ CRITICAL: Always specify the file path in task descriptions! This tells agents e
         """
         Orchestrator processes messages and delegates to other agents
         """
-        # Check if this is a complex task that needs delegation
-        message_lower = message.lower()
-
-        # Keywords that indicate complex tasks requiring orchestration
-        orchestration_keywords = [
-            'build', 'create', 'implement', 'develop', 'feature',
-            'application', 'system', 'project', 'integrate'
-        ]
-
-        needs_orchestration = any(keyword in message_lower for keyword in orchestration_keywords)
-
-        if needs_orchestration and len(message_lower.split()) > 5:
-            # This is a complex task - provide orchestration guidance
-            prompt = f"""Analyze this request and create a task breakdown:
-
-{message}
-
-Provide:
-1. Brief analysis of what's needed
-2. Task breakdown with assignments to specific agents (@backend, @frontend, @qa, @devops)
-3. Any architecture decisions or considerations
-4. Suggested order of implementation
-
-Format your response to be clear and actionable."""
-
-            return await super().process_message(prompt, context)
-        else:
-            # Simple query or coordination
-            return await super().process_message(message, context)
+        # Complex tasks (more than five words, with an orchestration keyword)
+        # get wrapped in task-breakdown guidance and the planning rules. The
+        # word count goes first: it is bounded by maxsplit, while a keyword
+        # miss scans the whole message.
+        if len(message.split(maxsplit=5)) > 5 and _ORCHESTRATION_RE.search(message):
+            message = (
+                _BREAKDOWN_PROMPT_PREFIX + message +
+                _BREAKDOWN_PROMPT_SUFFIX + _PLANNING_GUIDELINES
+            )
+
+        return await super().process_message(message, context)
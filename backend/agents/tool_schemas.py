@@ -8,14 +8,16 @@ from typing import Dict, Any, List
 
 
 # ============================================
-# Anthropic Claude Tool Schemas
+# Filesystem Tools (provider-neutral)
 # ============================================
 
-ANTHROPIC_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
+# Single source of truth - the provider formats below only differ in how
+# they wrap name, description and JSON schema (the schema dicts are shared)
+_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
     {
         "name": "read_file",
         "description": "Read the contents of a file from the workspace. Use this to view existing code, configuration files, or any text-based files. All paths are relative to the workspace root.",
-        "input_schema": {
+        "schema": {
             "type": "object",
             "properties": {
                 "path": {
@@ -29,7 +31,7 @@ ANTHROPIC_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
     {
         "name": "write_file",
         "description": "Write content to a file in the workspace. Creates the file if it doesn't exist, and creates parent directories as needed. Use this to create new files or update existing ones.",
-        "input_schema": {
+        "schema": {
             "type": "object",
             "properties": {
                 "path": {
@@ -47,7 +49,7 @@ ANTHROPIC_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
     {
         "name": "list_directory",
         "description": "List the contents of a directory in the workspace. Returns information about files and subdirectories including names, types, sizes, and modification times.",
-        "input_schema": {
+        "schema": {
             "type": "object",
             "properties": {
                 "path": {
@@ -61,7 +63,7 @@ ANTHROPIC_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
     {
         "name": "create_directory",
         "description": "Create a new directory in the workspace. Creates parent directories automatically if they don't exist.",
-        "input_schema": {
+        "schema": {
             "type": "object",
             "properties": {
                 "path": {
@@ -75,7 +77,7 @@ ANTHROPIC_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
     {
         "name": "delete_file",
         "description": "Delete a file from the workspace. Use with caution as this operation cannot be undone.",
-        "input_schema": {
+        "schema": {
             "type": "object",
             "properties": {
                 "path": {
@@ -89,7 +91,7 @@ ANTHROPIC_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
     {
         "name": "file_exists",
         "description": "Check if a file or directory exists in the workspace. Returns whether it exists and its type (file or directory).",
-        "input_schema": {
+        "schema": {
             "type": "object",
             "properties": {
                 "path": {
@@ -103,6 +105,20 @@ ANTHROPIC_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
 ]
 
 
+# ============================================
+# Anthropic Claude Tool Schemas
+# ============================================
+
+ANTHROPIC_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
+    {
+        "name": tool["name"],
+        "description": tool["description"],
+        "input_schema": tool["schema"]
+    }
+    for tool in _FILESYSTEM_TOOLS
+]
+
+
 # ============================================
 # OpenAI Function Schemas
 # ============================================
@@ -111,109 +127,12 @@ OPENAI_FILESYSTEM_TOOLS: List[Dict[str, Any]] = [
     {
         "type": "function",
         "function": {
-            "name": "read_file",
-            "description": "Read the contents of a file from the workspace. Use this to view existing code, configuration files, or any text-based files. All paths are relative to the workspace root.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to the file relative to workspace root (e.g., 'backend/api/users.py')"
-                    }
-                },
-                "required": ["path"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "write_file",
-            "description": "Write content to a file in the workspace. Creates the file if it doesn't exist, and creates parent directories as needed. Use this to create new files or update existing ones.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to the file relative to workspace root (e.g., 'backend/api/users.py')"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Complete content to write to the file"
-                    }
-                },
-                "required": ["path", "content"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "list_directory",
-            "description": "List the contents of a directory in the workspace. Returns information about files and subdirectories including names, types, sizes, and modification times.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to the directory relative to workspace root (e.g., 'backend/api'). Leave empty for workspace root."
-                    }
-                },
-                "required": []
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "create_directory",
-            "description": "Create a new directory in the workspace. Creates parent directories automatically if they don't exist.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to the directory to create relative to workspace root (e.g., 'backend/api/v2')"
-                    }
-                },
-                "required": ["path"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "delete_file",
-            "description": "Delete a file from the workspace. Use with caution as this operation cannot be undone.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to the file to delete relative to workspace root (e.g., 'backend/api/old_endpoint.py')"
-                    }
-                },
-                "required": ["path"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "file_exists",
-            "description": "Check if a file or directory exists in the workspace. Returns whether it exists and its type (file or directory).",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to check relative to workspace root (e.g., 'backend/api/users.py')"
-                    }
-                },
-                "required": ["path"]
-            }
+            "name": tool["name"],
+            "description": tool["description"],
+            "parameters": tool["schema"]
         }
     }
+    for tool in _FILESYSTEM_TOOLS
 ]
 
 
@@ -319,10 +238,32 @@ I've created the users API endpoint file with a basic list_users function that r
 """
 
 
+# Short instructions for providers with native tool calling
+NATIVE_TOOL_INSTRUCTIONS = """
+You have access to filesystem tools for reading and writing files in the workspace.
+Use these tools when you need to view existing files, create new files, or modify code.
+All file paths are relative to the workspace root directory.
+"""
+
+
 # ============================================
 # Helper Functions
 # ============================================
 
+# Per-provider lookups, so each helper is one dict/set lookup. The schema
+# lists are shared (LLMClient caches request params by their identity) -
+# callers must not mutate them.
+_NATIVE_TOOL_PROVIDERS = frozenset({"anthropic", "openai"})
+
+_TOOL_SCHEMAS: Dict[str, List[Dict[str, Any]]] = {
+    "anthropic": ANTHROPIC_FILESYSTEM_TOOLS,
+    "openai": OPENAI_FILESYSTEM_TOOLS
+}
+
+# Ollama doesn't use structured schemas
+_NO_TOOL_SCHEMAS: List[Dict[str, Any]] = []
+
+
 def get_tool_schemas(provider: str) -> List[Dict[str, Any]]:
     """
     Get appropriate tool schemas for the given LLM provider
@@ -331,15 +272,9 @@ def get_tool_schemas(provider: str) -> List[Dict[str, Any]]:
         provider: LLM provider name ('anthropic', 'openai', or 'ollama')
 
     Returns:
-        List of tool schemas in the appropriate format
+        Shared (read-only) list of tool schemas in the appropriate format
     """
-    if provider == "anthropic":
-        return ANTHROPIC_FILESYSTEM_TOOLS
-    elif provider == "openai":
-        return OPENAI_FILESYSTEM_TOOLS
-    else:
-        # Ollama doesn't use structured schemas, returns empty list
-        return []
+    return _TOOL_SCHEMAS.get(provider, _NO_TOOL_SCHEMAS)
 
 
 def get_tool_instructions(provider: str) -> str:
@@ -352,16 +287,12 @@ def get_tool_instructions(provider: str) -> str:
     Returns:
         Tool usage instructions to add to system prompt
     """
-    if provider in ["anthropic", "openai"]:
+    if provider in _NATIVE_TOOL_PROVIDERS:
         # These providers use native tool calling, minimal instruction needed
-        return """
-You have access to filesystem tools for reading and writing files in the workspace.
-Use these tools when you need to view existing files, create new files, or modify code.
-All file paths are relative to the workspace root directory.
-"""
-    else:
-        # Ollama and other providers need detailed XML instructions
-        return OLLAMA_TOOL_INSTRUCTIONS
+        return NATIVE_TOOL_INSTRUCTIONS
+
+    # Ollama and other providers need detailed XML instructions
+    return OLLAMA_TOOL_INSTRUCTIONS
 
 
 def has_native_tool_calling(provider: str) -> bool:
@@ -374,4 +305,4 @@ def has_native_tool_calling(provider: str) -> bool:
     Returns:
         True if provider has native tool calling support
     """
-    return provider in ["anthropic", "openai"]
+    return provider in _NATIVE_TOOL_PROVIDERS
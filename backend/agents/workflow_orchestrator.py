@@ -6,13 +6,16 @@ parallel/sequential execution, and real-time progress updates.
 """
 
 import asyncio
+import graphlib
 import re
+import time
 from typing import Dict, Any, List, Optional
 from uuid import UUID
 from datetime import datetime, timezone
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
+from core.database import SessionLocal
 from models.database import Workflow, WorkflowTask, Agent, Message
 from agents.processor import get_agent_instance
 from websocket.manager import ConnectionManager
@@ -20,6 +23,30 @@ from utils.text_parsing import strip_markdown, extract_agent_names_from_task_lin
 
 logger = logging.getLogger(__name__)
 
+# Plan task lines, e.g. "Task 2: @backend - Build API (depends on Task 1)"
+_TASK_RE = re.compile(
+    r'Task\s+(\d+):\s*@(\w+)\s*-\s*(.+?)(?:\(depends on\s+(.+?)\))?$',
+    re.IGNORECASE
+)
+_DEP_RE = re.compile(r'Task\s+(\d+)', re.IGNORECASE)
+
+# Minimum seconds between workflow:progress frames; completions in between
+# are folded into the next frame
+_PROGRESS_INTERVAL = 0.1
+
+# One orchestrator per connection manager, so running workflows are tracked
+# (and cancellable) across requests
+_orchestrators: Dict[int, "WorkflowOrchestrator"] = {}
+
+
+def get_workflow_orchestrator(manager: ConnectionManager) -> "WorkflowOrchestrator":
+    """Get or create the shared WorkflowOrchestrator for a connection manager"""
+    orchestrator = _orchestrators.get(id(manager))
+    if orchestrator is None or orchestrator.manager is not manager:
+        orchestrator = WorkflowOrchestrator(manager)
+        _orchestrators[id(manager)] = orchestrator
+    return orchestrator
+
 
 class WorkflowOrchestrator:
     """Manages workflow execution and coordination"""
@@ -80,14 +107,12 @@ class WorkflowOrchestrator:
             })
 
             # Get orchestrator agent
-            orchestrator_record = db.query(Agent).filter(
-                Agent.id == orchestrator_id
-            ).first()
+            orchestrator_record = db.get(Agent, orchestrator_id)
 
             if not orchestrator_record:
                 raise ValueError("Orchestrator agent not found")
 
-            orchestrator = get_agent_instance(orchestrator_record)
+            orchestrator = get_agent_instance(orchestrator_record, db)
 
             # Broadcast planning status
             await self.manager.broadcast('workflow:planning', {
@@ -118,6 +143,14 @@ class WorkflowOrchestrator:
             }
             db.commit()
 
+            # The commit expired the new tasks - reload them with their agents
+            # in two queries rather than refreshing each task and agent lazily
+            tasks = db.query(WorkflowTask).options(
+                selectinload(WorkflowTask.agent)
+            ).filter(
+                WorkflowTask.workflow_id == workflow.id
+            ).order_by(WorkflowTask.order_index).all()
+
             # Broadcast plan ready
             await self.manager.broadcast('workflow:plan_ready', {
                 'workflow_id': str(workflow.id),
@@ -216,10 +249,8 @@ Create the plan now:"""
         tasks = []
         task_map = {}  # Map task numbers to WorkflowTask objects
 
-        # Regular expression to match task lines
-        # Updated to handle optional markdown formatting (bold, headers, etc.)
-        task_pattern = r'Task\s+(\d+):\s*@(\w+)\s*-\s*(.+?)(?:\(depends on\s+(.+?)\))?$'
-
+        # First pass: extract task lines so agents can be resolved in one query
+        parsed = []
         lines = plan_text.split('\n')
         for line in lines:
             line = line.strip()
@@ -227,49 +258,56 @@ Create the plan now:"""
             # Strip markdown formatting using centralized utility
             line = strip_markdown(line)
 
-            match = re.match(task_pattern, line, re.IGNORECASE)
+            match = _TASK_RE.match(line)
 
             if match:
-                task_num = int(match.group(1))
-                agent_name = match.group(2).lower()
-                description = match.group(3).strip()
-                depends_str = match.group(4)
-
-                # Get agent from database
-                agent = db.query(Agent).filter(
-                    Agent.name == f"@{agent_name}"
-                ).first()
-
-                if not agent:
-                    logger.warning(f"Agent not found: @{agent_name}, skipping task")
-                    continue
-
-                # Parse dependencies
-                depends_on = []
-                if depends_str:
-                    # Extract task numbers from "Task 1, Task 2" format
-                    dep_matches = re.findall(r'Task\s+(\d+)', depends_str, re.IGNORECASE)
-                    depends_on = [int(d) for d in dep_matches]
-
-                # Create WorkflowTask
-                workflow_task = WorkflowTask(
-                    workflow_id=workflow_id,
-                    description=description,
-                    agent_id=agent.id,
-                    order_index=task_num - 1,  # 0-indexed
-                    depends_on=[],  # Will update after all tasks created
-                    status="pending"
-                )
+                parsed.append((
+                    int(match.group(1)),
+                    match.group(2).lower(),
+                    match.group(3).strip(),
+                    match.group(4)
+                ))
+
+        names = {f"@{agent_name}" for _, agent_name, _, _ in parsed}
+        agents_by_name = {
+            agent.name: agent
+            for agent in db.query(Agent).filter(Agent.name.in_(names)).all()
+        } if names else {}
+
+        # Second pass: build WorkflowTask objects from the parsed lines
+        for task_num, agent_name, description, depends_str in parsed:
+            agent = agents_by_name.get(f"@{agent_name}")
+
+            if not agent:
+                logger.warning(f"Agent not found: @{agent_name}, skipping task")
+                continue
 
-                db.add(workflow_task)
-                db.flush()  # Get ID without committing
+            # Parse dependencies
+            depends_on = []
+            if depends_str:
+                # Extract task numbers from "Task 1, Task 2" format
+                dep_matches = _DEP_RE.findall(depends_str)
+                depends_on = [int(d) for d in dep_matches]
+
+            # Create WorkflowTask
+            workflow_task = WorkflowTask(
+                workflow_id=workflow_id,
+                description=description,
+                agent_id=agent.id,
+                order_index=task_num - 1,  # 0-indexed
+                depends_on=[],  # Will update after all tasks created
+                status="pending"
+            )
 
-                task_map[task_num] = {
-                    'task': workflow_task,
-                    'depends_on_numbers': depends_on
-                }
+            task_map[task_num] = {
+                'task': workflow_task,
+                'depends_on_numbers': depends_on
+            }
+
+            tasks.append(workflow_task)
 
-                tasks.append(workflow_task)
+        db.add_all(tasks)
+        db.flush()  # Get IDs without committing
 
         # Now update dependencies with actual UUIDs
         for task_info in task_map.values():
@@ -309,6 +347,25 @@ Create the plan now:"""
         else:
             return "dag"  # Complex dependency graph
 
+    async def run_workflow(self, workflow_id: UUID):
+        """
+        Execute a workflow in the background with its own database session
+
+        Use this instead of execute_workflow when the caller's session is
+        request-scoped and may be closed before the workflow finishes.
+
+        Args:
+            workflow_id: Workflow to execute
+        """
+        # This session is the only writer of the workflow's rows while it
+        # runs, so keep loaded tasks and agents across the executor's commits
+        # instead of re-selecting them after each one
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            await self.execute_workflow(workflow_id, db)
+        finally:
+            db.close()
+
     async def execute_workflow(
         self,
         workflow_id: UUID,
@@ -317,11 +374,12 @@ Create the plan now:"""
         """
         Execute a workflow
 
-        This runs the workflow execution loop:
-        1. Get ready tasks (dependencies met)
-        2. Execute tasks (in parallel where possible)
-        3. Update progress
-        4. Repeat until done
+        Tasks are dispatched as soon as all their dependencies have completed
+        (graphlib.TopologicalSorter), so independent branches never wait on
+        each other:
+        1. Start every ready task
+        2. Wait for the next one to finish, update progress
+        3. Stop dispatching on failure or cancellation, otherwise continue
 
         Args:
             workflow_id: Workflow to execute
@@ -330,8 +388,10 @@ Create the plan now:"""
         try:
             self.active_workflows[workflow_id] = True
 
-            # Load workflow
-            workflow = db.query(Workflow).filter(
+            # Load workflow with its tasks and their agents up front
+            workflow = db.query(Workflow).options(
+                selectinload(Workflow.workflow_tasks).selectinload(WorkflowTask.agent)
+            ).filter(
                 Workflow.id == workflow_id
             ).first()
 
@@ -355,53 +415,123 @@ Create the plan now:"""
             # Execute tasks
             completed_count = 0
             failed = False
+            cancelled = False
+
+            tasks_by_id = {str(task.id): task for task in workflow.workflow_tasks}
+            sorter = graphlib.TopologicalSorter()
+            for task_id, task in tasks_by_id.items():
+                sorter.add(task_id, *(task.depends_on or ()))
+
+            try:
+                sorter.prepare()
+            except graphlib.CycleError:
+                logger.error(f"Workflow deadlock detected: {workflow_id}")
+                failed = True
+                workflow.error = "Task dependency deadlock detected"
+
+            in_flight: Dict[asyncio.Task, WorkflowTask] = {}
+            broadcast_count = 0
+            last_progress_at = float('-inf')
+
+            async def broadcast_progress():
+                """Send the current completion count to clients"""
+                nonlocal broadcast_count, last_progress_at
+                broadcast_count = completed_count
+                last_progress_at = time.monotonic()
+                percent = int((completed_count / total_tasks) * 100)
+                await self.manager.broadcast('workflow:progress', {
+                    'workflow_id': str(workflow.id),
+                    'completed': completed_count,
+                    'total': total_tasks,
+                    'percent': percent
+                })
 
-            while completed_count < total_tasks and not failed:
-                # Get ready tasks
-                ready_tasks = self._get_ready_tasks(workflow, db)
-
-                if not ready_tasks:
-                    # No more ready tasks but not all completed = deadlock
-                    logger.error(f"Workflow deadlock detected: {workflow_id}")
+            async def record_result(task: WorkflowTask, error: Optional[BaseException]):
+                """Mark a finished task, broadcasting progress on success"""
+                nonlocal completed_count, failed
+                if error is not None:
+                    logger.error(f"Task {task.id} failed: {error}")
+                    task.status = "failed"
+                    task.error = str(error)
                     failed = True
-                    workflow.error = "Task dependency deadlock detected"
-                    break
-
-                # Execute ready tasks in parallel
-                task_results = await asyncio.gather(*[
-                    self._execute_task(task, workflow, db)
-                    for task in ready_tasks
-                ], return_exceptions=True)
-
-                # Process results
-                for task, result in zip(ready_tasks, task_results):
-                    if isinstance(result, Exception):
-                        logger.error(f"Task {task.id} failed: {result}")
-                        task.status = "failed"
-                        task.error = str(result)
-                        failed = True
-                    else:
-                        completed_count += 1
-
-                        # Broadcast progress
-                        percent = int((completed_count / total_tasks) * 100)
-                        await self.manager.broadcast('workflow:progress', {
-                            'workflow_id': str(workflow.id),
-                            'completed': completed_count,
-                            'total': total_tasks,
-                            'percent': percent
-                        })
+                    return
 
-                db.commit()
+                completed_count += 1
+                sorter.done(str(task.id))
+
+                # Coalesce bursts of completions into one progress frame
+                if (
+                    completed_count == total_tasks
+                    or time.monotonic() - last_progress_at >= _PROGRESS_INTERVAL
+                ):
+                    await broadcast_progress()
+
+            try:
+                while not failed and not cancelled:
+                    # Start everything whose dependencies are done. Unknown
+                    # dependency ids come back as ready nodes too - they are
+                    # never run or marked done, so their dependents stay
+                    # blocked (reported as a deadlock below).
+                    ready = [
+                        tasks_by_id[task_id] for task_id in sorter.get_ready()
+                        if task_id in tasks_by_id
+                    ]
+                    if ready:
+                        # One commit marks the whole batch as started
+                        started_at = datetime.now(timezone.utc)
+                        for task in ready:
+                            task.status = "in_progress"
+                            task.started_at = started_at
+                        db.commit()
+
+                    for task in ready:
+                        in_flight[asyncio.create_task(self._execute_task(task, workflow, total_tasks, db))] = task
+
+                    if not in_flight:
+                        break
+
+                    done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        await record_result(in_flight.pop(future), future.exception())
 
-                # Check if cancelled
-                if not self.active_workflows.get(workflow_id, False):
-                    workflow.status = "cancelled"
                     db.commit()
-                    await self.manager.broadcast('workflow:cancelled', {
-                        'workflow_id': str(workflow.id)
-                    })
-                    return
+
+                    # Check if cancelled
+                    cancelled = not self.active_workflows.get(workflow_id, False)
+
+                # Stop dispatching, but let running tasks finish - they share
+                # this session
+                if in_flight:
+                    running = list(in_flight)
+                    results = await asyncio.gather(*running, return_exceptions=True)
+                    for future, result in zip(running, results):
+                        await record_result(
+                            in_flight.pop(future),
+                            result if isinstance(result, BaseException) else None
+                        )
+                    db.commit()
+            finally:
+                # Only reached with tasks still running if we were cancelled
+                for future in in_flight:
+                    future.cancel()
+
+            # Flush progress held back by coalescing
+            if completed_count != broadcast_count:
+                await broadcast_progress()
+
+            if cancelled:
+                workflow.status = "cancelled"
+                db.commit()
+                await self.manager.broadcast('workflow:cancelled', {
+                    'workflow_id': str(workflow.id)
+                })
+                return
+
+            if not failed and completed_count < total_tasks:
+                # Remaining tasks wait on a task that doesn't exist
+                logger.error(f"Workflow deadlock detected: {workflow_id}")
+                failed = True
+                workflow.error = "Task dependency deadlock detected"
 
             # Finalize workflow
             if failed:
@@ -519,57 +649,23 @@ Create the plan now:"""
         finally:
             self.active_workflows.pop(workflow_id, None)
 
-    def _get_ready_tasks(self, workflow: Workflow, db: Session) -> List[WorkflowTask]:
-        """
-        Get tasks that are ready to execute
-        (status=pending and all dependencies completed)
-
-        Args:
-            workflow: Workflow object
-            db: Database session
-
-        Returns:
-            List of ready WorkflowTask objects
-        """
-        ready_tasks = []
-
-        for task in workflow.workflow_tasks:
-            if task.status != "pending":
-                continue
-
-            # Check if all dependencies are completed
-            if not task.depends_on:
-                # No dependencies, ready to go
-                ready_tasks.append(task)
-            else:
-                # Check each dependency
-                deps_completed = True
-                for dep_id in task.depends_on:
-                    dep_task = db.query(WorkflowTask).filter(
-                        WorkflowTask.id == UUID(dep_id)
-                    ).first()
-
-                    if not dep_task or dep_task.status != "completed":
-                        deps_completed = False
-                        break
-
-                if deps_completed:
-                    ready_tasks.append(task)
-
-        return ready_tasks
-
     async def _execute_task(
         self,
         workflow_task: WorkflowTask,
         workflow: Workflow,
+        total_tasks: int,
         db: Session
     ) -> Dict[str, Any]:
         """
         Execute a single workflow task
 
+        The caller marks the task in_progress; the final status is committed
+        here, before anything else can touch the shared session.
+
         Args:
             workflow_task: Task to execute
             workflow: Parent workflow
+            total_tasks: Number of tasks in the workflow
             db: Database session
 
         Returns:
@@ -578,11 +674,6 @@ Create the plan now:"""
         try:
             logger.info(f"Executing task {workflow_task.id}: {workflow_task.description}")
 
-            # Update status
-            workflow_task.status = "in_progress"
-            workflow_task.started_at = datetime.now(timezone.utc)
-            db.commit()
-
             # Broadcast task started
             await self.manager.broadcast('workflow:task_started', {
                 'workflow_id': str(workflow.id),
@@ -592,10 +683,10 @@ Create the plan now:"""
             })
 
             # Build context
-            context = self._build_task_context(workflow_task, workflow, db)
+            context = self._build_task_context(workflow_task, workflow, total_tasks, db)
 
-            # Get agent and execute
-            agent = get_agent_instance(workflow_task.agent)
+            # Get agent and execute (instances are shared via the processor's LRU)
+            agent = get_agent_instance(workflow_task.agent, db)
             response = await agent.process_message(
                 workflow_task.description,
                 context
@@ -608,6 +699,8 @@ Create the plan now:"""
             }
             workflow_task.status = "completed"
             workflow_task.completed_at = datetime.now(timezone.utc)
+            # Commit before the next await: other tasks' agents share this
+            # session, and a rollback in their memory writes would discard it
             db.commit()
 
             # Broadcast task completed
@@ -640,6 +733,7 @@ Create the plan now:"""
         self,
         workflow_task: WorkflowTask,
         workflow: Workflow,
+        total_tasks: int,
         db: Session
     ) -> Dict[str, Any]:
         """
@@ -654,6 +748,7 @@ Create the plan now:"""
         Args:
             workflow_task: Task being executed
             workflow: Parent workflow
+            total_tasks: Number of tasks in the workflow
             db: Database session
 
         Returns:
@@ -662,7 +757,7 @@ Create the plan now:"""
         context = {
             "workflow_request": workflow.description,
             "task_number": workflow_task.order_index + 1,
-            "total_tasks": len(workflow.workflow_tasks),
+            "total_tasks": total_tasks,
             "workspace_instructions": """
 IMPORTANT: You must CREATE ACTUAL FILES in the workspace using tool calls.
 
@@ -678,11 +773,11 @@ DO NOT just describe what files should be created. Actually create them!
 
         # Add outputs from dependencies
         if workflow_task.depends_on:
+            # Dependencies are siblings already loaded on the workflow
+            tasks_by_id = {str(task.id): task for task in workflow.workflow_tasks}
             dep_outputs = []
             for dep_id in workflow_task.depends_on:
-                dep_task = db.query(WorkflowTask).filter(
-                    WorkflowTask.id == UUID(dep_id)
-                ).first()
+                dep_task = tasks_by_id.get(dep_id)
 
                 if dep_task and dep_task.output:
                     dep_outputs.append({
@@ -705,6 +800,7 @@ DO NOT just describe what files should be created. Actually create them!
         Returns:
             Results dictionary
         """
+        total_tasks = len(workflow.workflow_tasks)
         completed_tasks = [
             t for t in workflow.workflow_tasks
             if t.status == "completed"
@@ -715,9 +811,9 @@ DO NOT just describe what files should be created. Actually create them!
             duration = (workflow.completed_at - workflow.started_at).total_seconds()
 
         return {
-            "summary": f"Completed {len(completed_tasks)} of {len(workflow.workflow_tasks)} tasks",
+            "summary": f"Completed {len(completed_tasks)} of {total_tasks} tasks",
             "completed_tasks": len(completed_tasks),
-            "total_tasks": len(workflow.workflow_tasks),
+            "total_tasks": total_tasks,
             "duration_seconds": duration,
             "agent_contributions": {
                 task.agent.name: task.output.get("response", "")[:200]
@@ -329,6 +329,7 @@ class CacheTTL:
     WORKFLOW_STATUS = 60     # 1 minute - high change rate
     AGENT_LIST = 1800        # 30 minutes - list of all agents
     MESSAGE_COUNT = 300      # 5 minutes - message statistics
+    AGENT_TASK_STATUS = 3600  # 1 hour - per-message agent task status
 
 
 def cached(namespace: str, ttl: int, key_param: str = "id"):
@@ -12,6 +12,8 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     REDIS_URL: str
+    DB_POOL_SIZE: int = 20  # Persistent pooled connections
+    DB_MAX_OVERFLOW: int = 40  # Extra connections allowed under burst load
 
     # Authentication
     AUTH_ENABLED: bool = False
@@ -21,6 +23,7 @@ class Settings(BaseSettings):
     # LLM Providers
     ANTHROPIC_API_KEY: Optional[str] = None
     ANTHROPIC_DEFAULT_MODEL: str = "claude-3-5-sonnet-20241022"
+    ANTHROPIC_PROMPT_CACHING: bool = True  # Cache the static tools + system prompt prefix server-side
 
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_DEFAULT_MODEL: str = "gpt-4-turbo-preview"
@@ -33,10 +36,19 @@ class Settings(BaseSettings):
     DEFAULT_LLM_PROVIDER: str = "anthropic"
     DEFAULT_EMBEDDING_PROVIDER: str = "ollama"
 
+    # HTTP connection pool (Ollama + MCP httpx clients)
+    LLM_MAX_CONNECTIONS: int = 1000
+    LLM_KEEPALIVE_CONNECTIONS: int = 200
+    LLM_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection stays pooled
+    LLM_HTTP2: bool = True  # Multiplex Ollama requests over HTTP/2 when the server supports it
+    LLM_WARMUP_ON_STARTUP: bool = True  # Pre-open provider connections at startup
+    LLM_WARMUP_TIMEOUT: float = 5.0  # Max seconds startup waits for warm-up
+
     # MCP Servers
     MCP_FILESYSTEM_ENABLED: bool = True
     MCP_FILESYSTEM_PORT: int = 3001
     MCP_FILESYSTEM_WORKSPACE: str
+    MCP_HTTP2: bool = True  # Multiplex MCP requests over HTTP/2 when the server supports it
 
     MCP_GITHUB_ENABLED: bool = True
     MCP_GITHUB_PORT: int = 3002
@@ -69,14 +81,26 @@ class Settings(BaseSettings):
     DEFAULT_TEMPERATURE: float = 0.7
     ENABLE_CACHE: bool = True
     CACHE_TTL: int = 3600
+    LLM_RESPONSE_CACHE_SIZE: int = 2048  # In-memory LRU entries for deterministic (temperature=0) prompts
+    LLM_RESPONSE_CACHE_REDIS: bool = False  # Share cached responses across workers via Redis
     USE_EMBEDDINGS_CACHE: bool = True
+    EMBEDDING_CACHE_SIZE: int = 10000  # In-memory LRU entries for generated embeddings
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     EMBEDDING_DIMENSIONS: int = 768  # nomic-embed-text: 768, OpenAI small: 1536
 
+    # Semantic LLM response cache (requires sentence-transformers)
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95  # Cosine similarity required for a hit
+    SEMANTIC_CACHE_MODEL: str = "all-MiniLM-L6-v2"
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 10000  # Per provider/model/max_tokens/temperature, oldest evicted first
+
     # Agent Configuration
-    MAX_CONCURRENT_AGENTS: int = 5
-    TASK_TIMEOUT: int = 300
+    MAX_CONCURRENT_AGENTS: int = 5  # Agent worker pool size (messages processed at once)
+    AGENT_QUEUE_SIZE: int = 1000  # Pending agent messages before new ones are rejected
+    TASK_TIMEOUT: int = 300  # Busy agent claims older than this are treated as abandoned
     ENABLE_AGENT_MEMORY: bool = True
+    AGENT_CACHE_SIZE: int = 128  # Agent instances kept in memory, least recently used evicted
+    MEMORY_HNSW_EF_SEARCH: int = 40  # pgvector HNSW candidate list size for memory retrieval (recall vs speed)
 
     # Security
     SECRET_KEY: str = "local-dev-secret-key-change-in-production"
@@ -20,8 +20,8 @@ query_profiling_context: ContextVar[dict] = ContextVar("query_profiling", defaul
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,  # Increased from 5 for better concurrency
-    max_overflow=20,  # Increased from 10 for high-load scenarios
+    pool_size=settings.DB_POOL_SIZE,  # One session per concurrently running agent
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Burst headroom for multi-agent fan-out
     pool_recycle=3600,  # Recycle connections after 1 hour
     echo=settings.DEBUG
 )
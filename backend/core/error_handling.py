@@ -3,9 +3,13 @@ Error handling utilities and middleware for RezNet AI
 Provides robust error handling, retry logic, and user-friendly error messages
 """
 
+import asyncio
 import logging
+import random
 import time
 import functools
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional, Dict, Any, Callable
 from enum import Enum
 
@@ -33,7 +37,8 @@ class LLMError(Exception):
         retryable: bool = False,
         provider: Optional[str] = None,
         model: Optional[str] = None,
-        original_error: Optional[Exception] = None
+        original_error: Optional[Exception] = None,
+        retry_after: Optional[float] = None
     ):
         super().__init__(message)
         self.message = message
@@ -42,6 +47,7 @@ class LLMError(Exception):
         self.provider = provider
         self.model = model
         self.original_error = original_error
+        self.retry_after = retry_after  # Seconds the provider asked us to wait (Retry-After)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert error to dictionary for serialization"""
@@ -50,7 +56,8 @@ class LLMError(Exception):
             "error_type": self.error_type.value,
             "retryable": self.retryable,
             "provider": self.provider,
-            "model": self.model
+            "model": self.model,
+            "retry_after": self.retry_after
         }
 
 
@@ -84,6 +91,41 @@ class LLMRateLimitError(LLMError):
         super().__init__(message, error_type=ErrorType.RATE_LIMIT, retryable=True, **kwargs)
 
 
+def parse_retry_after(error: Exception) -> Optional[float]:
+    """
+    Extract the Retry-After delay from an HTTP error response, if present
+
+    Works with SDK/httpx exceptions that expose `.response.headers`
+    (anthropic, openai, httpx.HTTPStatusError).
+
+    Args:
+        error: The original exception
+
+    Returns:
+        Delay in seconds, or None if the header is missing/unparseable
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    # HTTP-date form, e.g. "Wed, 21 Oct 2015 07:28:00 GMT"
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
 def classify_error(error: Exception, provider: str) -> LLMError:
     """
     Classify a raw exception into a specific LLMError type
@@ -127,7 +169,8 @@ def classify_error(error: Exception, provider: str) -> LLMError:
         return LLMRateLimitError(
             f"Rate limit exceeded for {provider}. Please wait a moment and try again.",
             provider=provider,
-            original_error=error
+            original_error=error,
+            retry_after=parse_retry_after(error)
         )
 
     # Network/connection errors
@@ -166,6 +209,22 @@ def format_user_friendly_error(error: Exception, agent_name: str = "Agent") -> s
     return f"⚠️ {agent_name} encountered an unexpected issue. Our team has been notified. Please try again or rephrase your request."
 
 
+# Identical structured errors within this window are counted, not logged
+ERROR_LOG_SAMPLE_WINDOW = 1.0
+
+# (error_type, message, provider, model, agent) -> (last logged monotonic time, suppressed count)
+_error_log_state: Dict[tuple, list] = {}
+
+# Expired sampling entries are pruned once this many keys accumulate
+_ERROR_LOG_STATE_MAX = 1024
+
+_LOG_LEVELS = {
+    "error": (logging.ERROR, "Error occurred: %s"),
+    "warning": (logging.WARNING, "Warning: %s"),
+    "info": (logging.INFO, "Info: %s")
+}
+
+
 def structured_log_error(
     error: Exception,
     context: Dict[str, Any],
@@ -174,19 +233,52 @@ def structured_log_error(
     """
     Log error with full structured context for debugging
 
+    Sampled: repeats of the same error (type and message) for the same
+    provider/model/agent within ERROR_LOG_SAMPLE_WINDOW are only counted, and
+    the count is reported on the next logged occurrence. Nothing is formatted
+    if the level is disabled.
+
     Args:
         error: The exception to log
         context: Additional context (agent, model, provider, request, etc.)
         level: Log level (error, warning, info)
     """
+    levelno, template = _LOG_LEVELS.get(level, _LOG_LEVELS["info"])
+    if not logger.isEnabledFor(levelno):
+        return
+
+    is_llm_error = isinstance(error, LLMError)
+    error_message = str(error)
+    key = (
+        type(error).__name__,
+        error_message,
+        context.get("provider") or (error.provider if is_llm_error else None),
+        context.get("model") or (error.model if is_llm_error else None),
+        context.get("agent_name")
+    )
+
+    now = time.monotonic()
+    state = _error_log_state.get(key)
+    if state is not None and now - state[0] < ERROR_LOG_SAMPLE_WINDOW:
+        state[1] += 1
+        return
+
+    suppressed = state[1] if state is not None else 0
+    if state is None and len(_error_log_state) >= _ERROR_LOG_STATE_MAX:
+        # Messages vary (ids, counts), so drop keys whose window has passed
+        for stale in [k for k, (logged_at, _) in _error_log_state.items()
+                      if now - logged_at >= ERROR_LOG_SAMPLE_WINDOW]:
+            del _error_log_state[stale]
+    _error_log_state[key] = [now, 0]
+
     log_data = {
         "error_type": type(error).__name__,
-        "error_message": str(error),
+        "error_message": error_message,
         **context
     }
 
     # Add LLMError-specific fields if applicable
-    if isinstance(error, LLMError):
+    if is_llm_error:
         log_data.update({
             "error_category": error.error_type.value,
             "retryable": error.retryable,
@@ -194,29 +286,36 @@ def structured_log_error(
             "llm_model": error.model
         })
 
-    # Log at appropriate level
-    if level == "error":
-        logger.error(f"Error occurred: {log_data}")
-    elif level == "warning":
-        logger.warning(f"Warning: {log_data}")
-    else:
-        logger.info(f"Info: {log_data}")
+    if suppressed:
+        log_data["suppressed_repeats"] = suppressed
+
+    # Lazy %-formatting: handlers only render log_data if the record is emitted
+    logger.log(levelno, template, log_data)
 
 
 def retry_with_exponential_backoff(
     max_attempts: int = 3,
     initial_delay: float = 1.0,
     backoff_factor: float = 2.0,
-    retryable_errors: tuple = (LLMAPIError, LLMTimeoutError, LLMRateLimitError)
+    retryable_errors: tuple = (LLMAPIError, LLMTimeoutError, LLMRateLimitError),
+    max_delay: float = 30.0,
+    jitter: bool = True
 ):
     """
     Decorator to retry async functions with exponential backoff
 
+    Delays grow as initial_delay * backoff_factor^n, capped at max_delay.
+    With jitter, each delay is stretched by a random 0-50% so concurrent
+    callers hitting the same rate limit don't retry in lockstep. A provider
+    Retry-After (LLMError.retry_after) overrides the computed delay.
+
     Args:
         max_attempts: Maximum number of retry attempts (default: 3)
         initial_delay: Initial delay in seconds (default: 1.0)
         backoff_factor: Multiplier for delay after each attempt (default: 2.0)
         retryable_errors: Tuple of exception types that should trigger retry
+        max_delay: Upper bound for any single delay in seconds (default: 30.0)
+        jitter: Randomize delays to de-correlate retries (default: True)
 
     Usage:
         @retry_with_exponential_backoff(max_attempts=3, initial_delay=1.0)
@@ -248,14 +347,22 @@ def retry_with_exponential_backoff(
                         )
                         raise
 
+                    # Honor provider Retry-After, otherwise use jittered backoff
+                    retry_after = getattr(e, "retry_after", None)
+                    if retry_after is not None:
+                        wait = min(max_delay, retry_after)
+                    else:
+                        wait = delay * random.uniform(1.0, 1.5) if jitter else delay
+                        wait = min(max_delay, wait)
+
                     # Log retry attempt
                     logger.warning(
                         f"{func.__name__} failed on attempt {attempt}/{max_attempts}, "
-                        f"retrying in {delay}s... Error: {type(e).__name__}: {str(e)}"
+                        f"retrying in {wait:.2f}s... Error: {type(e).__name__}: {str(e)}"
                     )
 
-                    # Wait before retrying
-                    time.sleep(delay)
+                    # Wait before retrying (without blocking the event loop)
+                    await asyncio.sleep(wait)
                     delay *= backoff_factor
 
             # Should never reach here, but raise last error if we do
@@ -0,0 +1,75 @@
+"""
+Shared async HTTP clients
+
+One httpx.AsyncClient per base URL for the whole process, so connection
+pools, DNS lookups and TLS sessions are reused across LLMClient and MCP
+client instances instead of being rebuilt per agent.
+"""
+
+import importlib.util
+import logging
+from typing import Dict
+
+import httpx
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Registry of shared clients keyed by base URL
+_CLIENTS: Dict[str, httpx.AsyncClient] = {}
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+_H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def get_shared_client(base_url: str, timeout: float, http2: bool = False) -> httpx.AsyncClient:
+    """
+    Get or create the shared HTTP client for a base URL
+
+    Creation has no await points, so it is atomic on the event loop and
+    needs no lock. Closed clients (e.g. after hot-reload) are replaced.
+
+    Args:
+        base_url: Service base URL (e.g. OLLAMA_HOST)
+        timeout: Default request timeout in seconds (applies to the first caller)
+        http2: Allow HTTP/2 so concurrent requests multiplex over one connection.
+            Servers without HTTP/2 (or plain-http hosts) negotiate down to HTTP/1.1.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    client = _CLIENTS.get(base_url)
+    if client is None or client.is_closed:
+        if http2 and not _H2_AVAILABLE:
+            logger.warning("h2 not installed, using HTTP/1.1. Run: pip install 'httpx[http2]'")
+            http2 = False
+
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout),
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY
+            )
+        )
+        _CLIENTS[base_url] = client
+        logger.info(f"Created shared HTTP client for {base_url} (http2={http2})")
+    return client
+
+
+async def shutdown_clients():
+    """
+    Close all shared HTTP clients
+    Called from the FastAPI lifespan on shutdown.
+    """
+    for base_url, client in list(_CLIENTS.items()):
+        try:
+            await client.aclose()
+            logger.debug(f"Closed shared HTTP client for {base_url}")
+        except Exception as e:
+            logger.warning(f"Error closing shared HTTP client for {base_url}: {e}")
+
+    _CLIENTS.clear()
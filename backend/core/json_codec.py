@@ -0,0 +1,54 @@
+"""
+Fast JSON encoding for hot paths (LLM + MCP payloads)
+
+Uses orjson when installed - it is several times faster than the stdlib and
+encodes straight to bytes, skipping the str -> utf-8 step. Falls back to the
+stdlib json module with the same interface otherwise.
+
+UUIDs and datetimes are encoded as strings either way (orjson natively,
+the stdlib through default()), so payloads can carry them as-is.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# Headers for requests sent with a pre-encoded JSON body
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def default(obj: Any) -> Any:
+    """json.dumps default= hook matching orjson's UUID/datetime output"""
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes"""
+        return orjson.dumps(obj)
+
+    def loads(data: Any) -> Any:
+        """Deserialize JSON from bytes or str"""
+        return orjson.loads(data)
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes"""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=default).encode()
+
+    def loads(data: Any) -> Any:
+        """Deserialize JSON from bytes or str"""
+        return json.loads(data)
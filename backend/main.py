@@ -9,6 +9,7 @@ from fastapi.responses import JSONResponse
 import os
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
+import asyncio
 import time
 import logging
 
@@ -26,6 +27,38 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+async def warmup_llm_providers():
+    """Warm up shared connection pools for every configured LLM provider"""
+    from agents.llm_client import LLMClient
+
+    providers = []
+    if settings.ANTHROPIC_API_KEY:
+        providers.append("anthropic")
+    if settings.OPENAI_API_KEY:
+        providers.append("openai")
+    if settings.USE_OLLAMA:
+        providers.append("ollama")
+
+    clients = []
+    for provider in providers:
+        try:
+            clients.append(LLMClient(provider=provider))
+        except Exception as e:
+            print(f"⚠️  Skipping {provider} warm-up: {e}")
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(client.warmup() for client in clients)),
+            timeout=settings.LLM_WARMUP_TIMEOUT
+        )
+        print(f"🔥 LLM connections warmed: {', '.join(c.provider for c in clients) or 'none'}")
+    except asyncio.TimeoutError:
+        print("⚠️  LLM warm-up timed out, continuing startup")
+    finally:
+        for client in clients:
+            await client.aclose()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
@@ -73,10 +106,19 @@ async def lifespan(app: FastAPI):
     # Clear agent cache to ensure fresh instances with valid HTTP clients
     # This is critical for hot-reload scenarios where httpx.AsyncClient
     # connections become stale
-    from agents.processor import clear_agent_cache
+    from agents.processor import clear_agent_cache, prewarm_agent_cache, reset_busy_agents
     clear_agent_cache()
     print("🔄 Agent cache cleared (agents will use current LLM provider)")
 
+    # Release busy claims gone stale (their worker died mid-task), then
+    # instantiate active agents so the first mention skips construction
+    db = SessionLocal()
+    try:
+        reset_busy_agents(db)
+        prewarm_agent_cache(db)
+    finally:
+        db.close()
+
     # Warm Redis cache with frequently accessed data (Issue #47)
     from core.cache import warm_cache_on_startup
     from core.database import SessionLocal
@@ -89,11 +131,31 @@ async def lifespan(app: FastAPI):
     finally:
         cache_db.close()
 
+    # Start the worker pool that processes agent mentions
+    from agents.processor import start_agent_workers
+    start_agent_workers()
+
+    # Pre-open connections to configured LLM providers (saves the TLS
+    # handshake on the first agent request)
+    if settings.LLM_WARMUP_ON_STARTUP:
+        await warmup_llm_providers()
+
+    # Load the semantic cache's embedding model now rather than on the first
+    # prompt that reaches it
+    if settings.SEMANTIC_CACHE_ENABLED:
+        from agents.llm_cache import semantic_llm_cache
+        await semantic_llm_cache.load()
+
     yield
 
     # Shutdown
-    from agents.processor import cleanup_agent_cache
+    from agents.processor import cleanup_agent_cache, shutdown_agent_tasks
+    from agents.llm_client import shutdown_provider_clients
+    from core.http_client import shutdown_clients
+    await shutdown_agent_tasks()
     await cleanup_agent_cache()
+    await shutdown_provider_clients()
+    await shutdown_clients()
     print("👋 Shutting down RezNet AI...")
 
 
@@ -294,11 +356,28 @@ async def get_cache_performance():
     NFR Target: 60%+ reduction in repeated database queries
     """
     from core.cache import cache
+    from agents.llm_cache import llm_response_cache, llm_singleflight, semantic_llm_cache
+    from agents.memory_manager import embedding_cache
+    from agents.processor import get_agent_cache_metrics
 
     metrics = cache.get_metrics()
 
     return {
         "cache_metrics": metrics,
+        "llm_response_cache": {
+            "enabled": settings.ENABLE_CACHE,
+            **llm_response_cache.get_metrics()
+        },
+        "llm_request_coalescing": llm_singleflight.get_metrics(),
+        "semantic_llm_cache": {
+            "enabled": settings.SEMANTIC_CACHE_ENABLED,
+            **semantic_llm_cache.get_metrics()
+        },
+        "embedding_cache": {
+            "enabled": settings.USE_EMBEDDINGS_CACHE,
+            **embedding_cache.get_metrics()
+        },
+        "agent_instance_cache": get_agent_cache_metrics(),
         "nfr_target": "60%+ cache hit rate for frequently accessed data",
         "recommendation": "Monitor hit_rate_percent - should be > 60% for optimal performance"
     }
@@ -0,0 +1,23 @@
+-- Migration 006: Deduplicate agent memories by content hash
+-- Purpose: Skip re-embedding and re-storing text an agent has already memorized
+-- Date: 2026-10-16
+
+-- sha256 of the memory content (NULL for legacy duplicates left in place)
+ALTER TABLE agent_memories ADD COLUMN IF NOT EXISTS content_hash BYTEA;
+
+-- Backfill the oldest row per (agent, content); later duplicates keep NULL
+-- so the unique index below can be created over existing data
+UPDATE agent_memories m
+SET content_hash = sha256(convert_to(m.content, 'UTF8'))
+FROM (
+    SELECT id, ROW_NUMBER() OVER (
+        PARTITION BY agent_id, sha256(convert_to(content, 'UTF8'))
+        ORDER BY created_at
+    ) AS rn
+    FROM agent_memories
+) ranked
+WHERE m.id = ranked.id AND ranked.rn = 1 AND m.content_hash IS NULL;
+
+-- One memory per agent per content (target of INSERT ... ON CONFLICT in store())
+CREATE UNIQUE INDEX IF NOT EXISTS idx_agent_memories_agent_content_hash
+ON agent_memories(agent_id, content_hash);
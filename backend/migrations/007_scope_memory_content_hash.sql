@@ -0,0 +1,24 @@
+-- Migration 007: Scope memory dedupe to channel and memory type
+-- Purpose: The same text stored in another channel (or as another memory
+-- type) is a separate memory, so channel-filtered retrieval finds it
+-- Date: 2026-10-16
+
+-- content_hash becomes sha256(channel_id || '\n' || memory_type || '\n' || content),
+-- with an empty channel_id for channel-less memories (see
+-- SemanticMemoryManager._content_hash). Re-key from scratch: the oldest row
+-- per (agent, channel, type, content) gets the hash, later duplicates NULL.
+UPDATE agent_memories SET content_hash = NULL WHERE content_hash IS NOT NULL;
+
+UPDATE agent_memories m
+SET content_hash = sha256(convert_to(
+    COALESCE(m.channel_id::text, '') || E'\n' || m.memory_type || E'\n' || m.content,
+    'UTF8'
+))
+FROM (
+    SELECT id, ROW_NUMBER() OVER (
+        PARTITION BY agent_id, channel_id, memory_type, content
+        ORDER BY created_at
+    ) AS rn
+    FROM agent_memories
+) ranked
+WHERE m.id = ranked.id AND ranked.rn = 1;
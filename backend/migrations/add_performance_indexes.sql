@@ -26,8 +26,20 @@ CREATE INDEX IF NOT EXISTS idx_workflow_tasks_status ON workflow_tasks(status);
 CREATE INDEX IF NOT EXISTS idx_workflow_tasks_order ON workflow_tasks(order_index);
 CREATE INDEX IF NOT EXISTS idx_workflow_tasks_workflow_status ON workflow_tasks(workflow_id, status);
 
+-- AgentMemory table indexes
+CREATE INDEX IF NOT EXISTS idx_agent_memories_agent_type ON agent_memories(agent_id, memory_type);
+-- HNSW index for semantic retrieval (no-op where 001_add_semantic_memory already created it)
+CREATE INDEX IF NOT EXISTS idx_agent_memories_embedding ON agent_memories
+USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+-- Memories stored without an embedding, awaiting lazy backfill
+CREATE INDEX IF NOT EXISTS idx_agent_memories_unembedded ON agent_memories(agent_id) WHERE embedding IS NULL;
+-- Age-based cleanup of low-importance memories (cleanup_old_memories default keeps importance >= 7)
+CREATE INDEX IF NOT EXISTS idx_agent_memories_cleanup ON agent_memories(agent_id, created_at) WHERE importance < 7;
+
 -- Analyze tables for query planner optimization
 ANALYZE agents;
 ANALYZE messages;
 ANALYZE workflows;
 ANALYZE workflow_tasks;
+ANALYZE agent_memories;
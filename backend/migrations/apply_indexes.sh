@@ -23,6 +23,7 @@ echo "  - Agent table: 4 indexes (name, type, active, type+active)"
 echo "  - Message table: 4 indexes (channel_id, created_at, author_id, channel+created)"
 echo "  - Workflow table: 4 indexes (status, created_at, channel_id, status+created)"
 echo "  - WorkflowTask table: 4 indexes (workflow_id, status, order_index, workflow+status)"
+echo "  - AgentMemory table: 4 indexes (agent+memory_type, embedding HNSW, unembedded (partial), agent+created_at cleanup (partial))"
 echo ""
 echo "Performance improvement expected:"
 echo "  - Query response time: < 100ms (95th percentile)"
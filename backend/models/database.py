@@ -2,7 +2,7 @@
 SQLAlchemy Database Models
 """
 
-from sqlalchemy import Column, String, Boolean, Text, DateTime, ForeignKey, Integer, JSON, func, Index
+from sqlalchemy import Column, String, Boolean, Text, DateTime, ForeignKey, Integer, JSON, LargeBinary, func, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -136,6 +136,7 @@ class AgentMemory(Base):
     # Content
     content = Column(Text, nullable=False)
     embedding = Column(Vector(768), nullable=True)  # nomic-embed-text (Ollama): 768 dims
+    content_hash = Column(LargeBinary, nullable=True)  # sha256(channel, type, content), dedupes per agent
 
     # Memory classification
     memory_type = Column(String(50), default="conversation")  # conversation, decision, entity, summary, tool_use
@@ -152,6 +153,10 @@ class AgentMemory(Base):
     # Relationships
     agent = relationship("Agent", back_populates="memories")
 
+    __table_args__ = (
+        Index('idx_agent_memories_agent_content_hash', 'agent_id', 'content_hash', unique=True),  # store() dedupe
+    )
+
 
 class Workflow(Base):
     """Workflow model for multi-agent orchestration"""
@@ -140,6 +140,17 @@ async def invoke_agent(
     return response
 
 
+@router.get("/agents/tasks/{message_id}")
+async def get_agent_task(message_id: UUID):
+    """Get the status of the agent work triggered by a message"""
+    from agents.processor import get_agent_task_status
+
+    status = get_agent_task_status(message_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="No agent task found for this message")
+    return status
+
+
 @router.get("/agents/{agent_id}/status")
 async def get_agent_status(agent_id: UUID, db: Session = Depends(get_db)):
     """Get current status of an agent"""
@@ -164,6 +175,8 @@ async def activate_agent(agent_id: UUID, db: Session = Depends(get_db)):
 
     Cache invalidation: Clears agent cache to reflect updated status
     """
+    from agents.processor import invalidate_agent_record
+
     agent = db.query(Agent).filter(Agent.id == agent_id).first()
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
@@ -174,6 +187,7 @@ async def activate_agent(agent_id: UUID, db: Session = Depends(get_db)):
     # Invalidate cache for this agent
     cache.delete("agents", str(agent_id))
     cache.delete("agents", agent.name)
+    invalidate_agent_record(agent.name)
     # Invalidate agent list cache (status changed)
     cache.delete_pattern("agents", "list:*")
 
@@ -187,6 +201,8 @@ async def deactivate_agent(agent_id: UUID, db: Session = Depends(get_db)):
 
     Cache invalidation: Clears agent cache to reflect updated status
     """
+    from agents.processor import invalidate_agent_record
+
     agent = db.query(Agent).filter(Agent.id == agent_id).first()
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
@@ -197,6 +213,7 @@ async def deactivate_agent(agent_id: UUID, db: Session = Depends(get_db)):
     # Invalidate cache for this agent
     cache.delete("agents", str(agent_id))
     cache.delete("agents", agent.name)
+    invalidate_agent_record(agent.name)
     # Invalidate agent list cache (status changed)
     cache.delete_pattern("agents", "list:*")
 
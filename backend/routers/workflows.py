@@ -16,7 +16,7 @@ from models.schemas import (
     WorkflowPlanRequest,
     WorkflowTaskResponse
 )
-from agents.workflow_orchestrator import WorkflowOrchestrator
+from agents.workflow_orchestrator import get_workflow_orchestrator
 from websocket.manager import manager
 
 router = APIRouter()
@@ -56,7 +56,7 @@ async def create_workflow_from_plan_request(
             )
 
         # Create workflow orchestrator
-        orchestrator_service = WorkflowOrchestrator(manager)
+        orchestrator_service = get_workflow_orchestrator(manager)
 
         # Create workflow with plan
         workflow = await orchestrator_service.create_workflow_from_request(
@@ -196,13 +196,13 @@ async def start_workflow(
         )
 
     # Create orchestrator
-    orchestrator_service = WorkflowOrchestrator(manager)
+    orchestrator_service = get_workflow_orchestrator(manager)
 
-    # Execute workflow in background
+    # Execute workflow in background (with its own session - this request's
+    # session is closed once the response is sent)
     background_tasks.add_task(
-        orchestrator_service.execute_workflow,
-        workflow_id,
-        db
+        orchestrator_service.run_workflow,
+        workflow_id
     )
 
     # Invalidate workflow cache (status changing)
@@ -239,7 +239,7 @@ async def cancel_workflow(
         )
 
     # Create orchestrator and cancel
-    orchestrator_service = WorkflowOrchestrator(manager)
+    orchestrator_service = get_workflow_orchestrator(manager)
     await orchestrator_service.cancel_workflow(workflow_id, db)
 
     # Invalidate workflow cache (status changed)
@@ -3,6 +3,8 @@ Workspace API Router
 Endpoints for browsing and accessing workspace files
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any, Optional
 import logging
@@ -137,14 +139,23 @@ async def get_workspace_tree(max_depth: int = 3):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _build_tree(path: str, current_depth: int, max_depth: int) -> Dict[str, Any]:
+async def _build_tree(
+    path: str,
+    current_depth: int,
+    max_depth: int,
+    listing: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Recursively build directory tree
 
+    Subdirectories of each node are listed together through
+    mcp_client.list_directories rather than one round trip at a time.
+
     Args:
         path: Current path
         current_depth: Current recursion depth
         max_depth: Maximum depth to traverse
+        listing: Pre-fetched list_directory result for path, if any
 
     Returns:
         Tree node with children
@@ -157,7 +168,7 @@ async def _build_tree(path: str, current_depth: int, max_depth: int) -> Dict[str
             "truncated": True
         }
 
-    result = await mcp_client.list_directory(path)
+    result = listing if listing is not None else await mcp_client.list_directory(path)
 
     if not result.get("success"):
         return {
@@ -169,20 +180,20 @@ async def _build_tree(path: str, current_depth: int, max_depth: int) -> Dict[str
 
     files = result.get("files", [])
     children = []
+    subdirs = []
 
     for file in files:
         file_path = f"{path}/{file['name']}" if path else file['name']
 
         if file['type'] == 'directory':
-            # Recursively build subtree
-            subtree = await _build_tree(file_path, current_depth + 1, max_depth)
+            subdirs.append((len(children), file_path))
             children.append({
                 "name": file['name'],
                 "path": file_path,
                 "type": "directory",
                 "size": file.get('size', 0),
                 "modified": file.get('modified'),
-                "children": subtree.get("children", [])
+                "children": []
             })
         else:
             children.append({
@@ -193,51 +204,18 @@ async def _build_tree(path: str, current_depth: int, max_depth: int) -> Dict[str
                 "modified": file.get('modified')
             })
 
+    if subdirs and current_depth + 1 < max_depth:
+        # Fetch every subdirectory listing for this level in one batch
+        listings = await mcp_client.list_directories([p for _, p in subdirs])
+        subtrees = await asyncio.gather(*(
+            _build_tree(p, current_depth + 1, max_depth, sub_listing)
+            for (_, p), sub_listing in zip(subdirs, listings)
+        ))
+        for (index, _), subtree in zip(subdirs, subtrees):
+            children[index]["children"] = subtree.get("children", [])
+
     return {
         "path": path or "/",
         "type": "directory",
         "children": children
     }
-
-
-@router.get("/exists")
-async def check_file_exists(path: str):
-    """
-    Check if a file or directory exists
-
-    Args:
-        path: Relative path to check
-
-    Returns:
-        Existence status and type
-    """
-    if not path:
-        raise HTTPException(status_code=400, detail="Path parameter required")
-
-    try:
-        result = await mcp_client.file_exists(path)
-
-        if not result.get("success"):
-            raise HTTPException(
-                status_code=500,
-                detail=result.get("error", "Failed to check file")
-            )
-
-        return {
-            "path": path,
-            "exists": result.get("exists", False),
-            "type": result.get("type") if result.get("exists") else None
-        }
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error checking file existence {path}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.on_event("shutdown")
-async def shutdown_workspace_client():
-    """Clean up MCP client on shutdown"""
-    await mcp_client.close()
-    logger.info("Workspace MCP client closed")
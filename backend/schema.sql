@@ -81,7 +81,7 @@ CREATE INDEX idx_messages_author ON messages(author_id, author_type);
 CREATE INDEX idx_tasks_status ON tasks(status, created_at DESC);
 CREATE INDEX idx_tasks_assigned ON tasks(assigned_to) WHERE assigned_to IS NOT NULL;
 CREATE INDEX idx_agent_memories_agent ON agent_memories(agent_id);
-CREATE INDEX idx_agent_memories_embedding ON agent_memories USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+CREATE INDEX idx_agent_memories_embedding ON agent_memories USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
 
 -- Trigger to update updated_at timestamps
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -0,0 +1,66 @@
+"""
+Tests for BaseAgent tool execution
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agents.base import BaseAgent
+
+
+class _ToolAgent(BaseAgent):
+    def get_tools(self):
+        return []
+
+
+def _agent_with_mcp(mcp_fs) -> BaseAgent:
+    """A BaseAgent wired to a fake MCP client, skipping LLM setup"""
+    agent = _ToolAgent.__new__(_ToolAgent)
+    agent.mcp_fs = mcp_fs
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_execute_tools_batches_consecutive_reads():
+    """Consecutive read_file calls go through read_files; writes stay in order"""
+    mcp_fs = MagicMock()
+    mcp_fs.read_files = AsyncMock(return_value=[
+        {"success": True, "content": "a"},
+        {"success": True, "content": "b"},
+    ])
+    mcp_fs.write_file = AsyncMock(return_value={"success": True})
+    mcp_fs.read_file = AsyncMock(return_value={"success": True, "content": "c"})
+    agent = _agent_with_mcp(mcp_fs)
+
+    results = await agent.execute_tools([
+        {"name": "read_file", "input": {"path": "a.py"}},
+        {"name": "read_file", "input": {"path": "b.py"}},
+        {"name": "write_file", "input": {"path": "c.py", "content": "c"}},
+        {"name": "read_file", "input": {"path": "c.py"}},
+    ])
+
+    mcp_fs.read_files.assert_awaited_once_with(["a.py", "b.py"])
+    mcp_fs.write_file.assert_awaited_once_with("c.py", "c")
+    mcp_fs.read_file.assert_awaited_once_with("c.py")
+    assert [r["tool"] for r in results] == ["read_file", "read_file", "write_file", "read_file"]
+    assert [r["result"].get("content") for r in results] == ["a", "b", None, "c"]
+
+
+@pytest.mark.asyncio
+async def test_execute_tools_batch_failure_reports_each_call():
+    """A failed batch yields one error result per call"""
+    mcp_fs = MagicMock()
+    mcp_fs.list_directories = AsyncMock(side_effect=RuntimeError("server down"))
+    agent = _agent_with_mcp(mcp_fs)
+
+    results = await agent.execute_tools([
+        {"name": "list_directory", "input": {}},
+        {"name": "list_directory", "input": {"path": "src"}},
+    ])
+
+    mcp_fs.list_directories.assert_awaited_once_with(["", "src"])
+    assert [r["result"] for r in results] == [
+        {"success": False, "error": "server down"},
+        {"success": False, "error": "server down"},
+    ]
@@ -14,6 +14,7 @@ from core.error_handling import (
     LLMAuthenticationError,
     LLMRateLimitError,
     classify_error,
+    parse_retry_after,
     format_user_friendly_error,
     structured_log_error,
     retry_with_exponential_backoff,
@@ -204,6 +205,45 @@ async def test_exponential_backoff_timing():
     assert 0.18 < delay2 < 0.50  # ~0.2-0.4s with tolerance for timing variance
 
 
+@pytest.mark.asyncio
+async def test_retry_honors_retry_after():
+    """Test that a provider Retry-After overrides the backoff schedule"""
+    import time
+    attempt_times = []
+
+    @retry_with_exponential_backoff(max_attempts=2, initial_delay=5.0)
+    async def rate_limited():
+        attempt_times.append(time.time())
+        raise LLMRateLimitError("Slow down", provider="test", retry_after=0.05)
+
+    with pytest.raises(LLMRateLimitError):
+        await rate_limited()
+
+    assert len(attempt_times) == 2
+    assert attempt_times[1] - attempt_times[0] < 1.0  # Used Retry-After, not 5s backoff
+
+
+def test_parse_retry_after_header():
+    """Test Retry-After extraction from SDK/httpx style exceptions"""
+    error = Exception("429 Too Many Requests")
+    error.response = Mock(headers={"retry-after": "7"})
+    assert parse_retry_after(error) == 7.0
+
+    error.response = Mock(headers={})
+    assert parse_retry_after(error) is None
+    assert parse_retry_after(Exception("no response")) is None
+
+
+def test_classify_rate_limit_error_keeps_retry_after():
+    """Test that classified rate limit errors carry the Retry-After delay"""
+    error = Exception("429 Too Many Requests: rate_limit_exceeded")
+    error.response = Mock(headers={"retry-after": "3"})
+    classified = classify_error(error, "anthropic")
+
+    assert isinstance(classified, LLMRateLimitError)
+    assert classified.retry_after == 3.0
+
+
 # ============================================
 # Provider Fallback Tests
 # ============================================
@@ -274,6 +314,29 @@ def test_structured_log_error_includes_context(caplog):
     assert any("anthropic" in record.message for record in caplog.records)
 
 
+def test_structured_log_error_samples_repeats(caplog):
+    """Test that identical errors within the sample window are logged once"""
+    error = LLMAPIError("Repeated error", provider="ollama", model="sampled-model")
+
+    for _ in range(3):
+        structured_log_error(error, {"provider": "ollama", "model": "sampled-model"})
+
+    records = [r for r in caplog.records if "sampled-model" in r.getMessage()]
+    assert len(records) == 1
+
+
+def test_structured_log_error_logs_distinct_messages(caplog):
+    """Test that different errors of the same type are not sampled together"""
+    for message in ("Connection refused", "Invalid response body"):
+        structured_log_error(
+            LLMAPIError(message, provider="ollama", model="distinct-model"),
+            {"provider": "ollama", "model": "distinct-model"}
+        )
+
+    records = [r for r in caplog.records if "distinct-model" in r.getMessage()]
+    assert len(records) == 2
+
+
 def test_structured_log_includes_error_metadata():
     """Test that LLMError metadata is logged"""
     error = LLMQuotaError("Quota exceeded", provider="openai", model="gpt-4")
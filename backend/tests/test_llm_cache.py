@@ -0,0 +1,243 @@
+"""
+Tests for the semantic LLM response cache
+Uses a deterministic bag-of-words encoder instead of a sentence-transformers model
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agents.llm_cache import LLMResponseCache, SemanticLLMCache, SingleFlight
+
+
+VOCABULARY = ["summarize", "summary", "give", "me", "a", "of", "the", "report", "weather", "today"]
+
+
+def bag_of_words(text: str):
+    """Toy encoder: word counts over a fixed vocabulary"""
+    words = text.lower().split()
+    return [float(words.count(term)) for term in VOCABULARY]
+
+
+@pytest.fixture
+def semantic_cache():
+    return SemanticLLMCache(threshold=0.9, max_entries=4, encoder=bag_of_words)
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_hit_for_identical_prompt(semantic_cache):
+    """Test that an identical prompt returns the stored response"""
+    embedding = await semantic_cache.embed("system", "summarize the report")
+    semantic_cache.store("anthropic", "claude", 4000, 0.7, embedding, ("Short summary", None))
+
+    repeat = await semantic_cache.embed("system", "summarize the report")
+    assert semantic_cache.lookup("anthropic", "claude", 4000, 0.7, repeat) == ("Short summary", None)
+    assert semantic_cache.metrics["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_miss_below_threshold(semantic_cache):
+    """Test that unrelated prompts do not hit"""
+    embedding = await semantic_cache.embed("system", "summarize the report")
+    semantic_cache.store("anthropic", "claude", 4000, 0.7, embedding, ("Short summary", None))
+
+    other = await semantic_cache.embed("system", "weather today")
+    assert semantic_cache.lookup("anthropic", "claude", 4000, 0.7, other) is None
+    assert semantic_cache.metrics["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_is_scoped_per_model(semantic_cache):
+    """Test that responses are never shared across provider/model"""
+    embedding = await semantic_cache.embed("system", "summarize the report")
+    semantic_cache.store("anthropic", "claude", 4000, 0.7, embedding, ("Short summary", None))
+
+    assert semantic_cache.lookup("openai", "gpt-4", 4000, 0.7, embedding) is None
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_is_scoped_per_generation_settings(semantic_cache):
+    """Test that responses are not shared across max_tokens or temperature"""
+    embedding = await semantic_cache.embed("system", "summarize the report")
+    semantic_cache.store("anthropic", "claude", 256, 0.7, embedding, ("Short summary", None))
+
+    assert semantic_cache.lookup("anthropic", "claude", 4000, 0.7, embedding) is None
+    assert semantic_cache.lookup("anthropic", "claude", 256, 0.2, embedding) is None
+    assert semantic_cache.lookup("anthropic", "claude", 256, 0.71, embedding) == ("Short summary", None)
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_loads_model_off_the_event_loop(monkeypatch):
+    """Test that the embedding model is built once, in a worker thread"""
+    import asyncio
+    import threading
+
+    loads = []
+
+    def load_encoder(self):
+        loads.append(threading.current_thread())
+        return bag_of_words
+
+    monkeypatch.setattr(SemanticLLMCache, "_load_encoder", load_encoder)
+    cache = SemanticLLMCache(threshold=0.9, max_entries=4)
+
+    await asyncio.gather(*(cache.embed(None, "weather today") for _ in range(3)))
+
+    assert len(loads) == 1
+    assert loads[0] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_evicts_oldest_entry(semantic_cache):
+    """Test that the index is bounded and overwrites the oldest entry"""
+    prompts = ["summarize the report", "weather today", "give me a summary", "the weather", "report of today"]
+    for prompt in prompts:
+        embedding = await semantic_cache.embed(None, prompt)
+        semantic_cache.store("ollama", "llama2", 4000, 0.7, embedding, (prompt, None))
+
+    assert semantic_cache.get_metrics()["entries"] == 4
+
+    first = await semantic_cache.embed(None, prompts[0])
+    assert semantic_cache.lookup("ollama", "llama2", 4000, 0.7, first) is None
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_normalizes_stored_vectors(semantic_cache):
+    """Test that raw (unnormalized) vectors are normalized on insert"""
+    raw = np.array(bag_of_words("summarize the report"), dtype=np.float32) * 7
+    semantic_cache.store("anthropic", "claude", 4000, 0.7, raw, ("Short summary", None))
+
+    query = await semantic_cache.embed(None, "summarize the report")
+    assert semantic_cache.lookup("anthropic", "claude", 4000, 0.7, query) == ("Short summary", None)
+
+
+# ============================================
+# Exact Response Cache Tests
+# ============================================
+
+def test_response_cache_key_is_stable():
+    """Test that identical requests produce the same key and others differ"""
+    key = LLMResponseCache.make_key("anthropic", "claude", "system", "prompt", 0, 4000)
+
+    assert key == LLMResponseCache.make_key("anthropic", "claude", "system", "prompt", 0, 4000)
+    assert key != LLMResponseCache.make_key("anthropic", "claude", "system", "prompt", 0, 100)
+    assert key != LLMResponseCache.make_key("openai", "claude", "system", "prompt", 0, 4000)
+
+
+def test_response_cache_evicts_least_recently_used():
+    """Test that the LRU keeps recently read entries"""
+    response_cache = LLMResponseCache(maxsize=2, ttl=60, use_redis=False)
+    response_cache.set("a", ("A", None))
+    response_cache.set("b", ("B", None))
+
+    assert response_cache.get("a") == ("A", None)  # "b" is now least recently used
+    response_cache.set("c", ("C", None))
+
+    assert response_cache.get("b") is None
+    assert response_cache.get("a") == ("A", None)
+    assert response_cache.get("c") == ("C", None)
+
+
+def test_response_cache_expires_entries(monkeypatch):
+    """Test that entries are dropped after the TTL"""
+    import agents.llm_cache as llm_cache
+
+    now = 1000.0
+    monkeypatch.setattr(llm_cache.time, "monotonic", lambda: now)
+    response_cache = LLMResponseCache(maxsize=2, ttl=60, use_redis=False)
+    response_cache.set("a", ("A", None))
+
+    now = 1061.0
+    assert response_cache.get("a") is None
+    assert response_cache.get_metrics()["entries"] == 0
+
+
+# ============================================
+# Request Coalescing Tests
+# ============================================
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """Test that identical concurrent requests share one call"""
+    import asyncio
+    single_flight = SingleFlight()
+    call_count = 0
+
+    async def slow_call():
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.01)
+        return ("response", None)
+
+    results = await asyncio.gather(*(single_flight.run("key", slow_call) for _ in range(5)))
+
+    assert call_count == 1
+    assert all(result == ("response", None) for result in results)
+    assert single_flight.get_metrics() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exceptions():
+    """Test that followers see the leader's failure and the key is released"""
+    import asyncio
+    single_flight = SingleFlight()
+
+    async def failing_call():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    results = await asyncio.gather(
+        single_flight.run("key", failing_call),
+        single_flight.run("key", failing_call),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert single_flight.get_metrics()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_follower_survives_leader_cancellation():
+    """Test that cancelling the leader makes a waiting follower run the call"""
+    import asyncio
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def slow_call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return ("response", None)
+
+    leader = asyncio.create_task(single_flight.run("key", slow_call))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(single_flight.run("key", slow_call))
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+
+    assert await follower == ("response", None)
+    assert leader.cancelled()
+    assert calls == 2
+    assert single_flight.get_metrics()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled_follower_still_raises():
+    """Test that cancelling a follower cancels only that follower"""
+    import asyncio
+    single_flight = SingleFlight()
+
+    async def slow_call():
+        await asyncio.sleep(0.05)
+        return ("response", None)
+
+    leader = asyncio.create_task(single_flight.run("key", slow_call))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(single_flight.run("key", slow_call))
+    await asyncio.sleep(0.01)
+
+    follower.cancel()
+
+    assert await leader == ("response", None)
+    assert follower.cancelled()
@@ -0,0 +1,98 @@
+"""
+Tests for agent message processing helpers
+"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from agents import processor
+from agents.processor import _load_message_context, get_agent_records
+from models.database import Agent
+
+
+def _session_bound_agent(session: Session, name: str) -> Agent:
+    """An Agent row attached to session, as a query would return it"""
+    agent = Agent(
+        id=uuid.uuid4(),
+        name=name,
+        agent_type="backend",
+        persona={"role": "Backend"},
+        config={},
+        is_active=True
+    )
+    make_transient_to_detached(agent)
+    session.add(agent)
+    return agent
+
+
+def test_load_message_context_records_survive_session_close():
+    """On a Redis miss, records stay readable after commit and close"""
+    session = Session()
+    db = MagicMock()
+    db.query.return_value.filter.return_value.all.return_value = [
+        _session_bound_agent(session, "@backend")
+    ]
+    db.execute.return_value.all.return_value = []
+
+    with patch("agents.processor.cache") as cache:
+        cache.mget.return_value = {}
+        _, records = _load_message_context(
+            db, uuid.uuid4(), "hello", ["backend"], 0, frozenset()
+        )
+
+    # What the memory preload's commit and process_agent_message's close do
+    session.expire_all()
+    session.close()
+
+    record = records["@backend"]
+    assert record.name == "@backend"
+    assert record.agent_type == "backend"
+    assert record.id is not None
+
+
+def test_get_agent_records_returns_transient_records_on_miss():
+    """Redis misses return the same session-independent type as hits"""
+    session = Session()
+    row = _session_bound_agent(session, "@frontend")
+    db = MagicMock()
+    db.query.return_value.filter.return_value.all.return_value = [row]
+
+    with patch("agents.processor.cache") as cache:
+        cache.mget.return_value = {}
+        records = get_agent_records(["@frontend"], db)
+
+    record = records["@frontend"]
+    assert record is not row
+    assert inspect(record).transient
+    assert record.id == row.id
+    assert record.persona == {"role": "Backend"}
+
+
+@pytest.mark.asyncio
+async def test_memory_preload_skips_agents_that_will_not_use_it():
+    """Workflow-bound orchestrators and busy agents get no memory lookup"""
+    orchestrator = Agent(id=uuid.uuid4(), name="@orchestrator", agent_type="orchestrator", is_active=True)
+    busy = Agent(id=uuid.uuid4(), name="@backend", agent_type="backend", is_active=True)
+    idle = Agent(id=uuid.uuid4(), name="@frontend", agent_type="frontend", is_active=True)
+    records = {agent.name: agent for agent in (orchestrator, busy, idle)}
+    preload = AsyncMock(return_value={})
+
+    with patch.object(processor, "SessionLocal"), \
+            patch.object(processor, "_load_message_context", return_value=({}, records)), \
+            patch.object(processor, "_preload_memory_context", preload), \
+            patch.object(processor, "_process_single_agent", AsyncMock()), \
+            patch.object(processor, "_claimed_agents", {busy.id}):
+        await processor.process_agent_message(
+            uuid.uuid4(),
+            "build and implement a complete login page with tests",
+            uuid.uuid4(),
+            ["orchestrator", "backend", "frontend"],
+            MagicMock()
+        )
+
+    assert preload.call_args.args[0] == [idle]
@@ -6,6 +6,41 @@ Handles markdown stripping and @mention extraction
 import re
 from typing import List, Tuple
 
+# Markdown patterns, applied in this order by strip_markdown()
+_CODE_BLOCK_RE = re.compile(r'```[\s\S]*?```')
+_INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\([^\)]+\)')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+_BOLD_STAR_RE = re.compile(r'\*\*(.+?)\*\*')
+_BOLD_UNDERSCORE_RE = re.compile(r'__(.+?)__')
+_STRIKETHROUGH_RE = re.compile(r'~~(.+?)~~')
+_ITALIC_STAR_RE = re.compile(r'(?<!@)\*(?!\*)(.+?)\*')
+_ITALIC_UNDERSCORE_RE = re.compile(r'(?<!@)_(?!_)(.+?)_')
+_HEADER_RE = re.compile(r'^#{1,6}\s+', re.MULTILINE)
+_BLOCKQUOTE_RE = re.compile(r'^>\s*', re.MULTILINE)
+_HORIZONTAL_RULE_RE = re.compile(r'^[-*_]{3,}\s*$', re.MULTILINE)
+_BULLET_RE = re.compile(r'^\s*[-*+]\s+', re.MULTILINE)
+_NUMBERED_RE = re.compile(r'^\s*\d+\.\s+', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# @mention: not preceded by alphanumerics and not followed by "." (emails)
+_MENTION_RE = re.compile(r'(?<![a-zA-Z0-9])@(\w+)(?![.])')
+_KNOWN_AGENTS = frozenset({'backend', 'frontend', 'qa', 'devops', 'orchestrator'})
+
+# "Task N: @agent" in workflow plans
+_TASK_LINE_RE = re.compile(r'Task\s+\d+:\s*@(\w+)', re.IGNORECASE)
+
+# Task completion phrases (lowercase), as one alternation
+_TASK_COMPLETE_RE = re.compile(
+    r'\btask\s+complete\b'
+    r'|\btask\s+completed\b'
+    r'|\bwork\s+complete\b'
+    r'|\bwork\s+finished\b'
+    r'|\bfinished\s+task\b'
+    r'|\bdone\s+with\s+task\b'
+    r'|\btask\s+is\s+done\b'
+)
+
 
 def strip_markdown(text: str) -> str:
     """
@@ -41,44 +76,44 @@ def strip_markdown(text: str) -> str:
         return text
 
     # Remove code blocks (```code```) - do this first to avoid processing code as markdown
-    text = re.sub(r'```[\s\S]*?```', lambda m: m.group(0).replace('```', ''), text)
+    text = _CODE_BLOCK_RE.sub(lambda m: m.group(0).replace('```', ''), text)
 
     # Remove inline code (`code`)
-    text = re.sub(r'`([^`]+)`', r'\1', text)
+    text = _INLINE_CODE_RE.sub(r'\1', text)
 
     # Remove images: ![alt](url) → alt
-    text = re.sub(r'!\[([^\]]*)\]\([^\)]+\)', r'\1', text)
+    text = _IMAGE_RE.sub(r'\1', text)
 
     # Remove links: [text](url) → text
-    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
+    text = _LINK_RE.sub(r'\1', text)
 
     # Remove bold: **text** or __text__
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-    text = re.sub(r'__(.+?)__', r'\1', text)
+    text = _BOLD_STAR_RE.sub(r'\1', text)
+    text = _BOLD_UNDERSCORE_RE.sub(r'\1', text)
 
     # Remove strikethrough: ~~text~~
-    text = re.sub(r'~~(.+?)~~', r'\1', text)
+    text = _STRIKETHROUGH_RE.sub(r'\1', text)
 
     # Remove italic: *text* or _text_ (but preserve @mentions)
     # Use negative lookbehind to avoid matching @mentions
-    text = re.sub(r'(?<!@)\*(?!\*)(.+?)\*', r'\1', text)
-    text = re.sub(r'(?<!@)_(?!_)(.+?)_', r'\1', text)
+    text = _ITALIC_STAR_RE.sub(r'\1', text)
+    text = _ITALIC_UNDERSCORE_RE.sub(r'\1', text)
 
     # Remove headers: # Header, ## Header, etc.
-    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
+    text = _HEADER_RE.sub('', text)
 
     # Remove blockquotes: > text
-    text = re.sub(r'^>\s*', '', text, flags=re.MULTILINE)
+    text = _BLOCKQUOTE_RE.sub('', text)
 
     # Remove horizontal rules: ---, ***, ___
-    text = re.sub(r'^[-*_]{3,}\s*$', '', text, flags=re.MULTILINE)
+    text = _HORIZONTAL_RULE_RE.sub('', text)
 
     # Remove list markers: -, *, 1., 2., etc.
-    text = re.sub(r'^\s*[-*+]\s+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'^\s*\d+\.\s+', '', text, flags=re.MULTILINE)
+    text = _BULLET_RE.sub('', text)
+    text = _NUMBERED_RE.sub('', text)
 
     # Clean up multiple newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
 
     return text.strip()
 
@@ -110,35 +145,15 @@ def extract_mentions(text: str, strip_md: bool = True) -> List[Tuple[str, str]]:
     if strip_md:
         text = strip_markdown(text)
 
-    # Pattern to match @mentions
-    # Must be:
-    # - Start with @
-    # - Followed by one or more word characters (letters, numbers, underscore)
-    # - Not part of an email address (not preceded by alphanumeric or followed by .)
-    # - Common agent names: backend, frontend, qa, devops, orchestrator
-
-    # Use word boundary before @ to avoid matching emails
-    pattern = r'(?<![a-zA-Z0-9])@(\w+)(?![.])'
-
-    matches = re.findall(pattern, text)
+    # Only names that look like agents (all lowercase or known agents),
+    # deduplicated in order of first mention
+    names = dict.fromkeys(
+        match for match in _MENTION_RE.findall(text)
+        if match.islower() or match.lower() in _KNOWN_AGENTS
+    )
 
     # Return list of tuples: (with @, without @)
-    # Filter out common non-agent mentions like email addresses
-    valid_mentions = []
-    for match in matches:
-        # Only include if it looks like an agent name (all lowercase or known agents)
-        if match.lower() in ['backend', 'frontend', 'qa', 'devops', 'orchestrator'] or match.islower():
-            valid_mentions.append((f'@{match}', match))
-
-    # Remove duplicates while preserving order
-    seen = set()
-    result = []
-    for mention in valid_mentions:
-        if mention[1] not in seen:
-            seen.add(mention[1])
-            result.append(mention)
-
-    return result
+    return [(f'@{name}', name) for name in names]
 
 
 def extract_agent_names_from_task_line(line: str) -> List[str]:
@@ -163,8 +178,7 @@ def extract_agent_names_from_task_line(line: str) -> List[str]:
     clean_line = strip_markdown(line)
 
     # Look for pattern: Task N: @agent
-    pattern = r'Task\s+\d+:\s*@(\w+)'
-    match = re.search(pattern, clean_line, re.IGNORECASE)
+    match = _TASK_LINE_RE.search(clean_line)
 
     if match:
         return [match.group(1).lower()]
@@ -196,22 +210,5 @@ def is_task_complete_signal(text: str) -> bool:
     if not text:
         return False
 
-    # Convert to lowercase for case-insensitive matching
-    text_lower = text.lower()
-
-    # Completion patterns
-    patterns = [
-        r'\btask\s+complete\b',
-        r'\btask\s+completed\b',
-        r'\bwork\s+complete\b',
-        r'\bwork\s+finished\b',
-        r'\bfinished\s+task\b',
-        r'\bdone\s+with\s+task\b',
-        r'\btask\s+is\s+done\b',
-    ]
-
-    for pattern in patterns:
-        if re.search(pattern, text_lower):
-            return True
-
-    return False
+    # Match against lowercased text (patterns are lowercase)
+    return _TASK_COMPLETE_RE.search(text.lower()) is not None
@@ -8,6 +8,11 @@ WebSocket Events:
 - message_stream: Streaming chunk from agent (real-time LLM response)
 - message_update: Final message content update after streaming completes
 - agent_status: Agent status change (thinking, online, error)
+- message_batch: Several of the above coalesced into one frame ({'e': event, 'd': data} list)
+
+Channel-scoped events (message_*, agent_typing) go only to the clients viewing
+that channel: clients send channel_join with the channel they have open. Until
+then they are in the all-channels room and receive every channel's events.
 - error: Error occurred during processing
 - user_typing: User is typing
 - pong: Response to ping keepalive
@@ -31,12 +36,44 @@ from datetime import datetime
 from collections import deque
 import asyncio
 
+from core import json_codec
+
+
+class _PacketJSON:
+    """
+    json-module stand-in for Socket.IO/Engine.IO packet encoding
+
+    Encodes with orjson (via core.json_codec) when installed, falling back
+    to the stdlib for anything orjson rejects (e.g. non-string dict keys).
+    """
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        try:
+            return json_codec.dumps(obj).decode('utf-8')
+        except TypeError:
+            return json.dumps(obj, default=json_codec.default, **kwargs)
+
+    @staticmethod
+    def loads(data: Any, **kwargs) -> Any:
+        return json_codec.loads(data)
+
+
+def _encode(data: Any) -> bytes:
+    """Compact UTF-8 JSON for payload size accounting and compression"""
+    try:
+        return json_codec.dumps(data)
+    except TypeError:
+        return json.dumps(data, separators=(',', ':'), default=json_codec.default).encode('utf-8')
+
+
 # Create Socket.IO server
 sio = socketio.AsyncServer(
     async_mode='asgi',
     cors_allowed_origins='*',  # For local development
     logger=True,
     engineio_logger=False,
+    json=_PacketJSON,  # Each emitted packet is encoded once, with orjson
     # Enable compression at Socket.IO level for additional savings
     compression_threshold=1024  # Compress messages > 1KB
 )
@@ -54,6 +91,14 @@ BATCH_INTERVAL_MS = 50  # Batch messages over 50ms window
 BATCH_MAX_SIZE = 10  # Max messages per batch
 COMPRESSION_THRESHOLD = 10 * 1024  # 10KB
 
+# Clients that haven't joined a channel get every channel's events
+ALL_CHANNELS_ROOM = 'channels:all'
+
+
+def channel_room(channel_id: Any) -> str:
+    """Socket.IO room of the clients viewing a channel"""
+    return f"channel:{channel_id}"
+
 
 class PayloadOptimizer:
     """
@@ -139,8 +184,7 @@ class PayloadOptimizer:
             Tuple of (optimized_data, original_size, optimized_size)
         """
         # Step 0: Calculate original size (before optimization)
-        original_json = json.dumps(data, separators=(',', ':'))
-        original_size = len(original_json.encode('utf-8'))
+        original_size = len(_encode(data))
 
         # Step 1: Abbreviate field names
         optimized = cls._abbreviate_fields(data)
@@ -148,13 +192,13 @@ class PayloadOptimizer:
         # Step 2: Convert ISO timestamps to Unix timestamps
         optimized = cls._convert_timestamps(optimized)
 
-        # Step 3: Serialize optimized payload to JSON
-        optimized_json = json.dumps(optimized, separators=(',', ':'))  # No spaces
-        optimized_size = len(optimized_json.encode('utf-8'))
+        # Step 3: Serialize optimized payload to JSON (bytes, no spaces)
+        optimized_json = _encode(optimized)
+        optimized_size = len(optimized_json)
 
         # Step 4: Compress if needed
         if compress or optimized_size > COMPRESSION_THRESHOLD:
-            compressed = gzip.compress(optimized_json.encode('utf-8'), compresslevel=6)
+            compressed = gzip.compress(optimized_json, compresslevel=6)
             compressed_size = len(compressed)
 
             # Only use compression if it actually reduces size
@@ -181,12 +225,14 @@ class PayloadOptimizer:
 
     @classmethod
     def _convert_timestamps(cls, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert ISO timestamp strings to Unix timestamps (integers)"""
+        """Convert datetimes / ISO timestamp strings to Unix timestamps (integers)"""
         if isinstance(data, dict):
             result = {}
             for key, value in data.items():
                 # Check if this looks like a timestamp field
-                if key in ('ts', 'uts') and isinstance(value, str):
+                if key in ('ts', 'uts') and isinstance(value, datetime):
+                    result[key] = int(value.timestamp() * 1000)  # Milliseconds
+                elif key in ('ts', 'uts') and isinstance(value, str):
                     try:
                         # Parse ISO format and convert to Unix timestamp
                         dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
@@ -288,7 +334,14 @@ class ConnectionManager:
             connected_clients.discard(sid)
             logger.info(f"Client disconnected: {sid} (User: {user_id})")
 
-    async def broadcast(self, event: str, data: Dict, optimize: bool = True, batch: bool = False):
+    async def broadcast(
+        self,
+        event: str,
+        data: Dict,
+        optimize: bool = True,
+        batch: bool = False,
+        channel_id: Optional[Any] = None
+    ):
         """
         Broadcast message to all connected clients with optional optimization.
 
@@ -297,6 +350,8 @@ class ConnectionManager:
             data: Event payload
             optimize: Whether to optimize payload (default True)
             batch: Whether to batch this message (default False for important events)
+            channel_id: Only send to clients viewing this channel (plus clients
+                that haven't joined one). Channel events are never batched.
         """
         # Track statistics
         self.stats['total_messages'] += 1
@@ -324,19 +379,71 @@ class ConnectionManager:
 
             data = optimized_data
         else:
-            original_size = len(json.dumps(data).encode('utf-8'))
+            original_size = len(_encode(data))
             optimized_size = original_size
             self.stats['total_bytes_original'] += original_size
             self.stats['total_bytes_optimized'] += optimized_size
 
         # Batch small, non-critical messages
-        if batch and optimized_size < 2048:  # Batch messages < 2KB
+        if batch and channel_id is None and optimized_size < 2048:  # Batch messages < 2KB
             await self.batcher.add_message(event, data, namespace='/')
             await self.batcher.add_message(event, data, namespace='/ws')
         else:
             # Send immediately for large or critical messages
-            await sio.emit(event, data, namespace='/')
-            await sio.emit(event, data, namespace='/ws')
+            rooms = self._rooms(channel_id)
+            await sio.emit(event, data, room=rooms, namespace='/')
+            await sio.emit(event, data, room=rooms, namespace='/ws')
+
+    @staticmethod
+    def _rooms(channel_id: Optional[Any]) -> Optional[List[str]]:
+        """Rooms for a channel-scoped event (None = every client)"""
+        if channel_id is None:
+            return None
+        return [channel_room(channel_id), ALL_CHANNELS_ROOM]
+
+    async def broadcast_batch(
+        self,
+        events: List[tuple[str, Dict]],
+        optimize: bool = True,
+        channel_id: Optional[Any] = None
+    ):
+        """
+        Broadcast several events to all clients as one frame.
+
+        Uses the same message_batch envelope as MessageBatcher, so each client
+        receives one frame instead of one per event. A single event is sent
+        as-is.
+
+        Args:
+            events: (event, data) pairs, in delivery order
+            optimize: Whether to optimize payloads (default True)
+            channel_id: Only send to clients viewing this channel (see broadcast)
+        """
+        if len(events) == 1:
+            event, data = events[0]
+            await self.broadcast(event, data, optimize=optimize, channel_id=channel_id)
+            return
+
+        messages = []
+        for event, data in events:
+            self.stats['total_messages'] += 1
+
+            if optimize:
+                data, original_size, optimized_size = self.optimizer.optimize(data)
+                if isinstance(data, bytes):
+                    self.stats['compressed_messages'] += 1
+                    event = f"{event}:gz"
+            else:
+                original_size = optimized_size = len(_encode(data))
+
+            self.stats['total_bytes_original'] += original_size
+            self.stats['total_bytes_optimized'] += optimized_size
+            messages.append({'e': event, 'd': data})
+
+        batch_data = {'batch': True, 'messages': messages}
+        rooms = self._rooms(channel_id)
+        await sio.emit('message_batch', batch_data, room=rooms, namespace='/')
+        await sio.emit('message_batch', batch_data, room=rooms, namespace='/ws')
 
     async def send_to_user(self, user_id: str, event: str, data: Dict, optimize: bool = True):
         """Send message to specific user"""
@@ -379,6 +486,7 @@ async def connect(sid, environ):
     """Handle client connection"""
     logger.info(f"New connection: {sid}")
     await manager.connect(sid)
+    await _join_channel(sid, None, namespace='/')
 
     # Send welcome message (optimized)
     await sio.emit('connection_established', {
@@ -410,6 +518,7 @@ async def _handle_message_send(sid, data, namespace='/'):
     }
     """
     try:
+        from sqlalchemy import insert
         from core.database import SessionLocal
         from models.database import Message, Channel
         from models.schemas import WSMessageType
@@ -418,29 +527,31 @@ async def _handle_message_send(sid, data, namespace='/'):
 
         logger.info(f"Message received from {sid}: {data}")
 
-        # Create message in database
+        # Create message in database (RETURNING brings back id/created_at
+        # in the INSERT itself - no refresh SELECT)
         db = SessionLocal()
         try:
-            message = Message(
-                channel_id=UUID(data['channel_id']),
-                author_id=None,  # No auth for local MVP
-                author_type='user',
-                author_name=data.get('author_name', 'Developer'),
-                content=data['content'],
-                msg_metadata={}
-            )
-            db.add(message)
+            message = db.execute(
+                insert(Message).values(
+                    channel_id=UUID(data['channel_id']),
+                    author_id=None,  # No auth for local MVP
+                    author_type='user',
+                    author_name=data.get('author_name', 'Developer'),
+                    content=data['content'],
+                    msg_metadata={}
+                ).returning(Message)
+            ).scalar_one()
             db.commit()
-            db.refresh(message)
 
-            # Broadcast new message to all clients (optimized payload)
+            # Broadcast new message to all clients (optimized payload;
+            # UUIDs and datetimes are encoded natively)
             message_data = {
-                'id': str(message.id),
-                'channel_id': str(message.channel_id),
+                'id': message.id,
+                'channel_id': message.channel_id,
                 'author_type': message.author_type,
                 'author_name': message.author_name,
                 'content': message.content,
-                'created_at': message.created_at.isoformat(),
+                'created_at': message.created_at,
                 'metadata': message.msg_metadata
             }
 
@@ -478,19 +589,19 @@ async def _handle_message_send(sid, data, namespace='/'):
 
             # Process agent responses asynchronously
             if mentioned_agents:
-                from agents.processor import process_agent_message
-                import asyncio
-
-                # Run agent processing in background
-                asyncio.create_task(
-                    process_agent_message(
-                        message_id=message.id,
-                        content=data['content'],
-                        channel_id=message.channel_id,
-                        mentioned_agents=mentioned_agents,
-                        manager=manager
-                    )
-                )
+                from agents.processor import dispatch_agent_message
+
+                # Queue agent processing for the worker pool (status in Redis)
+                if not dispatch_agent_message(
+                    message_id=message.id,
+                    content=data['content'],
+                    channel_id=message.channel_id,
+                    mentioned_agents=mentioned_agents,
+                    manager=manager
+                ):
+                    await sio.emit('error', {
+                        'message': 'Agents are overloaded right now. Please try again in a moment.'
+                    }, room=sid, namespace=namespace)
 
         finally:
             db.close()
@@ -554,6 +665,28 @@ async def agent_invoke(sid, data):
         }, room=sid)
 
 
+async def _join_channel(sid: str, channel_id: Optional[str], namespace: str):
+    """Move a client to a channel's room (None = all channels)"""
+    for room in sio.rooms(sid, namespace=namespace):
+        if room == ALL_CHANNELS_ROOM or room.startswith('channel:'):
+            await sio.leave_room(sid, room, namespace=namespace)
+
+    await sio.enter_room(
+        sid,
+        channel_room(channel_id) if channel_id else ALL_CHANNELS_ROOM,
+        namespace=namespace
+    )
+
+
+@sio.event
+async def channel_join(sid, data):
+    """
+    Receive only the events of the channel the client has open
+    Expected data: {'channel_id': str | None}  (None = all channels)
+    """
+    await _join_channel(sid, (data or {}).get('channel_id'), namespace='/')
+
+
 @sio.event
 async def typing_start(sid, data):
     """Handle typing indicator"""
@@ -583,6 +716,7 @@ async def ws_connect(sid, environ):
     """Handle client connection on /ws namespace"""
     logger.info(f"New connection on /ws: {sid}")
     await manager.connect(sid)
+    await _join_channel(sid, None, namespace='/ws')
     await sio.emit('connection_established', {
         'sid': sid,
         'message': 'Connected to RezNet AI',
@@ -604,3 +738,8 @@ async def ws_disconnect(sid):
 async def ws_message_send(sid, data):
     """Handle incoming message from client on /ws namespace"""
     await _handle_message_send(sid, data, namespace='/ws')
+
+@sio.on('channel_join', namespace='/ws')
+async def ws_channel_join(sid, data):
+    """Handle channel_join on /ws namespace"""
+    await _join_channel(sid, (data or {}).get('channel_id'), namespace='/ws')
@@ -9,8 +9,9 @@ import type { Message, AgentStatus } from '@/lib/types'
 let socket: Socket | null = null
 
 export function useWebSocket() {
-  const { addMessage, updateAgentStatus, clearMessages } = useChatStore()
+  const { addMessage, updateAgentStatus, clearMessages, currentChannelId } = useChatStore()
   const socketRef = useRef<Socket | null>(null)
+  const channelRef = useRef<string | null>(currentChannelId)
 
   useEffect(() => {
     // Initialize socket connection
@@ -27,6 +28,8 @@ export function useWebSocket() {
 
       socket.on('connect', () => {
         console.log('✅ WebSocket connected')
+        // (Re)subscribe to the open channel's events
+        socket?.emit('channel_join', { channel_id: channelRef.current })
       })
 
       socket.on('connection_established', (data) => {
@@ -43,6 +46,13 @@ export function useWebSocket() {
         updateAgentStatus(data)
       })
 
+      // Events the server coalesced into one frame - replay them in order
+      socket.on('message_batch', (data: { messages: { e: string; d: unknown }[] }) => {
+        for (const { e, d } of data.messages) {
+          socket?.listeners(e).forEach((listener) => listener(d))
+        }
+      })
+
       socket.on('context_cleared', (data: { channel_id: string; message: string }) => {
         console.log('Context cleared:', data)
         clearMessages(data.channel_id)
@@ -79,6 +89,14 @@ export function useWebSocket() {
     }
   }, [addMessage, updateAgentStatus, clearMessages])
 
+  // Only receive streaming/message events for the channel being viewed
+  useEffect(() => {
+    channelRef.current = currentChannelId
+    if (socketRef.current?.connected) {
+      socketRef.current.emit('channel_join', { channel_id: currentChannelId })
+    }
+  }, [currentChannelId])
+
   return socketRef.current
 }
 
@@ -69,6 +69,13 @@ app.get('/tools', (req, res) => {
                     path: { type: 'string', required: true, description: 'Path to file relative to workspace' }
                 }
             },
+            {
+                name: 'read_files',
+                description: 'Read contents of multiple files',
+                parameters: {
+                    paths: { type: 'array', required: true, description: 'Paths to files relative to workspace' }
+                }
+            },
             {
                 name: 'write_file',
                 description: 'Write content to a file',
@@ -134,6 +141,46 @@ app.post('/tools/read_file', async (req, res) => {
     }
 });
 
+/**
+ * Read multiple files in one request
+ * Per-file failures are reported inline so one bad path doesn't fail the batch
+ */
+app.post('/tools/read_files', async (req, res) => {
+    try {
+        const { paths } = req.body;
+        if (!Array.isArray(paths)) {
+            return res.status(400).json({ error: 'Paths parameter required (array)' });
+        }
+
+        const files = await Promise.all(paths.map(async (filePath) => {
+            try {
+                const fullPath = validatePath(filePath);
+                const content = await fs.readFile(fullPath, 'utf-8');
+                return {
+                    success: true,
+                    path: filePath,
+                    content,
+                    size: content.length
+                };
+            } catch (error) {
+                return {
+                    success: false,
+                    path: filePath,
+                    error: error.message
+                };
+            }
+        }));
+
+        res.json({
+            success: true,
+            files
+        });
+    } catch (error) {
+        console.error('Error reading files:', error);
+        res.status(500).json({ error: error.message });
+    }
+});
+
 /**
  * Write file
  */